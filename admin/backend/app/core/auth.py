@@ -1,9 +1,14 @@
 import bcrypt
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.core.config import settings
 from app.core.database import get_db
 from app.models import User
@@ -19,15 +24,125 @@ def verify_password(plain: str, hashed: str) -> bool:
 
 def hash_password(password: str) -> str:
     raw = password.encode("utf-8")[:72]
-    return bcrypt.hashpw(raw, bcrypt.gensalt()).decode("utf-8")
+    return bcrypt.hashpw(raw, bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode("utf-8")
 
 
-def create_access_token(sub: str) -> str:
+def password_needs_rehash(hashed: str) -> bool:
+    """哈希的成本因子（$2b$<rounds>$...）与当前配置不同。"""
+    try:
+        return int(hashed.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+def create_access_token(sub: str, generation: int = 0) -> str:
+    """gen 为签发时用户的 token_generation，修改密码后旧 token 不再通过校验；jti 用于单个 token 的注销。"""
     expire = datetime.utcnow() + timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
-    payload = {"sub": sub, "exp": expire}
+    payload = {"sub": sub, "exp": expire, "gen": generation, "jti": secrets.token_hex(8)}
     return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 
+class _Entry:
+    __slots__ = ("user_id", "values", "jti", "exp", "expires_at")
+
+    def __init__(self, user_id: int, values: dict, jti: str | None, exp: float, expires_at: float):
+        self.user_id = user_id
+        self.values = values  # users 表各列的值，命中时据此还原 User，不查库
+        self.jti = jti
+        self.exp = exp
+        self.expires_at = expires_at
+
+
+class TokenCache:
+    """已校验 token -> 解码结果与用户，LRU 限制条目数；条目在 token 过期或 ttl 到期时失效。
+
+    注销的 token 记入撤销集合（jti -> 过期时间），校验是一次字典查找；集合只保留未过期的 jti。
+    缓存与撤销集合都在进程内：多 worker 部署时，退出登录只在处理该请求的进程生效，
+    需要所有进程都拒绝时用 token_generation（修改密码、revoke-all），在各进程的缓存条目到期后生效。
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._revoked: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> _Entry | None:
+        if self.max_entries <= 0:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry
+
+    def put(self, token: str, user: User, payload: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        exp = float(payload["exp"])
+        entry = _Entry(user.id, values, payload.get("jti"), exp, min(exp, time.time() + self.ttl))
+        with self._lock:
+            self._entries[token] = entry
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def drop_user(self, user_id: int) -> None:
+        """用户修改密码后丢弃其全部缓存条目，之后的请求按数据库中的 token_generation 重新校验。"""
+        with self._lock:
+            for token in [t for t, e in self._entries.items() if e.user_id == user_id]:
+                del self._entries[token]
+
+    def revoke(self, token: str, jti: str | None, exp: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._entries.pop(token, None)
+            if jti:
+                self._revoked[jti] = exp
+            if len(self._revoked) > self.max_entries:
+                self._revoked = {j: e for j, e in self._revoked.items() if e > now}
+
+    def is_revoked(self, jti: str | None) -> bool:
+        return jti is not None and jti in self._revoked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "revoked": len(self._revoked), "hits": self.hits, "misses": self.misses}
+
+
+token_cache = TokenCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_SECONDS)
+
+
+def _decode(token: str) -> dict:
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if not payload.get("sub"):
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return payload
+
+
+def revoke_token(token: str) -> None:
+    """注销单个 token（退出登录）。"""
+    payload = _decode(token)
+    token_cache.revoke(token, payload.get("jti"), float(payload["exp"]))
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
     db: Session = Depends(get_db),
@@ -37,18 +152,20 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
-    try:
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
-        username = payload.get("sub")
-        if not username:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    user = db.query(User).filter(User.username == username).first()
+    token = credentials.credentials
+    entry = token_cache.get(token)
+    if entry is not None:
+        # 命中缓存：按缓存的列值还原并挂到当前会话，不发 SELECT（路由仍可修改后提交）
+        user = User(**entry.values)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+    payload = _decode(token)
+    if token_cache.is_revoked(payload.get("jti")):
+        raise HTTPException(status_code=401, detail="Token revoked")
+    user = db.query(User).filter(User.username == payload["sub"]).first()
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
+    if payload.get("gen", 0) != (user.token_generation or 0):
+        raise HTTPException(status_code=401, detail="Token revoked")
+    token_cache.put(token, user, payload)
     return user
@@ -7,15 +7,28 @@ class Settings(BaseSettings):
     MYSQL_USER: str = "zblog"
     MYSQL_PASSWORD: str = ""
     MYSQL_DATABASE: str = "zblog"
+    DATABASE_URL: str = ""  # 直接指定 SQLAlchemy 连接串（如本地 sqlite:///./zblog.db），为空则由 MYSQL_* 拼接
     JWT_SECRET: str = "change-me-in-production"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_MINUTES: int = 120
+    AUTH_CACHE_MAX_ENTRIES: int = 1024  # 已校验 token 的缓存条目数（命中时不解码 JWT、不查 users 表），0 关闭
+    BCRYPT_ROUNDS: int = 12  # 密码哈希的成本因子；调整后旧哈希在用户下次登录时按新值重新计算
+    PASSWORD_HASH_WORKERS: int = 2  # 同时进行的 bcrypt 计算数（专用线程池，不占用请求线程池）
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 2.0  # 排队等待超过该秒数直接返回 503；<= 0 表示不排队
+    AUTH_CACHE_SECONDS: float = 60.0  # 缓存条目最长有效期（秒），多 worker 时其他进程感知注销/改密的最长延迟
     BLOG_PUBLIC_URL: str = "http://localhost:5173"  # 博客前台地址，用于评论管理中的文章链接
     LOGIN_RATE_LIMIT_MAX: int = 5  # 同一 IP 在时间窗口内允许的最大失败次数
     LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 300  # 时间窗口（秒），默认 5 分钟
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # 限流最多跟踪的键（IP）数，超出时淘汰最久未访问的
+    RATE_LIMIT_SWEEP_SECONDS: float = 60.0  # 清理空闲键的间隔（秒）
+    RATE_LIMIT_BACKEND_PATH: str = ""  # 限流计数的共享 SQLite 文件（多 worker 共用），为空则各进程独立计数
+    METRICS_ENABLED: bool = True  # 请求与 SQL 指标，/metrics 以 Prometheus 文本格式输出
+    METRICS_TOKEN: str = ""  # 访问 /metrics 需携带的 Bearer token，为空则不校验
 
     @property
     def database_url(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return (
             f"mysql+pymysql://{self.MYSQL_USER}:{self.MYSQL_PASSWORD}"
             f"@{self.MYSQL_HOST}:{self.MYSQL_PORT}/{self.MYSQL_DATABASE}"
@@ -0,0 +1,32 @@
+"""记录内容变更：递增 content_versions 版本号（blog-api 据此失效响应缓存），
+追加 post_changes 日志（blog-api 据此增量更新搜索索引）。"""
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models import ContentVersion, PostChange
+
+
+def bump_content_version(db: Session, *scopes: str) -> None:
+    """在当前事务中递增版本号，随调用方的 db.commit() 一起生效。
+
+    scope 取值：posts | tags | pages | site | comments（已通过的评论变化）。
+    """
+    now = datetime.utcnow()
+    for scope in scopes:
+        updated = (
+            db.query(ContentVersion)
+            .filter(ContentVersion.scope == scope)
+            .update(
+                {ContentVersion.version: ContentVersion.version + 1, ContentVersion.updated_at: now},
+                synchronize_session=False,
+            )
+        )
+        if not updated:
+            db.add(ContentVersion(scope=scope, version=1, updated_at=now))
+
+
+def record_post_change(db: Session, *post_ids: int) -> None:
+    """在当前事务中为新增/修改/删除的文章追加变更日志。"""
+    if post_ids:
+        now = datetime.utcnow()
+        db.execute(insert(PostChange), [{"post_id": pid, "created_at": now} for pid in post_ids])
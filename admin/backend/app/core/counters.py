@@ -0,0 +1,113 @@
+"""维护反范式计数：tags.published_post_count、posts.comment_count 与 site_stats，随业务写入在同一事务中更新。
+
+blog-api 的 CounterReconciler 会定期按源表全量校正（见 blog-api/app/core/counters.py）。
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable
+from sqlalchemy import bindparam, case, func, select, update
+from sqlalchemy.orm import Session
+from app.models import Comment, Post, SiteStat, Tag
+from app.models.post import post_tags
+
+
+def tag_count_deltas(
+    old_published: bool, old_tag_ids: Iterable[int], new_published: bool, new_tag_ids: Iterable[int]
+) -> dict[int, int]:
+    """文章发布状态 / 标签变化前后，各标签已发布文章数的增减。"""
+    old = set(old_tag_ids) if old_published else set()
+    new = set(new_tag_ids) if new_published else set()
+    deltas = {tag_id: 1 for tag_id in new - old}
+    deltas.update({tag_id: -1 for tag_id in old - new})
+    return deltas
+
+
+def apply_tag_count_deltas(db: Session, deltas: dict[int, int]) -> None:
+    """按增量批量更新 published_post_count（相对更新，并发写入也不会丢失计数）。"""
+    by_delta: dict[int, list[int]] = defaultdict(list)
+    for tag_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(tag_id)
+    tags = Tag.__table__
+    for delta, tag_ids in by_delta.items():
+        db.execute(
+            tags.update()
+            .where(tags.c.id.in_(bindparam("ids", expanding=True)))
+            .values(published_post_count=tags.c.published_post_count + delta),
+            {"ids": sorted(tag_ids)},
+        )
+
+
+def apply_post_comment_deltas(db: Session, deltas: dict[int, int]) -> None:
+    """按增量更新各文章的 comment_count（已通过的评论数），相对更新。"""
+    by_delta: dict[int, list[int]] = defaultdict(list)
+    for post_id, delta in deltas.items():
+        if delta and post_id is not None:
+            by_delta[delta].append(post_id)
+    posts = Post.__table__
+    for delta, post_ids in by_delta.items():
+        db.execute(
+            posts.update()
+            .where(posts.c.id.in_(bindparam("ids", expanding=True)))
+            # 评论审核不算文章修改：显式保留 updated_at，不触发 onupdate
+            .values(comment_count=posts.c.comment_count + delta, updated_at=posts.c.updated_at),
+            {"ids": sorted(post_ids)},
+        )
+
+
+def post_tag_ids(db: Session, post_id: int) -> set[int]:
+    return set(db.execute(select(post_tags.c.tag_id).where(post_tags.c.post_id == post_id)).scalars())
+
+
+def apply_stat_deltas(db: Session, **deltas: int) -> None:
+    """一条 UPDATE 同时增减多个 site_stats 指标（post_count、pending_comment_count 等）。"""
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    db.execute(
+        update(SiteStat)
+        .where(SiteStat.name.in_(deltas))
+        .values(value=SiteStat.value + case(deltas, value=SiteStat.name), updated_at=datetime.utcnow())
+    )
+
+
+def comment_counts(db: Session, *where) -> tuple[int, int]:
+    """满足条件的评论数与其中待审核的数量。"""
+    pending = func.coalesce(func.sum(case((Comment.status == "pending", 1), else_=0)), 0)
+    total, pending = db.execute(select(func.count(), pending).where(*where)).one()
+    return int(total), int(pending)
+
+
+def comment_subtree(db: Session, comment_ids: Iterable[int]) -> list:
+    """这些评论及其所有回复（删除时由外键级联删掉的范围），每行为 (id, status, post_id)。"""
+    columns = (Comment.id, Comment.status, Comment.post_id)
+    rows = db.execute(select(*columns).where(Comment.id.in_(set(comment_ids)))).all()
+    seen: set[int] = set()
+    result = []
+    # 按 parent_id 逐层展开回复，每层一条查询
+    while rows:
+        rows = [r for r in rows if r.id not in seen]
+        seen.update(r.id for r in rows)
+        result.extend(rows)
+        if not rows:
+            break
+        rows = db.execute(select(*columns).where(Comment.parent_id.in_([r.id for r in rows]))).all()
+    return result
+
+
+def summarize_comments(rows) -> tuple[int, int, dict[int, int]]:
+    """评论数、其中待审核的数量，以及按文章统计的已通过评论数（用于扣减 posts.comment_count）。"""
+    pending = 0
+    approved: dict[int, int] = defaultdict(int)
+    for r in rows:
+        if r.status == "pending":
+            pending += 1
+        elif r.status == "approved" and r.post_id is not None:
+            approved[r.post_id] += 1
+    return len(rows), pending, dict(approved)
+
+
+def comment_subtree_counts(db: Session, comment_ids: Iterable[int]) -> tuple[int, int, dict[int, int]]:
+    """删除这些评论时会被删掉的评论数（含级联删除的所有回复）、其中待审核的数量，
+    以及按文章统计的已通过评论数。"""
+    return summarize_comments(comment_subtree(db, comment_ids))
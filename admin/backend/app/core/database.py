@@ -1,12 +1,18 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.metrics import TimedQueuePool, instrument_engine
 
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
     echo=False,
+    # 本地/测试用 SQLite：连接会在线程池的不同线程间使用
+    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
+    **({"poolclass": TimedQueuePool} if settings.METRICS_ENABLED else {}),
 )
+if settings.METRICS_ENABLED:
+    instrument_engine(engine, "admin")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -0,0 +1,132 @@
+"""服务端 Markdown 渲染：净化后的 HTML、目录、标题锚点、字数、阅读时长与自动摘要。
+
+与 blog-api/app/core/markdown_render.py 保持一致：管理后台保存文章/页面时渲染并写入
+rendered_contents 表，blog-api 直接按正文哈希读取；预览接口也使用同一渲染规则。
+"""
+import hashlib
+import html
+import json
+import math
+import re
+from dataclasses import asdict, dataclass, field
+import bleach
+import markdown
+from markdown.extensions.toc import TocExtension, slugify_unicode
+
+RENDERER_VERSION = 1
+
+ALLOWED_TAGS = [
+    "p", "br", "hr", "h1", "h2", "h3", "h4", "h5", "h6", "a", "img", "strong", "em", "del", "code", "pre",
+    "blockquote", "ul", "ol", "li", "table", "thead", "tbody", "tr", "th", "td", "sup", "sub", "div", "span",
+]
+ALLOWED_ATTRIBUTES = {
+    "a": ["href", "title", "class"],
+    "img": ["src", "alt", "title"],
+    "code": ["class"],
+    "div": ["class"],
+    "th": ["align"],
+    "td": ["align"],
+    **{f"h{i}": ["id"] for i in range(1, 7)},
+}
+ALLOWED_PROTOCOLS = ["http", "https", "mailto"]
+
+CJK_CHARS_PER_MINUTE = 300
+WORDS_PER_MINUTE = 200
+EXCERPT_LENGTH = 150
+
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+_WORD_RE = re.compile(r"[0-9A-Za-z\u00c0-\u024f]+(?:['\u2019][A-Za-z]+)?")
+_CODE_BLOCK_RE = re.compile(r"<pre>.*?</pre>", re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+@dataclass
+class RenderedMarkdown:
+    html: str
+    toc: list = field(default_factory=list)  # [{"level", "id", "name", "children": [...]}]
+    word_count: int = 0
+    reading_minutes: int = 0
+    excerpt: str = ""
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def content_hash(content: str) -> str:
+    """渲染缓存键：渲染器版本 + 正文的 SHA-256。"""
+    return hashlib.sha256(f"{RENDERER_VERSION}\n{content}".encode("utf-8")).hexdigest()
+
+
+def _toc(tokens: list) -> list:
+    return [
+        {"level": t["level"], "id": t["id"], "name": html.unescape(t["name"]), "children": _toc(t["children"])}
+        for t in tokens
+    ]
+
+
+def _plain_text(rendered_html: str) -> str:
+    text = _TAG_RE.sub(" ", _CODE_BLOCK_RE.sub(" ", rendered_html))
+    return re.sub(r"\s+", " ", html.unescape(text)).strip()
+
+
+def count_words(text: str) -> int:
+    """汉字、假名、谚文按字计，其余按词计。"""
+    return len(_CJK_RE.findall(text)) + len(_WORD_RE.findall(text))
+
+
+def render_markdown(content: str) -> RenderedMarkdown:
+    md = markdown.Markdown(
+        extensions=[
+            "fenced_code",
+            "tables",
+            "sane_lists",
+            TocExtension(slugify=slugify_unicode, permalink="#", permalink_class="heading-anchor"),
+        ],
+        output_format="html",
+    )
+    raw_html = md.convert(content or "")
+    safe_html = bleach.clean(
+        raw_html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, protocols=ALLOWED_PROTOCOLS, strip=True
+    )
+    text = _plain_text(safe_html)  # 不含代码块
+    words = count_words(text)
+    cjk = len(_CJK_RE.findall(text))
+    minutes = math.ceil(cjk / CJK_CHARS_PER_MINUTE + (words - cjk) / WORDS_PER_MINUTE) if words else 0
+    paragraphs = [_plain_text(p) for p in re.findall(r"<p>(.*?)</p>", safe_html, re.S)]
+    lead = next((p for p in paragraphs if p), "")
+    excerpt = lead if len(lead) <= EXCERPT_LENGTH else lead[:EXCERPT_LENGTH].rstrip() + "…"
+    return RenderedMarkdown(
+        html=safe_html,
+        toc=_toc(md.toc_tokens),
+        word_count=words,
+        reading_minutes=max(1, minutes) if words else 0,
+        excerpt=excerpt,
+    )
+
+
+def toc_json(rendered: RenderedMarkdown) -> str:
+    return json.dumps(rendered.toc, ensure_ascii=False, separators=(",", ":"))
+
+
+def rendered_row(key: str, rendered: RenderedMarkdown) -> dict:
+    """rendered_contents 表的一行。"""
+    return {
+        "content_hash": key,
+        "html": rendered.html,
+        "toc": toc_json(rendered),
+        "word_count": rendered.word_count,
+        "reading_minutes": rendered.reading_minutes,
+        "excerpt": rendered.excerpt[:500],
+    }
+
+
+def store_rendered(db, content: str) -> RenderedMarkdown | None:
+    """保存文章/页面时在当前事务中渲染并写入缓存；该正文已渲染过则跳过，返回 None。"""
+    from app.models import RenderedContent
+
+    key = content_hash(content)
+    if db.query(RenderedContent.content_hash).filter(RenderedContent.content_hash == key).first():
+        return None
+    rendered = render_markdown(content)
+    db.add(RenderedContent(**rendered_row(key, rendered)))
+    return rendered
@@ -0,0 +1,62 @@
+"""bcrypt 计算（约数百毫秒）放在专用的有界线程池中执行，不占用处理其他请求的线程池。
+
+最多 PASSWORD_HASH_WORKERS 个同时计算，其余请求在事件循环中排队；
+排队超过 PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS 秒直接返回 503，登录洪峰时其他后台接口不受影响。
+该值 <= 0 表示不排队：有空闲名额时照常计算，否则立即返回 503。
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from fastapi import HTTPException
+from app.core.auth import hash_password, verify_password
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class PasswordPool:
+    def __init__(self, workers: int, queue_timeout: float):
+        self.workers = max(1, workers)
+        self.queue_timeout = queue_timeout
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+
+    async def _run(self, op: str, fn, *args):
+        if self._slots is None:
+            # 在事件循环中首次使用时创建
+            self._slots = asyncio.Semaphore(self.workers)
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="bcrypt")
+        metrics.password_waiting += 1
+        try:
+            if self._slots.locked():
+                await asyncio.wait_for(self._slots.acquire(), max(0.0, self.queue_timeout))
+            else:
+                # 有空闲名额时 acquire 立即返回；不能交给 wait_for，超时为 0 时它总会先超时
+                await self._slots.acquire()
+        except asyncio.TimeoutError:
+            metrics.password_rejected.inc((op,))
+            raise HTTPException(status_code=503, detail="服务繁忙，请稍后再试", headers={"Retry-After": "1"})
+        finally:
+            metrics.password_waiting -= 1
+        metrics.password_running += 1
+        started = perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            metrics.password_running -= 1
+            metrics.password_hash_time.observe((op,), perf_counter() - started)
+            self._slots.release()
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self._run("verify", verify_password, plain, hashed)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", hash_password, password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+
+password_pool = PasswordPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS)
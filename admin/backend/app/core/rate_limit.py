@@ -1,13 +1,315 @@
+"""限流引擎（与 blog-api 的 app/core/rate_limit.py 相同）与按 IP 的登录失败限流，用于防止暴力破解。
+
+- 内存存储：按最近访问排序（LRU），超过 RATE_LIMIT_MAX_KEYS 时淘汰最久未访问的键；
+- SQLite 存储（RATE_LIMIT_BACKEND_PATH）：多个 worker 进程共用计数；
+- 后台线程每 RATE_LIMIT_SWEEP_SECONDS 秒清理已空闲的键。
 """
-按 IP 的登录尝试限流，用于防止暴力破解。
-使用内存存储，多进程/多实例部署时各实例独立计数；生产可改用 Redis。
-"""
-import time
-from collections import defaultdict
-from typing import List
+import logging
+import math
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from time import time
+from typing import Callable, NamedTuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+State = tuple[float, float, float]
+
+# 永远无法放行（限额为 0、单次消耗超过容量）时 Retry-After 的取值上限，秒
+MAX_RETRY_AFTER = 3600
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    retry_after: float = 0.0  # 被拒绝时建议的等待秒数
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(min(self.retry_after, MAX_RETRY_AFTER))))
+
+
+class TokenBucket:
+    """令牌桶：容量 burst，每秒补充 rate 个令牌，适合允许短时突发的整体限流。状态为 (令牌数, 上次更新时间, 0)。"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+
+    def _tokens(self, state: State | None, now: float) -> float:
+        if state is None:
+            return float(self.burst)
+        return min(self.burst, state[0] + (now - state[1]) * self.rate)
+
+    def peek(self, state: State | None, now: float, cost: int) -> Decision:
+        tokens = self._tokens(state, now)
+        if tokens >= cost:
+            return Decision(True)
+        return Decision(False, (cost - tokens) / self.rate if self.rate > 0 and cost <= self.burst else MAX_RETRY_AFTER)
+
+    def hit(self, state: State | None, now: float, cost: int) -> tuple[State, Decision]:
+        decision = self.peek(state, now, cost)
+        tokens = self._tokens(state, now) - (cost if decision.allowed else 0)
+        return (tokens, now, 0.0), decision
+
+    def idle_at(self, state: State) -> float:
+        """令牌补满的时刻，此后该键与从未访问过等价。"""
+        if self.rate <= 0:
+            return math.inf
+        return state[1] + (self.burst - state[0]) / self.rate
+
+
+class SlidingWindow:
+    """滑动窗口计数：用上一窗口与当前窗口的计数按时间加权估算最近 window 秒内的次数。
+
+    状态为 (当前窗口起点, 上一窗口计数, 当前窗口计数)，适合“每 N 秒最多 M 次”这类规则。
+    """
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+
+    def _roll(self, state: State | None, now: float) -> State:
+        start = now - now % self.window
+        if state is None or state[0] < start - self.window:
+            return start, 0.0, 0.0
+        if state[0] < start:
+            return start, state[2], 0.0  # 上一窗口恰好是状态中的当前窗口
+        return state
+
+    def _estimate(self, state: State, now: float) -> float:
+        start, prev, curr = state
+        return prev * (1 - (now - start) / self.window) + curr
+
+    def peek(self, state: State | None, now: float, cost: int) -> Decision:
+        state = self._roll(state, now)
+        if self._estimate(state, now) + cost <= self.limit:
+            return Decision(True)
+        if cost > self.limit:
+            return Decision(False, self.window)  # 永远不会放行，建议按一个窗口后重试
+        start, prev, curr = state
+        if curr + cost <= self.limit:
+            # 本窗口内随上一窗口权重下降即可放行
+            wait_until = start + self.window * (1 - (self.limit - curr - cost) / prev)
+        else:
+            # 要等到下一窗口，当前计数变成“上一窗口”后按权重衰减
+            wait_until = start + self.window * (2 - (self.limit - cost) / curr)
+        return Decision(False, max(0.0, wait_until - now))
+
+    def hit(self, state: State | None, now: float, cost: int) -> tuple[State, Decision]:
+        state = self._roll(state, now)
+        decision = self.peek(state, now, cost)
+        if decision.allowed:
+            state = (state[0], state[1], state[2] + cost)
+        return state, decision
+
+    def idle_at(self, state: State) -> float:
+        """两个窗口后计数全部过期。"""
+        return state[0] + 2 * self.window
+
+
+Policy = TokenBucket | SlidingWindow
+
+
+class MemoryBackend:
+    """进程内存储：OrderedDict 按访问顺序排列，超过 max_keys 时淘汰最久未访问的键。"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self.evicted = 0
+        self._data: OrderedDict[str, tuple[State, float]] = OrderedDict()  # key -> (state, idle_at)
+        self._lock = threading.Lock()
+
+    def update(self, key: str, fn: Callable[[State | None], tuple[State, float, Decision]]) -> Decision:
+        with self._lock:
+            entry = self._data.get(key)
+            state, idle_at, decision = fn(entry[0] if entry else None)
+            self._data[key] = (state, idle_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_keys:
+                self._data.popitem(last=False)
+                self.evicted += 1
+        return decision
+
+    def get(self, key: str) -> State | None:
+        with self._lock:
+            entry = self._data.get(key)
+        return entry[0] if entry else None
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def sweep(self, now: float) -> int:
+        with self._lock:
+            idle = [k for k, (_, idle_at) in self._data.items() if idle_at <= now]
+            for key in idle:
+                del self._data[key]
+        return len(idle)
 
-# ip -> 最近失败时间戳列表（仅保留窗口内的）
-_login_attempts: dict[str, List[float]] = defaultdict(list)
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """基于 SQLite 文件的共享存储，多个 worker 进程共用计数；读改写在一个 IMMEDIATE 事务中完成。
+
+    键数上限在每次清理时执行（按最近访问时间淘汰），两次清理之间可能短暂超出。
+    """
+
+    def __init__(self, path: str, scope: str, max_keys: int):
+        self.path = path
+        self.scope = scope
+        self.max_keys = max_keys
+        self.evicted = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits (scope TEXT NOT NULL, key TEXT NOT NULL, "
+            "s0 REAL NOT NULL, s1 REAL NOT NULL, s2 REAL NOT NULL, idle_at REAL NOT NULL, touched REAL NOT NULL, "
+            "PRIMARY KEY (scope, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limits_idle_at ON rate_limits (idle_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limits_touched ON rate_limits (scope, touched)")
+
+    def update(self, key: str, fn: Callable[[State | None], tuple[State, float, Decision]]) -> Decision:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT s0, s1, s2 FROM rate_limits WHERE scope = ? AND key = ?", (self.scope, key)
+                ).fetchone()
+                state, idle_at, decision = fn(tuple(row) if row else None)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits (scope, key, s0, s1, s2, idle_at, touched) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self.scope, key, *state, idle_at, time()),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return decision
+
+    def get(self, key: str) -> State | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT s0, s1, s2 FROM rate_limits WHERE scope = ? AND key = ?", (self.scope, key)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_limits WHERE scope = ? AND key = ?", (self.scope, key))
+
+    def sweep(self, now: float) -> int:
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM rate_limits WHERE scope = ? AND idle_at <= ?", (self.scope, now)
+            ).rowcount
+            excess = self._conn.execute(
+                "SELECT COUNT(*) FROM rate_limits WHERE scope = ?", (self.scope,)
+            ).fetchone()[0] - self.max_keys
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM rate_limits WHERE scope = ? AND key IN "
+                    "(SELECT key FROM rate_limits WHERE scope = ? ORDER BY touched LIMIT ?)",
+                    (self.scope, self.scope, excess),
+                )
+                self.evicted += excess
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM rate_limits WHERE scope = ?", (self.scope,)
+            ).fetchone()[0]
+
+
+class RateLimiter:
+    """一条限流规则：策略 + 存储。hit 计数并返回是否放行，peek 只检查不计数。"""
+
+    def __init__(self, name: str, policy: Policy, backend: MemoryBackend | SQLiteBackend):
+        self.name = name
+        self.policy = policy
+        self.backend = backend
+        self.rejected = 0
+
+    def hit(self, key: str, cost: int = 1) -> Decision:
+        def apply(state):
+            new_state, decision = self.policy.hit(state, time(), cost)
+            return new_state, self.policy.idle_at(new_state), decision
+
+        decision = self.backend.update(key, apply)
+        if not decision.allowed:
+            self.rejected += 1
+        return decision
+
+    def peek(self, key: str, cost: int = 1) -> Decision:
+        return self.policy.peek(self.backend.get(key), time(), cost)
+
+    def reset(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def sweep(self) -> int:
+        return self.backend.sweep(time())
+
+    def stats(self) -> dict:
+        return {"keys": len(self.backend), "rejected": self.rejected, "evicted": self.backend.evicted}
+
+
+def make_backend(scope: str) -> MemoryBackend | SQLiteBackend:
+    if settings.RATE_LIMIT_BACKEND_PATH:
+        return SQLiteBackend(settings.RATE_LIMIT_BACKEND_PATH, scope, settings.RATE_LIMIT_MAX_KEYS)
+    return MemoryBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+class RateLimitSweeper:
+    """后台线程：定期清理各限流规则中已空闲的键，interval <= 0 时不启动。"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.limiters: list[RateLimiter] = []
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register(self, limiter: RateLimiter) -> RateLimiter:
+        self.limiters.append(limiter)
+        return limiter
+
+    def run_once(self) -> int:
+        removed = 0
+        for limiter in self.limiters:
+            try:
+                removed += limiter.sweep()
+            except Exception:
+                logger.exception("sweep rate limiter %s failed", limiter.name)
+        return removed
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.run_once()
+
+    def start(self) -> None:
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="rate-limit-sweep", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {limiter.name: limiter.stats() for limiter in self.limiters}
 
 
 def _get_client_ip(request) -> str:
@@ -17,50 +319,38 @@ def _get_client_ip(request) -> str:
     return request.client.host if request.client else "unknown"
 
 
-def _get_settings():
-    from app.core.config import settings
-    return settings
-
-
-def _clean_old(attempts: List[float], now: float, window_sec: float) -> None:
-    cutoff = now - window_sec
-    while attempts and attempts[0] < cutoff:
-        attempts.pop(0)
+rate_limit_sweeper = RateLimitSweeper(interval=settings.RATE_LIMIT_SWEEP_SECONDS)
+# 登录失败：同一 IP 在 LOGIN_RATE_LIMIT_WINDOW_SECONDS 秒内最多失败 LOGIN_RATE_LIMIT_MAX 次
+login_rate_limiter = rate_limit_sweeper.register(
+    RateLimiter(
+        "login",
+        SlidingWindow(settings.LOGIN_RATE_LIMIT_MAX, settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS),
+        make_backend("login"),
+    )
+)
 
 
 def check_login_rate_limit(request) -> None:
     """
     若当前 IP 在窗口内失败次数已达上限，则抛出 HTTP 429。
-    应在验证密码之前调用。
+    应在验证密码之前调用；只检查不计数。
     """
     from fastapi import HTTPException
 
-    s = _get_settings()
-    window_sec = float(s.LOGIN_RATE_LIMIT_WINDOW_SECONDS)
-    max_attempts = s.LOGIN_RATE_LIMIT_MAX
-    ip = _get_client_ip(request)
-    now = time.time()
-    attempts = _login_attempts[ip]
-    _clean_old(attempts, now, window_sec)
-    if len(attempts) >= max_attempts:
+    decision = login_rate_limiter.peek(_get_client_ip(request))
+    if not decision.allowed:
         raise HTTPException(
             status_code=429,
-            detail=f"登录尝试过于频繁，请 {int(window_sec / 60)} 分钟后再试",
+            detail=f"登录尝试过于频繁，请 {max(1, math.ceil(min(decision.retry_after, MAX_RETRY_AFTER) / 60))} 分钟后再试",
+            headers={"Retry-After": decision.retry_after_header},
         )
 
 
 def record_login_failure(request) -> None:
     """登录失败时调用，记录一次尝试。"""
-    s = _get_settings()
-    window_sec = float(s.LOGIN_RATE_LIMIT_WINDOW_SECONDS)
-    ip = _get_client_ip(request)
-    now = time.time()
-    attempts = _login_attempts[ip]
-    _clean_old(attempts, now, window_sec)
-    attempts.append(now)
+    login_rate_limiter.hit(_get_client_ip(request))
 
 
 def clear_login_attempts(request) -> None:
     """登录成功时可选调用，清空该 IP 的失败记录。"""
-    ip = _get_client_ip(request)
-    _login_attempts.pop(ip, None)
+    login_rate_limiter.reset(_get_client_ip(request))
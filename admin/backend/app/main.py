@@ -1,5 +1,11 @@
-from fastapi import FastAPI
+import secrets
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.passwords import password_pool
+from app.core.rate_limit import rate_limit_sweeper
 from app.routers import auth, posts, tags, comments, pages, site, stats
 
 app = FastAPI(title="zblog Admin API", version="0.1.0")
@@ -11,6 +17,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router, prefix="/api")
 app.include_router(posts.router, prefix="/api")
@@ -21,6 +29,28 @@ app.include_router(site.router, prefix="/api")
 app.include_router(stats.router, prefix="/api")
 
 
+@app.on_event("startup")
+def startup():
+    rate_limit_sweeper.start()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    rate_limit_sweeper.stop()
+    password_pool.shutdown()
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint(request: Request):
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+        request.headers.get("authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
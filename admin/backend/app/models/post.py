@@ -23,6 +23,8 @@ class Post(Base):
     status = Column(String(20), default="draft", nullable=False)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     view_count = Column(Integer, default=0)
+    # 已通过的评论数，由管理后台审核/删除评论时维护，scripts/reconcile_counters.py 可全量重算
+    comment_count = Column(Integer, default=0, nullable=False, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     published_at = Column(DateTime)
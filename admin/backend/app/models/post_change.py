@@ -0,0 +1,13 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, DateTime
+from app.core.database import Base
+
+
+class PostChange(Base):
+    """文章变更日志：管理后台写文章时追加一行，blog-api 的搜索索引据此增量更新。"""
+
+    __tablename__ = "post_changes"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    post_id = Column(Integer, nullable=False)  # 不设外键：删除文章后仍需保留这条变更
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
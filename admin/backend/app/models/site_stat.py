@@ -0,0 +1,14 @@
+from datetime import datetime
+from sqlalchemy import Column, String, BigInteger, DateTime
+from app.core.database import Base
+
+
+class SiteStat(Base):
+    """仪表盘统计汇总：每个指标一行，随文章/评论/标签写入增量更新，定期全量校正。"""
+
+    __tablename__ = "site_stats"
+
+    # post_count | published_post_count | comment_count | pending_comment_count | tag_count | total_views
+    name = Column(String(32), primary_key=True)
+    value = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
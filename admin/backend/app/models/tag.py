@@ -10,3 +10,5 @@ class Tag(Base):
     name = Column(String(64), nullable=False)
     slug = Column(String(64), unique=True, nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # 已发布文章数，由管理后台写文章时维护，scripts/reconcile_counters.py 可全量重算
+    published_post_count = Column(Integer, default=0, nullable=False, server_default="0")
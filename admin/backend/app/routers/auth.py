@@ -2,7 +2,17 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.core.auth import verify_password, hash_password, create_access_token, get_current_user
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
+from app.core.auth import (
+    create_access_token,
+    get_current_user,
+    password_needs_rehash,
+    revoke_token,
+    security,
+    token_cache,
+)
+from app.core.passwords import password_pool
 from app.core.rate_limit import check_login_rate_limit, record_login_failure, clear_login_attempts
 from app.models import User
 
@@ -20,14 +30,19 @@ class LoginOut(BaseModel):
 
 
 @router.post("/login", response_model=LoginOut)
-def login(request: Request, body: LoginIn, db: Session = Depends(get_db)):
-    check_login_rate_limit(request)
-    user = db.query(User).filter(User.username == body.username).first()
-    if not user or not verify_password(body.password, user.password_hash):
-        record_login_failure(request)
+async def login(request: Request, body: LoginIn, db: Session = Depends(get_db)):
+    # 数据库与限流读写放到请求线程池，bcrypt 在专用线程池中计算，两者互不占用
+    await run_in_threadpool(check_login_rate_limit, request)
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.username == body.username).first())
+    if not user or not await password_pool.verify(body.password, user.password_hash):
+        await run_in_threadpool(record_login_failure, request)
         raise HTTPException(status_code=401, detail="用户名或密码错误")
-    clear_login_attempts(request)
-    token = create_access_token(user.username)
+    token = create_access_token(user.username, user.token_generation or 0)
+    if password_needs_rehash(user.password_hash):
+        # BCRYPT_ROUNDS 调整后，用本次登录的明文按新成本因子重新哈希
+        user.password_hash = await password_pool.hash(body.password)
+        await run_in_threadpool(db.commit)
+    await run_in_threadpool(clear_login_attempts, request)
     return LoginOut(access_token=token)
 
 
@@ -46,9 +61,36 @@ class ChangePasswordIn(BaseModel):
 
 
 @router.post("/change-password")
-def change_password(body: ChangePasswordIn, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    if not verify_password(body.old_password, user.password_hash):
+async def change_password(body: ChangePasswordIn, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    if not await password_pool.verify(body.old_password, user.password_hash):
         raise HTTPException(status_code=400, detail="原密码错误")
-    user.password_hash = hash_password(body.new_password)
+    password_hash = await password_pool.hash(body.new_password)
+
+    def save() -> str:
+        user.password_hash = password_hash
+        # 递增 token 代数：此前签发的所有 token（含其他设备上的登录）失效，返回新 token 供当前会话继续使用
+        user.token_generation = (user.token_generation or 0) + 1
+        db.commit()
+        token_cache.drop_user(user.id)
+        return create_access_token(user.username, user.token_generation)
+
+    return {"ok": True, "access_token": await run_in_threadpool(save)}
+
+
+@router.post("/logout")
+def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user: User = Depends(get_current_user),
+):
+    """注销当前 token。"""
+    revoke_token(credentials.credentials)
+    return {"ok": True}
+
+
+@router.post("/revoke-all")
+def revoke_all(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    """注销该用户已签发的全部 token（包括当前这个）。"""
+    user.token_generation = (user.token_generation or 0) + 1
     db.commit()
+    token_cache.drop_user(user.id)
     return {"ok": True}
@@ -1,15 +1,29 @@
+from collections import defaultdict
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, List
 from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.core.config import settings
+from app.core.content_version import bump_content_version
+from app.core.counters import (
+    apply_post_comment_deltas,
+    apply_stat_deltas,
+    comment_subtree,
+    comment_subtree_counts,
+    summarize_comments,
+)
 from app.models import User, Comment, Post
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
+BULK_CHUNK_SIZE = 500  # 批量审核/删除每块的评论数，每块一个事务
+BULK_MAX_IDS = 10000
+
 
 class CommentOut(BaseModel):
     id: int
@@ -23,6 +37,7 @@ class CommentOut(BaseModel):
     author_email: str
     content: str
     status: str
+    ip: Optional[str] = None
     created_at: datetime
 
     class Config:
@@ -33,6 +48,28 @@ class CommentStatusUpdate(BaseModel):
     status: str  # approved | rejected
 
 
+class CommentBulkFilter(BaseModel):
+    status: Optional[str] = None  # pending | approved | rejected
+    ip: Optional[str] = None
+    author_email: Optional[str] = None
+    post_id: Optional[int] = None
+    page_slug: Optional[str] = None
+    created_before: Optional[datetime] = None
+    created_after: Optional[datetime] = None
+
+
+class CommentBulkAction(BaseModel):
+    action: str  # approved | rejected | delete
+    ids: Optional[List[int]] = Field(default=None, max_length=BULK_MAX_IDS)
+    filter: Optional[CommentBulkFilter] = None  # 与 ids 同时给出时两者都要满足
+
+
+@lru_cache(maxsize=1)
+def _blog_base_url() -> str:
+    """博客前台地址（去掉末尾 /），配置在进程内不变，只计算一次。"""
+    return (settings.BLOG_PUBLIC_URL or "").rstrip("/")
+
+
 @router.get("", response_model=List[CommentOut])
 def list_comments(
     post_id: Optional[int] = None,
@@ -48,11 +85,18 @@ def list_comments(
     if status:
         q = q.filter(Comment.status == status)
     items = q.offset((page - 1) * size).limit(size).all()
-    base_url = (settings.BLOG_PUBLIC_URL or "").rstrip("/")
+    base_url = _blog_base_url()
+    # 整页评论关联的文章用一条 IN 查询取 slug/标题，不加载正文
+    post_ids = {c.post_id for c in items if c.post_id is not None}
+    posts = (
+        {r.id: r for r in db.query(Post.id, Post.slug, Post.title).filter(Post.id.in_(post_ids))}
+        if post_ids
+        else {}
+    )
     result = []
     for c in items:
         if c.post_id is not None:
-            post = db.query(Post).filter(Post.id == c.post_id).first()
+            post = posts.get(c.post_id)
             post_slug = post.slug if post else None
             post_title = post.title if post else None
             post_url = f"{base_url}/post/{post_slug}" if base_url and post_slug else None
@@ -73,12 +117,134 @@ def list_comments(
                 author_email=c.author_email,
                 content=c.content,
                 status=c.status,
+                ip=c.ip,
                 created_at=c.created_at,
             )
         )
     return result
 
 
+def _filter_conditions(f: Optional[CommentBulkFilter]) -> list:
+    if f is None:
+        return []
+    conds = []
+    if f.status:
+        conds.append(Comment.status == f.status)
+    if f.ip:
+        conds.append(Comment.ip == f.ip)
+    if f.author_email:
+        conds.append(Comment.author_email == f.author_email)
+    if f.post_id is not None:
+        conds.append(Comment.post_id == f.post_id)
+    if f.page_slug:
+        conds.append(Comment.page_slug == f.page_slug)
+    if f.created_before:
+        conds.append(Comment.created_at < f.created_before)
+    if f.created_after:
+        conds.append(Comment.created_at >= f.created_after)
+    return conds
+
+
+def _bulk_chunks(db: Session, ids: Optional[List[int]], conds: list):
+    """逐块取出目标评论 (id, status, post_id)，调用方处理完一块并提交后再取下一块。
+
+    按 id 列表时对列表分块；按条件时按 id 递增翻页（已删除或已改状态的不会再被取到）。
+    """
+    columns = (Comment.id, Comment.status, Comment.post_id)
+    if ids is not None:
+        ids = sorted(set(ids))
+        for i in range(0, len(ids), BULK_CHUNK_SIZE):
+            stmt = select(*columns).where(Comment.id.in_(ids[i : i + BULK_CHUNK_SIZE]), *conds).order_by(Comment.id)
+            rows = db.execute(stmt.with_for_update()).all()
+            if rows:
+                yield rows
+        return
+    last_id = 0
+    while True:
+        stmt = select(*columns).where(Comment.id > last_id, *conds).order_by(Comment.id).limit(BULK_CHUNK_SIZE)
+        rows = db.execute(stmt.with_for_update()).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield rows
+
+
+def _bulk_set_status(db: Session, rows, status: str) -> None:
+    """一条 UPDATE 改一块评论的状态，并同步待审核数、各文章评论数与 comments 版本号。"""
+    pending = 0
+    post_deltas: dict[int, int] = defaultdict(int)
+    approved_changed = False
+    for r in rows:
+        if r.status == "pending":
+            pending += 1
+        if "approved" in (r.status, status):
+            approved_changed = True
+            post_deltas[r.post_id] += 1 if status == "approved" else -1
+    db.execute(
+        update(Comment)
+        .where(Comment.id.in_([r.id for r in rows]))
+        .values(status=status, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    apply_stat_deltas(db, pending_comment_count=-pending)
+    apply_post_comment_deltas(db, post_deltas)
+    if approved_changed:
+        bump_content_version(db, "comments")
+
+
+def _bulk_delete(db: Session, rows) -> int:
+    """删除一块评论及其全部回复（显式按 id 删除，不依赖数据库是否开启外键级联），返回删除条数。"""
+    subtree = comment_subtree(db, [r.id for r in rows])
+    removed, pending, approved = summarize_comments(subtree)
+    ids = [r.id for r in subtree]
+    for i in range(0, len(ids), BULK_CHUNK_SIZE):
+        db.execute(
+            delete(Comment)
+            .where(Comment.id.in_(ids[i : i + BULK_CHUNK_SIZE]))
+            .execution_options(synchronize_session=False)
+        )
+    apply_stat_deltas(db, comment_count=-removed, pending_comment_count=-pending)
+    apply_post_comment_deltas(db, {post_id: -n for post_id, n in approved.items()})
+    if removed > pending:
+        bump_content_version(db, "comments")
+    return removed
+
+
+@router.post("/bulk")
+def bulk_moderate(
+    body: CommentBulkAction,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """按 id 列表或筛选条件（如某 IP 的全部待审核评论、某时间之前的评论）批量通过、拒绝或删除。
+
+    分块执行，每块一条 UPDATE/DELETE 并提交一次；中途失败时已提交的块保留，可按相同条件重试。
+    """
+    if body.action not in ("approved", "rejected", "delete"):
+        raise HTTPException(status_code=400, detail="action must be approved, rejected or delete")
+    conds = _filter_conditions(body.filter)
+    if body.ids is None and not conds:
+        raise HTTPException(status_code=400, detail="ids or filter required")
+    if body.action != "delete":
+        # 已是目标状态的评论不再改动，也不计入 matched
+        conds.append(Comment.status != body.action)
+    matched = deleted = chunks = 0
+    for rows in _bulk_chunks(db, body.ids, conds):
+        matched += len(rows)
+        chunks += 1
+        if body.action == "delete":
+            deleted += _bulk_delete(db, rows)
+        else:
+            _bulk_set_status(db, rows, body.action)
+        db.commit()
+    return {
+        "matched": matched,
+        "updated": 0 if body.action == "delete" else matched,
+        "deleted": deleted,  # 含级联删除的回复
+        "chunks": chunks,
+    }
+
+
 @router.put("/{comment_id}/status")
 def update_comment_status(
     comment_id: int,
@@ -91,6 +257,12 @@ def update_comment_status(
     comment = db.query(Comment).filter(Comment.id == comment_id).first()
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
+    if comment.status == "pending":
+        apply_stat_deltas(db, pending_comment_count=-1)
+    if "approved" in (comment.status, body.status) and comment.status != body.status:
+        # 公开评论树与评论数随之变化
+        apply_post_comment_deltas(db, {comment.post_id: 1 if body.status == "approved" else -1})
+        bump_content_version(db, "comments")
     comment.status = body.status
     db.commit()
     return {"ok": True}
@@ -105,6 +277,13 @@ def delete_comment(
     comment = db.query(Comment).filter(Comment.id == comment_id).first()
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
+    # 回复由外键级联删除，汇总里一并扣除
+    removed, pending, approved = comment_subtree_counts(db, [comment_id])
+    apply_stat_deltas(db, comment_count=-removed, pending_comment_count=-pending)
+    apply_post_comment_deltas(db, {post_id: -n for post_id, n in approved.items()})
+    if removed > pending:
+        # 删除的评论中有已通过的（拒绝的也会计入，多失效一次无妨）
+        bump_content_version(db, "comments")
     db.delete(comment)
     db.commit()
     return None
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from datetime import datetime
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.content_version import bump_content_version
+from app.core.fields import parse_fields
+from app.core.markdown_render import store_rendered
 from app.models import Page
 
 if TYPE_CHECKING:
@@ -35,9 +38,30 @@ class PageUpdate(BaseModel):
     content: Optional[str] = None
 
 
-@router.get("", response_model=list[PageOut])
-def list_pages(db: Session = Depends(get_db), user: "User" = Depends(get_current_user)):
-    return db.query(Page).all()
+class PageListItem(BaseModel):
+    """列表项：只包含 fields 选中的字段。"""
+
+    id: Optional[int] = None
+    slug: Optional[str] = None
+    title: Optional[str] = None
+    content: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+
+LIST_FIELDS = tuple(PageOut.model_fields)
+DEFAULT_LIST_FIELDS = tuple(f for f in LIST_FIELDS if f != "content")
+
+
+@router.get("", response_model=List[PageListItem], response_model_exclude_unset=True)
+def list_pages(
+    fields: Optional[str] = Query(None, description=f"逗号分隔的返回字段，默认不含 content；可选: {','.join(LIST_FIELDS)}"),
+    db: Session = Depends(get_db),
+    user: "User" = Depends(get_current_user),
+):
+    selected = parse_fields(fields, LIST_FIELDS, DEFAULT_LIST_FIELDS)
+    columns = [getattr(Page, f) for f in selected if f != "id"]
+    pages = db.query(Page).options(load_only(Page.id, *columns)).all()
+    return [PageListItem(**{f: getattr(p, f) for f in selected}) for p in pages]
 
 
 @router.get("/{slug}", response_model=PageOut)
@@ -66,6 +90,8 @@ def update_page(
         page.title = body.title
     if body.content is not None:
         page.content = body.content
+        store_rendered(db, page.content)
+    bump_content_version(db, "pages")
     db.commit()
     db.refresh(page)
     return page
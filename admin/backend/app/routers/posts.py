@@ -1,15 +1,30 @@
+from collections import defaultdict
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from pydantic import BaseModel, Field
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session, load_only, selectinload
 from datetime import datetime
 from typing import Optional, List
 from app.core.database import get_db
 from app.core.auth import get_current_user
-from app.models import User, Post, Tag
+from app.core.content_version import bump_content_version, record_post_change
+from app.core.fields import parse_fields
+from app.core.markdown_render import render_markdown, store_rendered
+from app.core.counters import (
+    apply_stat_deltas,
+    apply_tag_count_deltas,
+    comment_counts,
+    post_tag_ids,
+    tag_count_deltas,
+)
+from app.models import User, Post, Tag, Comment
 from app.models.post import post_tags  # Table for many-to-many
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
+BULK_MAX_POSTS = 1000
+POST_STATUSES = ("draft", "published")
+
 
 class PostCreate(BaseModel):
     title: str
@@ -50,34 +65,83 @@ class PostOut(BaseModel):
         from_attributes = True
 
 
-@router.get("", response_model=List[PostOut])
+class PostListItem(BaseModel):
+    """列表项：只包含 fields 选中的字段，未选中的字段不出现在响应中。"""
+
+    id: Optional[int] = None
+    title: Optional[str] = None
+    slug: Optional[str] = None
+    content: Optional[str] = None
+    excerpt: Optional[str] = None
+    cover_image: Optional[str] = None
+    status: Optional[str] = None
+    author_id: Optional[int] = None
+    view_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    published_at: Optional[datetime] = None
+    tag_ids: Optional[List[int]] = None
+
+
+class PostBulkAction(BaseModel):
+    action: str  # status | add_tags | remove_tags | delete
+    post_ids: List[int] = Field(min_length=1, max_length=BULK_MAX_POSTS)
+    status: Optional[str] = None  # action=status 时必填：draft | published
+    tag_ids: List[int] = []  # action=add_tags / remove_tags 时必填
+
+
+# 列表默认不返回正文，编辑时由 GET /posts/{id} 获取
+LIST_FIELDS = tuple(PostOut.model_fields)
+DEFAULT_LIST_FIELDS = tuple(f for f in LIST_FIELDS if f != "content")
+
+
+def _check_tag_ids(db: Session, tag_ids) -> list[int]:
+    """去重并用一条查询确认标签都存在，有不存在的直接 400。"""
+    tag_ids = sorted(set(tag_ids))
+    if tag_ids:
+        found = set(db.execute(select(Tag.id).where(Tag.id.in_(tag_ids))).scalars())
+        missing = [t for t in tag_ids if t not in found]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Unknown tag_ids: {missing}")
+    return tag_ids
+
+
+def _link_tags(db: Session, pairs) -> None:
+    """一条多行 INSERT 写入 (post_id, tag_id) 关联。"""
+    if pairs:
+        db.execute(post_tags.insert().values([{"post_id": p, "tag_id": t} for p, t in pairs]))
+
+
+def _set_post_tags(db: Session, post_id: int, old_tag_ids: set[int], new_tag_ids) -> None:
+    """只写入差集：新增的一条多行 INSERT，移除的一条 DELETE。"""
+    new_tag_ids = set(new_tag_ids)
+    _link_tags(db, [(post_id, t) for t in sorted(new_tag_ids - old_tag_ids)])
+    removed = old_tag_ids - new_tag_ids
+    if removed:
+        db.execute(post_tags.delete().where(post_tags.c.post_id == post_id, post_tags.c.tag_id.in_(removed)))
+
+
+@router.get("", response_model=List[PostListItem], response_model_exclude_unset=True)
 def list_posts(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     status: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=f"逗号分隔的返回字段，默认不含 content；可选: {','.join(LIST_FIELDS)}"),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    q = db.query(Post).order_by(Post.updated_at.desc())
+    selected = parse_fields(fields, LIST_FIELDS, DEFAULT_LIST_FIELDS)
+    # 只查询选中的列，content 未选中时不从数据库读取
+    columns = [getattr(Post, f) for f in selected if f not in ("id", "tag_ids")]
+    q = db.query(Post).options(load_only(Post.id, *columns)).order_by(Post.updated_at.desc())
+    if "tag_ids" in selected:
+        # 标签整页批量加载，避免每篇文章单独查询一次
+        q = q.options(selectinload(Post.tags).load_only(Tag.id))
     if status:
         q = q.filter(Post.status == status)
     items = q.offset((page - 1) * size).limit(size).all()
     return [
-        PostOut(
-            id=p.id,
-            title=p.title,
-            slug=p.slug,
-            content=p.content,
-            excerpt=p.excerpt,
-            cover_image=p.cover_image,
-            status=p.status,
-            author_id=p.author_id,
-            view_count=p.view_count,
-            created_at=p.created_at,
-            updated_at=p.updated_at,
-            published_at=p.published_at,
-            tag_ids=[t.id for t in p.tags],
-        )
+        PostListItem(**{f: [t.id for t in p.tags] if f == "tag_ids" else getattr(p, f) for f in selected})
         for p in items
     ]
 
@@ -116,6 +180,7 @@ def create_post(
 ):
     if db.query(Post).filter(Post.slug == body.slug).first():
         raise HTTPException(status_code=400, detail="Slug already exists")
+    tag_ids = _check_tag_ids(db, body.tag_ids)
     post = Post(
         title=body.title,
         slug=body.slug,
@@ -128,8 +193,12 @@ def create_post(
     )
     db.add(post)
     db.flush()
-    for tag_id in body.tag_ids:
-        db.execute(post_tags.insert().values(post_id=post.id, tag_id=tag_id))
+    _link_tags(db, [(post.id, t) for t in tag_ids])
+    apply_tag_count_deltas(db, tag_count_deltas(False, (), body.status == "published", tag_ids))
+    apply_stat_deltas(db, post_count=1, published_post_count=int(body.status == "published"))
+    store_rendered(db, body.content)
+    record_post_change(db, post.id)
+    bump_content_version(db, "posts", "tags")
     db.commit()
     db.refresh(post)
     return PostOut(
@@ -145,7 +214,7 @@ def create_post(
         created_at=post.created_at,
         updated_at=post.updated_at,
         published_at=post.published_at,
-        tag_ids=body.tag_ids,
+        tag_ids=tag_ids,
     )
 
 
@@ -159,6 +228,10 @@ def update_post(
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
+    new_tag_ids = _check_tag_ids(db, body.tag_ids) if body.tag_ids is not None else None
+    # 记录修改前的发布状态与标签，用于增量维护各标签的已发布文章数
+    was_published = post.status == "published"
+    old_tag_ids = post_tag_ids(db, post_id)
     if body.title is not None:
         post.title = body.title
     if body.slug is not None:
@@ -175,10 +248,18 @@ def update_post(
         post.status = body.status
         if body.status == "published" and not post.published_at:
             post.published_at = datetime.utcnow()
-    if body.tag_ids is not None:
-        db.execute(post_tags.delete().where(post_tags.c.post_id == post_id))
-        for tag_id in body.tag_ids:
-            db.execute(post_tags.insert().values(post_id=post_id, tag_id=tag_id))
+    if new_tag_ids is not None:
+        _set_post_tags(db, post_id, old_tag_ids, new_tag_ids)
+    else:
+        new_tag_ids = old_tag_ids
+    apply_tag_count_deltas(
+        db, tag_count_deltas(was_published, old_tag_ids, post.status == "published", new_tag_ids)
+    )
+    apply_stat_deltas(db, published_post_count=int(post.status == "published") - int(was_published))
+    if body.content is not None:
+        store_rendered(db, post.content)
+    record_post_change(db, post_id)
+    bump_content_version(db, "posts", "tags")
     db.commit()
     db.refresh(post)
     return PostOut(
@@ -194,7 +275,7 @@ def update_post(
         created_at=post.created_at,
         updated_at=post.updated_at,
         published_at=post.published_at,
-        tag_ids=body.tag_ids if body.tag_ids is not None else [t.id for t in post.tags],
+        tag_ids=sorted(new_tag_ids),
     )
 
 
@@ -207,12 +288,151 @@ def delete_post(
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
+    published = post.status == "published"
+    if published:
+        apply_tag_count_deltas(db, tag_count_deltas(True, post_tag_ids(db, post_id), False, ()))
+    # 文章的评论由外键级联删除，汇总里一并扣除
+    comments, pending = comment_counts(db, Comment.post_id == post_id)
+    apply_stat_deltas(
+        db,
+        post_count=-1,
+        published_post_count=-int(published),
+        comment_count=-comments,
+        pending_comment_count=-pending,
+        total_views=-(post.view_count or 0),
+    )
     db.delete(post)
+    record_post_change(db, post_id)
+    # 级联删除的评论会从最新评论等列表中消失，评论缓存也要失效
+    bump_content_version(db, "posts", "tags", "comments")
     db.commit()
     return None
 
 
-@router.post("/preview")
-def preview_post(body: BaseModel):
-    """Optional: return rendered HTML for preview. Frontend can also render Markdown locally."""
-    return {"ok": True, "message": "Use frontend Markdown renderer for preview"}
+def _bulk_status(db: Session, posts: list, status: str) -> list[int]:
+    changed = [p for p in posts if p.status != status]
+    if not changed:
+        return []
+    ids = [p.id for p in changed]
+    now = datetime.utcnow()
+    values = {"status": status, "updated_at": now}
+    if status == "published":
+        values["published_at"] = func.coalesce(Post.published_at, now)
+    db.execute(update(Post).where(Post.id.in_(ids)).values(**values).execution_options(synchronize_session=False))
+    # 发布状态变化的文章，其标签的已发布文章数随之增减
+    delta = 1 if status == "published" else -1
+    flipped = ids if status == "published" else [p.id for p in changed if p.status == "published"]
+    deltas: dict[int, int] = defaultdict(int)
+    if flipped:
+        for (tag_id,) in db.execute(select(post_tags.c.tag_id).where(post_tags.c.post_id.in_(flipped))):
+            deltas[tag_id] += delta
+    apply_tag_count_deltas(db, deltas)
+    apply_stat_deltas(db, published_post_count=delta * len(flipped))
+    return ids
+
+
+def _bulk_tags(db: Session, posts: list, tag_ids: list[int], add: bool) -> list[int]:
+    post_ids = [p.id for p in posts]
+    linked = set(
+        db.execute(
+            select(post_tags.c.post_id, post_tags.c.tag_id).where(
+                post_tags.c.post_id.in_(post_ids), post_tags.c.tag_id.in_(tag_ids)
+            )
+        ).tuples()
+    )
+    if add:
+        pairs = [(p, t) for p in post_ids for t in tag_ids if (p, t) not in linked]
+        _link_tags(db, pairs)
+    else:
+        pairs = sorted(linked)
+        if pairs:
+            db.execute(
+                post_tags.delete().where(post_tags.c.post_id.in_(post_ids), post_tags.c.tag_id.in_(tag_ids))
+            )
+    published = {p.id for p in posts if p.status == "published"}
+    deltas: dict[int, int] = defaultdict(int)
+    for post_id, tag_id in pairs:
+        if post_id in published:
+            deltas[tag_id] += 1 if add else -1
+    apply_tag_count_deltas(db, deltas)
+    return sorted({p for p, _ in pairs})
+
+
+def _bulk_delete(db: Session, posts: list) -> list[int]:
+    ids = [p.id for p in posts]
+    published = [p.id for p in posts if p.status == "published"]
+    deltas: dict[int, int] = defaultdict(int)
+    if published:
+        for (tag_id,) in db.execute(select(post_tags.c.tag_id).where(post_tags.c.post_id.in_(published))):
+            deltas[tag_id] -= 1
+    apply_tag_count_deltas(db, deltas)
+    comments, pending = comment_counts(db, Comment.post_id.in_(ids))
+    apply_stat_deltas(
+        db,
+        post_count=-len(ids),
+        published_post_count=-len(published),
+        comment_count=-comments,
+        pending_comment_count=-pending,
+        total_views=-sum(p.view_count or 0 for p in posts),
+    )
+    # 关联与评论显式删除，不依赖数据库是否开启外键级联
+    db.execute(post_tags.delete().where(post_tags.c.post_id.in_(ids)))
+    db.execute(delete(Comment).where(Comment.post_id.in_(ids)).execution_options(synchronize_session=False))
+    db.execute(delete(Post).where(Post.id.in_(ids)).execution_options(synchronize_session=False))
+    return ids
+
+
+@router.post("/bulk")
+def bulk_update_posts(
+    body: PostBulkAction,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """批量改状态、增删标签或删除文章，全部在一个事务里完成，计数与版本号同步更新。"""
+    if body.action == "status":
+        if body.status not in POST_STATUSES:
+            raise HTTPException(status_code=400, detail="status must be draft or published")
+    elif body.action in ("add_tags", "remove_tags"):
+        if not body.tag_ids:
+            raise HTTPException(status_code=400, detail="tag_ids required")
+    elif body.action != "delete":
+        raise HTTPException(status_code=400, detail="action must be status, add_tags, remove_tags or delete")
+    tag_ids = _check_tag_ids(db, body.tag_ids)
+    post_ids = sorted(set(body.post_ids))
+    posts = db.execute(
+        select(Post.id, Post.status, Post.view_count).where(Post.id.in_(post_ids)).with_for_update()
+    ).all()
+    missing = sorted(set(post_ids) - {p.id for p in posts})
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Posts not found: {missing}")
+    if body.action == "status":
+        changed = _bulk_status(db, posts, body.status)
+    elif body.action == "delete":
+        changed = _bulk_delete(db, posts)
+    else:
+        changed = _bulk_tags(db, posts, tag_ids, add=body.action == "add_tags")
+    if changed:
+        record_post_change(db, *changed)
+        scopes = ("posts", "tags", "comments") if body.action == "delete" else ("posts", "tags")
+        bump_content_version(db, *scopes)
+    db.commit()
+    deleted = len(changed) if body.action == "delete" else 0
+    return {"matched": len(posts), "updated": len(changed) - deleted, "deleted": deleted}
+
+
+class PreviewIn(BaseModel):
+    content: str
+
+
+class PreviewOut(BaseModel):
+    html: str  # 与博客前台 html=true 时相同的渲染与净化规则
+    toc: List[dict]
+    word_count: int
+    reading_minutes: int
+    excerpt: str
+
+
+@router.post("/preview", response_model=PreviewOut)
+def preview_post(body: PreviewIn, user: User = Depends(get_current_user)):
+    """服务端渲染预览，不写入渲染缓存（保存时才写）。"""
+    return PreviewOut(**render_markdown(body.content).to_dict())
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.content_version import bump_content_version
 from app.models import User, SiteConfig
 
 router = APIRouter(prefix="/site", tags=["site"])
@@ -62,6 +63,7 @@ def update_site_config(
             row.value = value if value is not None else ""
         else:
             db.add(SiteConfig(key=key, value=value or ""))
+    bump_content_version(db, "site")
     db.commit()
     rows = db.query(SiteConfig).filter(SiteConfig.key.in_(KEYS)).all()
     data = {r.key: r.value for r in rows}
@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.core.database import get_db
 from app.core.auth import get_current_user
-from app.models import User, Post, Comment, Tag
+from app.models import User, Post, Comment, Tag, SiteStat
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
@@ -14,23 +14,33 @@ class StatsOut(BaseModel):
     post_count: int   # 文章总数
     published_post_count: int  # 已发布文章数
     comment_count: int
+    pending_comment_count: int  # 待审核评论数
     tag_count: int
 
 
+def _aggregate(db: Session, name: str) -> int:
+    """按源表现算单个指标，仅在 site_stats 缺少该行时使用。"""
+    if name == "total_views":
+        return db.query(func.coalesce(func.sum(Post.view_count), 0)).scalar() or 0
+    if name == "post_count":
+        return db.query(Post).count()
+    if name == "published_post_count":
+        return db.query(Post).filter(Post.status == "published").count()
+    if name == "comment_count":
+        return db.query(Comment).count()
+    if name == "pending_comment_count":
+        return db.query(Comment).filter(Comment.status == "pending").count()
+    return db.query(Tag).count()
+
+
 @router.get("", response_model=StatsOut)
 def get_stats(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    total_views = db.query(func.coalesce(func.sum(Post.view_count), 0)).scalar() or 0
-    post_count = db.query(Post).count()
-    published_post_count = db.query(Post).filter(Post.status == "published").count()
-    comment_count = db.query(Comment).count()
-    tag_count = db.query(Tag).count()
-    return StatsOut(
-        total_views=int(total_views),
-        post_count=post_count,
-        published_post_count=published_post_count,
-        comment_count=comment_count,
-        tag_count=tag_count,
-    )
+    # 汇总表由各写路径增量维护，一次主键扫描即可拿到全部指标
+    values = dict(db.query(SiteStat.name, SiteStat.value).all())
+    for name in StatsOut.model_fields:
+        if name not in values:
+            values[name] = _aggregate(db, name)
+    return StatsOut(**{name: int(values[name]) for name in StatsOut.model_fields})
@@ -4,6 +4,8 @@ from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
 from app.core.auth import get_current_user
+from app.core.content_version import bump_content_version
+from app.core.counters import apply_stat_deltas
 from app.models import User, Tag
 
 router = APIRouter(prefix="/tags", tags=["tags"])
@@ -23,6 +25,7 @@ class TagOut(BaseModel):
     id: int
     name: str
     slug: str
+    published_post_count: int = 0
 
     class Config:
         from_attributes = True
@@ -51,6 +54,8 @@ def create_tag(
         raise HTTPException(status_code=400, detail="Slug already exists")
     tag = Tag(name=body.name, slug=body.slug)
     db.add(tag)
+    apply_stat_deltas(db, tag_count=1)
+    bump_content_version(db, "tags", "posts")
     db.commit()
     db.refresh(tag)
     return tag
@@ -72,6 +77,7 @@ def update_tag(
         if db.query(Tag).filter(Tag.slug == body.slug, Tag.id != tag_id).first():
             raise HTTPException(status_code=400, detail="Slug already exists")
         tag.slug = body.slug
+    bump_content_version(db, "tags", "posts")
     db.commit()
     db.refresh(tag)
     return tag
@@ -87,5 +93,7 @@ def delete_tag(
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
     db.delete(tag)
+    apply_stat_deltas(db, tag_count=-1)
+    bump_content_version(db, "tags", "posts")
     db.commit()
     return None
@@ -0,0 +1,64 @@
+"""测试使用临时 SQLite 库；环境变量需在导入 app 之前设置。"""
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="zblog-admin-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+from datetime import datetime, timedelta  # noqa: E402
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from app.core.auth import get_current_user  # noqa: E402
+from app.core.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+import app.models as models  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """每个测试使用空表。"""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(models.User.__table__.insert().values(id=1, username="admin", password_hash="x"))
+    yield engine
+
+
+@pytest.fixture
+def client(db):
+    """跳过 JWT 校验，以 id=1 的用户身份请求。"""
+    app.dependency_overrides[get_current_user] = lambda: models.User(id=1, username="admin", password_hash="x")
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def seed_posts(n: int, tags_per_post: int = 0) -> None:
+    """n 篇已发布文章，每篇关联 tags_per_post 个标签。"""
+    now = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        if tags_per_post:
+            conn.execute(
+                models.Tag.__table__.insert(),
+                [{"id": i, "name": f"t{i}", "slug": f"t{i}"} for i in range(1, tags_per_post + 1)],
+            )
+        conn.execute(
+            models.Post.__table__.insert(),
+            [
+                {
+                    "id": i, "title": f"p{i}", "slug": f"p{i}", "content": "body", "status": "published",
+                    "author_id": 1, "view_count": 0, "created_at": now, "updated_at": now + timedelta(minutes=i),
+                    "published_at": now + timedelta(minutes=i),
+                }
+                for i in range(1, n + 1)
+            ],
+        )
+        if tags_per_post:
+            from app.models.post import post_tags
+
+            conn.execute(
+                post_tags.insert(),
+                [{"post_id": p, "tag_id": t} for p in range(1, n + 1) for t in range(1, tags_per_post + 1)],
+            )
@@ -0,0 +1,29 @@
+from sqlalchemy import event
+from tests.conftest import seed_posts
+
+
+def count_statements(engine, client, url: str) -> int:
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_list_posts_statement_count_does_not_grow_with_page_size(db, client):
+    """标签整页批量加载：语句数与每页篇数、每篇标签数无关。"""
+    seed_posts(40, tags_per_post=8)
+    small = count_statements(db, client, "/api/posts?size=2")
+    large = count_statements(db, client, "/api/posts?size=40")
+    assert small == large
+    assert large <= 2  # 文章一条 + 标签批量加载一条
+    items = client.get("/api/posts?size=40").json()
+    assert len(items) == 40
+    assert all(item["tag_ids"] == list(range(1, 9)) for item in items)
@@ -32,6 +32,7 @@ export const auth = {
       body: JSON.stringify({ username, password }),
     }),
   me: () => api<{ username: string }>("/api/auth/me"),
+  logout: () => api<{ ok: boolean }>("/api/auth/logout", { method: "POST" }),
 };
 
 export const posts = {
@@ -41,13 +42,23 @@ export const posts = {
     if (params?.size) sp.set("size", String(params.size));
     if (params?.status) sp.set("status", params.status);
     const q = sp.toString();
-    return api<Post[]>(`/api/posts${q ? `?${q}` : ""}`);
+    return api<PostSummary[]>(`/api/posts${q ? `?${q}` : ""}`);
   },
   get: (id: number) => api<Post>(`/api/posts/${id}`),
   create: (body: PostCreate) => api<Post>("/api/posts", { method: "POST", body: JSON.stringify(body) }),
   update: (id: number, body: PostUpdate) =>
     api<Post>(`/api/posts/${id}`, { method: "PUT", body: JSON.stringify(body) }),
   delete: (id: number) => api<void>(`/api/posts/${id}`, { method: "DELETE" }),
+  bulk: (body: {
+    action: "status" | "add_tags" | "remove_tags" | "delete";
+    post_ids: number[];
+    status?: string;
+    tag_ids?: number[];
+  }) =>
+    api<{ matched: number; updated: number; deleted: number }>("/api/posts/bulk", {
+      method: "POST",
+      body: JSON.stringify(body),
+    }),
 };
 
 export const tags = {
@@ -75,6 +86,12 @@ export const comments = {
       body: JSON.stringify({ status }),
     }),
   delete: (id: number) => api<void>(`/api/comments/${id}`, { method: "DELETE" }),
+  bulk: (body: {
+    action: "approved" | "rejected" | "delete";
+    ids?: number[];
+    filter?: CommentBulkFilter;
+  }) =>
+    api<CommentBulkResult>("/api/comments/bulk", { method: "POST", body: JSON.stringify(body) }),
 };
 
 export const pages = {
@@ -104,6 +121,7 @@ export type Stats = {
   post_count: number;
   published_post_count: number;
   comment_count: number;
+  pending_comment_count: number;
   tag_count: number;
 };
 
@@ -127,6 +145,9 @@ export type Post = {
   tag_ids: number[];
 };
 
+// 列表默认不返回正文
+export type PostSummary = Omit<Post, "content">;
+
 export type PostCreate = {
   title: string;
   slug: string;
@@ -153,7 +174,20 @@ export type Comment = {
   author_email: string;
   content: string;
   status: string;
+  ip?: string;
   created_at: string;
 };
 
+export type CommentBulkFilter = {
+  status?: string;
+  ip?: string;
+  author_email?: string;
+  post_id?: number;
+  page_slug?: string;
+  created_before?: string;
+  created_after?: string;
+};
+
+export type CommentBulkResult = { matched: number; updated: number; deleted: number; chunks: number };
+
 export type Page = { id: number; slug: string; title: string; content?: string; updated_at: string };
@@ -7,6 +7,8 @@ export default function Layout() {
   const navigate = useNavigate();
 
   const handleLogout = () => {
+    // 服务端注销当前 token；失败不影响本地退出
+    auth.logout().catch(() => {});
     localStorage.removeItem("zblog_admin_token");
     queryClient.clear();
     navigate("/login");
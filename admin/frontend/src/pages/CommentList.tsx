@@ -1,5 +1,6 @@
+import { useState } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
-import { comments, type Comment } from "../api/client";
+import { comments, type Comment, type CommentBulkFilter } from "../api/client";
 
 export default function CommentList() {
   const queryClient = useQueryClient();
@@ -19,6 +20,35 @@ export default function CommentList() {
     onSuccess: () => queryClient.invalidateQueries({ queryKey: ["comments-admin"] }),
   });
 
+  const [selected, setSelected] = useState<Set<number>>(new Set());
+  const toggle = (id: number) =>
+    setSelected((prev) => {
+      const next = new Set(prev);
+      if (next.has(id)) next.delete(id);
+      else next.add(id);
+      return next;
+    });
+
+  const bulk = useMutation({
+    mutationFn: (body: { action: "approved" | "rejected" | "delete"; ids?: number[]; filter?: CommentBulkFilter }) =>
+      comments.bulk(body),
+    onSuccess: (r) => {
+      setSelected(new Set());
+      queryClient.invalidateQueries({ queryKey: ["comments-admin"] });
+      alert(`已处理 ${r.matched} 条评论${r.deleted > r.matched ? `（含回复共删除 ${r.deleted} 条）` : ""}`);
+    },
+  });
+
+  const bulkSelected = (action: "approved" | "rejected" | "delete") => {
+    if (action === "delete" && !confirm(`删除选中的 ${selected.size} 条评论及其回复？`)) return;
+    bulk.mutate({ action, ids: [...selected] });
+  };
+
+  const purgeIp = (ip: string) => {
+    if (!confirm(`删除来自 ${ip} 的全部待审核评论？`)) return;
+    bulk.mutate({ action: "delete", filter: { status: "pending", ip } });
+  };
+
   if (isLoading) return <div>加载中...</div>;
 
   const pending = list?.filter((c: Comment) => c.status === "pending") ?? [];
@@ -31,11 +61,46 @@ export default function CommentList() {
       <p className="text-gray-600 mb-4">
         待审核: {pending.length} · 已通过: {approved.length} · 已拒绝: {rejected.length}
       </p>
+      {selected.size > 0 && (
+        <div className="flex items-center gap-3 mb-4 text-sm">
+          <span className="text-gray-600">已选 {selected.size} 条</span>
+          <button
+            type="button"
+            disabled={bulk.isPending}
+            onClick={() => bulkSelected("approved")}
+            className="text-green-600 hover:underline"
+          >
+            批量通过
+          </button>
+          <button
+            type="button"
+            disabled={bulk.isPending}
+            onClick={() => bulkSelected("rejected")}
+            className="text-red-600 hover:underline"
+          >
+            批量拒绝
+          </button>
+          <button
+            type="button"
+            disabled={bulk.isPending}
+            onClick={() => bulkSelected("delete")}
+            className="text-gray-500 hover:underline"
+          >
+            批量删除
+          </button>
+        </div>
+      )}
       <ul className="space-y-4">
         {(list ?? []).map((c: Comment) => (
           <li key={c.id} className="bg-white p-4 rounded-lg shadow">
             <div className="flex justify-between items-start">
               <div>
+                <input
+                  type="checkbox"
+                  checked={selected.has(c.id)}
+                  onChange={() => toggle(c.id)}
+                  className="mr-2"
+                />
                 <span className="font-medium">{c.author_name}</span>
                 <span className="text-gray-500 text-sm ml-2">{c.author_email}</span>
                 <span
@@ -52,6 +117,7 @@ export default function CommentList() {
                 <p className="mt-2 text-gray-700">{c.content}</p>
                 <p className="text-gray-400 text-sm mt-1">
                   {new Date(c.created_at).toLocaleString("zh-CN")}
+                  {c.ip && <> · {c.ip}</>}
                   {" · "}
                   {c.post_url && c.post_title ? (
                     <a
@@ -86,6 +152,15 @@ export default function CommentList() {
                     </button>
                   </>
                 )}
+                {c.status === "pending" && c.ip && (
+                  <button
+                    type="button"
+                    onClick={() => purgeIp(c.ip!)}
+                    className="text-gray-500 hover:underline text-sm"
+                  >
+                    清理该 IP
+                  </button>
+                )}
                 <button
                   type="button"
                   onClick={() => deleteComment.mutate(c.id)}
@@ -1,12 +1,13 @@
 import { Link } from "react-router-dom";
 import { useQuery } from "@tanstack/react-query";
-import { posts, comments, stats as statsApi, type Post, type Comment } from "../api/client";
+import { posts, comments, stats as statsApi, type PostSummary, type Comment } from "../api/client";
 
 const statCards = [
   { key: "total_views" as const, label: "站点浏览量", color: "bg-blue-50 border-blue-200 text-blue-800" },
   { key: "post_count" as const, label: "文章总数", color: "bg-green-50 border-green-200 text-green-800" },
   { key: "published_post_count" as const, label: "已发布", color: "bg-emerald-50 border-emerald-200 text-emerald-800" },
   { key: "comment_count" as const, label: "评论量", color: "bg-amber-50 border-amber-200 text-amber-800" },
+  { key: "pending_comment_count" as const, label: "待审核评论", color: "bg-orange-50 border-orange-200 text-orange-800" },
   { key: "tag_count" as const, label: "标签数", color: "bg-purple-50 border-purple-200 text-purple-800" },
 ];
 
@@ -29,7 +30,7 @@ export default function Dashboard() {
       <h1 className="text-2xl font-bold">仪表盘</h1>
 
       {/* 统计信息 */}
-      <div className="grid grid-cols-2 sm:grid-cols-3 md:grid-cols-5 gap-4">
+      <div className="grid grid-cols-2 sm:grid-cols-3 md:grid-cols-6 gap-4">
         {statCards.map(({ key, label, color }) => (
           <div
             key={key}
@@ -48,7 +49,7 @@ export default function Dashboard() {
           <h2 className="font-semibold mb-4">最近文章</h2>
           {postList?.length ? (
             <ul className="space-y-2">
-              {postList.slice(0, 5).map((p: Post) => (
+              {postList.slice(0, 5).map((p: PostSummary) => (
                 <li key={p.id}>
                   <Link to={`/posts/${p.id}`} className="text-blue-600 hover:underline">
                     {p.title}
@@ -1,12 +1,31 @@
+import { useState } from "react";
 import { Link } from "react-router-dom";
-import { useQuery } from "@tanstack/react-query";
-import { posts, type Post } from "../api/client";
+import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
+import { posts, type PostSummary } from "../api/client";
 
 export default function PostList() {
+  const queryClient = useQueryClient();
   const { data: list, isLoading } = useQuery({
     queryKey: ["posts-list"],
     queryFn: () => posts.list({ page: 1, size: 50 }),
   });
+  const [selected, setSelected] = useState<Set<number>>(new Set());
+  const toggle = (id: number) =>
+    setSelected((prev) => {
+      const next = new Set(prev);
+      if (next.has(id)) next.delete(id);
+      else next.add(id);
+      return next;
+    });
+
+  const bulk = useMutation({
+    mutationFn: (body: { action: "status" | "delete"; status?: string }) =>
+      posts.bulk({ ...body, post_ids: [...selected] }),
+    onSuccess: () => {
+      setSelected(new Set());
+      queryClient.invalidateQueries({ queryKey: ["posts-list"] });
+    },
+  });
 
   if (isLoading) return <div>加载中...</div>;
 
@@ -21,14 +40,49 @@ export default function PostList() {
           新建文章
         </Link>
       </div>
+      {selected.size > 0 && (
+        <div className="flex items-center gap-3 mb-4 text-sm">
+          <span className="text-gray-600">已选 {selected.size} 篇</span>
+          <button
+            type="button"
+            disabled={bulk.isPending}
+            onClick={() => bulk.mutate({ action: "status", status: "published" })}
+            className="text-green-600 hover:underline"
+          >
+            发布
+          </button>
+          <button
+            type="button"
+            disabled={bulk.isPending}
+            onClick={() => bulk.mutate({ action: "status", status: "draft" })}
+            className="text-gray-600 hover:underline"
+          >
+            转为草稿
+          </button>
+          <button
+            type="button"
+            disabled={bulk.isPending}
+            onClick={() => confirm(`删除选中的 ${selected.size} 篇文章及其评论？`) && bulk.mutate({ action: "delete" })}
+            className="text-red-600 hover:underline"
+          >
+            删除
+          </button>
+        </div>
+      )}
       {list?.length ? (
         <ul className="bg-white rounded-lg shadow overflow-hidden">
-          {list.map((p: Post) => (
+          {list.map((p: PostSummary) => (
             <li
               key={p.id}
               className="border-b border-gray-100 last:border-0 px-4 py-3 flex justify-between items-center"
             >
               <div>
+                <input
+                  type="checkbox"
+                  checked={selected.has(p.id)}
+                  onChange={() => toggle(p.id)}
+                  className="mr-2"
+                />
                 <Link to={`/posts/${p.id}`} className="font-medium text-blue-600 hover:underline">
                   {p.title}
                 </Link>
@@ -8,7 +8,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.core.config import settings
 from app.core.database import Base
-from app.models import User, Post, Tag, Comment, Page, SiteConfig
+from app.models import User, Post, Tag, Comment, Page, SiteConfig, ContentVersion, SiteStat, PostChange, RenderedContent
 from app.models.post import post_tags
 
 config = context.config
@@ -0,0 +1,22 @@
+"""Add (status, published_at, id) index on posts for list and cursor pagination.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_posts_status_published_at_id", "posts", ["status", "published_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_posts_status_published_at_id", table_name="posts")
@@ -0,0 +1,32 @@
+"""Add tags.published_post_count maintained by admin post writes.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tags",
+        sa.Column("published_post_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # 用现有数据回填，之后由管理后台增量维护
+    op.execute(
+        "UPDATE tags SET published_post_count = ("
+        "SELECT COUNT(*) FROM post_tags JOIN posts ON posts.id = post_tags.post_id "
+        "WHERE post_tags.tag_id = tags.id AND posts.status = 'published')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tags", "published_post_count")
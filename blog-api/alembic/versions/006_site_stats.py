@@ -0,0 +1,40 @@
+"""Add site_stats rollup table for the admin dashboard.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 指标名 -> 回填用的聚合查询
+BACKFILL = {
+    "post_count": "SELECT COUNT(*) FROM posts",
+    "published_post_count": "SELECT COUNT(*) FROM posts WHERE status = 'published'",
+    "comment_count": "SELECT COUNT(*) FROM comments",
+    "pending_comment_count": "SELECT COUNT(*) FROM comments WHERE status = 'pending'",
+    "tag_count": "SELECT COUNT(*) FROM tags",
+    "total_views": "SELECT COALESCE(SUM(view_count), 0) FROM posts",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "site_stats",
+        sa.Column("name", sa.String(32), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), onupdate=sa.func.now()),
+    )
+    for name, query in BACKFILL.items():
+        op.execute(f"INSERT INTO site_stats (name, value) SELECT '{name}', ({query})")
+
+
+def downgrade() -> None:
+    op.drop_table("site_stats")
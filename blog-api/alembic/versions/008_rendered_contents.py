@@ -0,0 +1,33 @@
+"""Add rendered_contents cache for server-side Markdown rendering.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rendered_contents",
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("html", sa.Text().with_variant(mysql.MEDIUMTEXT(), "mysql"), nullable=False),
+        sa.Column("toc", sa.Text(), nullable=False),
+        sa.Column("word_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("reading_minutes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("excerpt", sa.String(500)),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rendered_contents")
@@ -0,0 +1,24 @@
+"""Add (post_id, status, parent_id, created_at) index on comments for the threaded comment tree.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_comments_post_status_parent_created", "comments", ["post_id", "status", "parent_id", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_comments_post_status_parent_created", table_name="comments")
@@ -0,0 +1,31 @@
+"""Add posts.comment_count (approved comments) maintained by admin comment moderation.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "posts",
+        sa.Column("comment_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # 用现有数据回填，之后由管理后台审核/删除评论时增量维护
+    op.execute(
+        "UPDATE posts SET comment_count = ("
+        "SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id AND comments.status = 'approved')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "comment_count")
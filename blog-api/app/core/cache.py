@@ -0,0 +1,283 @@
+"""公开接口的响应缓存：TTL + 按字节数限制的 LRU，可选磁盘二级缓存。
+
+缓存键由路由、查询参数和相关内容范围（posts/tags/pages/site/comments）的版本号组成。
+管理后台写入时在同一事务里递增 content_versions 表中的版本号，
+本服务最多每 CACHE_VERSION_CHECK_SECONDS 秒读一次版本号，
+版本变化后旧键不再命中，随 LRU 自然淘汰。
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from time import monotonic, time
+from typing import Any, Awaitable, Callable
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from app.core.conditional import (
+    apply_validators,
+    body_etag,
+    is_not_modified,
+    latest,
+    not_modified_response,
+)
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    expires_at: float  # time.time()，磁盘缓存跨进程重启也能比较
+    meta: dict = field(default_factory=dict)
+
+    @property
+    def etag(self) -> str | None:
+        return self.meta.get("etag")
+
+    @property
+    def last_modified(self) -> datetime | None:
+        value = self.meta.get("last_modified")
+        return datetime.fromisoformat(value) if value else None
+
+    def to_response(self, request: Request | None = None) -> Response:
+        """带上 ETag / Last-Modified；请求的验证器匹配时返回 304。"""
+        if request is not None and is_not_modified(request, self.etag, self.last_modified):
+            return not_modified_response(self.etag, self.last_modified)
+        return apply_validators(
+            Response(content=self.body, media_type="application/json"), self.etag, self.last_modified
+        )
+
+
+def render_json(value: Any) -> bytes:
+    """与 FastAPI JSONResponse 相同的序列化方式。"""
+    return json.dumps(
+        jsonable_encoder(value), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class ContentVersions:
+    """content_versions 表的进程内副本，按间隔刷新。"""
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._versions: dict[str, int] = {}
+        self._updated_at: dict[str, datetime] = {}
+        self._checked_at = float("-inf")
+        self._refreshing = False
+
+    def get(self, scope: str) -> int:
+        return self._versions.get(scope, 0)
+
+    def last_modified(self, *scopes: str) -> datetime | None:
+        """各范围最近一次被管理后台修改的时间。"""
+        return latest(*(self._updated_at.get(s) for s in scopes))
+
+    async def refresh_if_stale(self) -> None:
+        if monotonic() - self._checked_at < self.check_interval:
+            return
+        # 只让一个请求去查库，其余请求继续使用旧版本号
+        if self._refreshing:
+            return
+        self._refreshing = True
+        try:
+            await self.refresh()
+        finally:
+            self._refreshing = False
+
+    async def refresh(self) -> None:
+        from sqlalchemy import select
+        from app.core.database import session_scope
+        from app.models import ContentVersion
+
+        try:
+            async with session_scope() as db:
+                rows = await db.all(
+                    select(ContentVersion.scope, ContentVersion.version, ContentVersion.updated_at)
+                )
+            self._versions = {r.scope: int(r.version or 0) for r in rows}
+            self._updated_at = {r.scope: r.updated_at for r in rows if r.updated_at}
+        except Exception:
+            logger.exception("load content versions failed")
+        finally:
+            self._checked_at = monotonic()
+
+    def invalidate(self) -> None:
+        """下次 refresh_if_stale() 时强制重新读取版本号。"""
+        self._checked_at = float("-inf")
+
+
+class DiskCache:
+    """基于 SQLite 文件的二级缓存，进程重启后仍可命中，多个 worker 可共用。"""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, meta TEXT NOT NULL, body BLOB NOT NULL)"
+        )
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, meta, body FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if not row or row[0] <= time():
+            return None
+        return CacheEntry(body=bytes(row[2]), expires_at=row[0], meta=json.loads(row[1]))
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, expires_at, meta, body) VALUES (?, ?, ?, ?)",
+                (key, entry.expires_at, json.dumps(entry.meta), entry.body),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._prune()
+
+    def _prune(self) -> None:
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(LENGTH(body)), 0) FROM cache").fetchone()[0]
+        if total > self.max_bytes:
+            # 先淘汰最早过期的条目，直到回到上限以内
+            excess = total - self.max_bytes
+            for key, size in self._conn.execute(
+                "SELECT key, LENGTH(body) FROM cache ORDER BY expires_at"
+            ).fetchall():
+                if excess <= 0:
+                    break
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                excess -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int, ttl: float, versions: ContentVersions, disk: DiskCache | None = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.versions = versions
+        self.disk = disk
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+    def key(self, request: Request, *scopes: str) -> str:
+        """路由 + 排序后的查询参数 + 各范围的当前版本号（调用前先 refresh_if_stale）。"""
+        versions = ",".join(f"{s}={self.versions.get(s)}" for s in scopes)
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{versions}|{request.url.path}?{query}"
+
+    def get(self, key: str) -> CacheEntry | None:
+        now = time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                self._remove(key)
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self._put(key, entry)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return entry
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, body: bytes, meta: dict | None = None) -> CacheEntry:
+        entry = CacheEntry(body=body, expires_at=time() + self.ttl, meta=meta or {})
+        self._put(key, entry)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, entry)
+            except sqlite3.Error:
+                logger.exception("write disk cache failed")
+        return entry
+
+    def _put(self, key: str, entry: CacheEntry) -> None:
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._size += size
+            while self._size > self.max_bytes:
+                old_key = next(iter(self._entries))
+                self._remove(old_key)
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._size -= len(entry.body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "disk_hits": self.disk_hits,
+            "entries": len(self._entries),
+            "bytes": self._size,
+        }
+
+
+def validator_meta(etag: str, last_modified: datetime | None, **extra) -> dict:
+    return {"etag": etag, "last_modified": last_modified.isoformat() if last_modified else None, **extra}
+
+
+async def cached_json(request: Request, scopes: tuple[str, ...], build: Callable[[], Awaitable[Any]]) -> Response:
+    """命中则直接返回缓存的 JSON；否则调用 build() 生成响应并写入缓存。
+
+    ETag 取响应体摘要，Last-Modified 取相关范围最近一次修改时间，
+    命中缓存时条件请求无需查库即可返回 304。
+    """
+    await content_versions.refresh_if_stale()
+    key = response_cache.key(request, *scopes) if settings.CACHE_ENABLED else None
+    entry = response_cache.get(key) if key else None
+    if entry is None:
+        last_modified = content_versions.last_modified(*scopes)
+        body = render_json(await build())
+        meta = validator_meta(body_etag(body), last_modified)
+        entry = response_cache.set(key, body, meta) if key else CacheEntry(body, 0, meta)
+    return entry.to_response(request)
+
+
+content_versions = ContentVersions(check_interval=settings.CACHE_VERSION_CHECK_SECONDS)
+response_cache = ResponseCache(
+    max_bytes=settings.CACHE_MAX_BYTES,
+    ttl=settings.CACHE_TTL_SECONDS,
+    versions=content_versions,
+    disk=DiskCache(settings.CACHE_DISK_PATH, settings.CACHE_DISK_MAX_BYTES) if settings.CACHE_DISK_PATH else None,
+)
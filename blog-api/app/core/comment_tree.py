@@ -0,0 +1,121 @@
+"""评论树：一次查询取出某篇文章（或页面）全部已通过的评论，在内存中 O(n) 组装成嵌套结构。
+
+组装结果按 comments 内容版本号缓存在进程内（管理后台审核、删除评论时递增该版本号），
+分页只是对顶层讨论串切片，不再查库。
+"""
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from app.core.config import settings
+
+Node = dict  # {"id", "parent_id", "author_name", "content", "created_at", "replies": [Node, ...]}
+
+
+class CommentTree:
+    __slots__ = ("threads", "count")
+
+    def __init__(self, threads: list[Node], count: int):
+        self.threads = threads  # 顶层评论，按时间先后
+        self.count = count  # 树中的评论总数（父评论未通过的回复不计入）
+
+
+def build_tree(rows, max_depth: int) -> CommentTree:
+    """rows 为 (id, parent_id, author_name, content, created_at)，同一父评论下按时间先后排列。
+
+    顶层为第 1 层（max_depth 至少为 2）；更深的回复平铺到第 max_depth 层并按时间排序，
+    parent_id 仍为实际回复的评论。父评论不在结果中（未通过或已删除）的回复不展示。
+    """
+    children: dict[int | None, list[Node]] = {}
+    for r in rows:
+        node = {
+            "id": r.id,
+            "parent_id": r.parent_id,
+            "author_name": r.author_name,
+            "content": r.content,
+            "created_at": r.created_at,
+            "replies": [],
+        }
+        children.setdefault(r.parent_id, []).append(node)
+    threads = children.get(None, [])
+    count = 0
+    max_depth = max(2, max_depth)
+    flattened: dict[int, list[Node]] = {}
+    # (节点, 层数, 平铺时接收其回复的列表)
+    stack: list[tuple[Node, int, list[Node]]] = [(n, 1, threads) for n in reversed(threads)]
+    while stack:
+        node, depth, siblings = stack.pop()
+        count += 1
+        kids = children.get(node["id"])
+        if not kids:
+            continue
+        if depth < max_depth:
+            node["replies"] = kids
+            stack.extend((k, depth + 1, kids) for k in reversed(kids))
+        else:
+            siblings.extend(kids)
+            flattened[id(siblings)] = siblings
+            stack.extend((k, depth, siblings) for k in reversed(kids))
+    for replies in flattened.values():
+        replies.sort(key=lambda n: (n["created_at"], n["id"]))
+    return CommentTree(threads, count)
+
+
+class CommentTreeCache:
+    """按目标（文章 id 或页面 slug）缓存组装好的评论树，LRU 限制条目数。
+
+    同一目标同时未命中时只有一个请求去查库，其余等待其结果。
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[int, CommentTree]] = OrderedDict()
+        self._loading: dict[tuple, asyncio.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: tuple, version: int) -> CommentTree | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    async def get(self, key: tuple, version: int, load: Callable[[], Awaitable[CommentTree]]) -> CommentTree:
+        if self.max_entries <= 0:
+            return await load()
+        tree = self._get(key, version)
+        if tree is not None:
+            self.hits += 1
+            return tree
+        lock = self._loading.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                tree = self._get(key, version)
+                if tree is not None:
+                    self.hits += 1
+                    return tree
+                self.misses += 1
+                tree = await load()
+                with self._lock:
+                    self._entries[key] = (version, tree)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                return tree
+        finally:
+            if not lock.locked():
+                self._loading.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# 与响应缓存一起开关：CACHE_ENABLED=false 时每次都查库
+comment_trees = CommentTreeCache(settings.COMMENT_TREE_CACHE_ENTRIES if settings.CACHE_ENABLED else 0)
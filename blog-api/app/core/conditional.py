@@ -0,0 +1,63 @@
+"""条件请求：生成 ETag / Last-Modified，并按 If-None-Match / If-Modified-Since 返回 304。"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def body_etag(body: bytes) -> str:
+    return f'W/"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+def _utc(dt: datetime) -> datetime:
+    # 数据库中的时间为 datetime.utcnow() 写入的 naive UTC
+    dt = dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def latest(*values: datetime | None) -> datetime | None:
+    present = [_utc(v) for v in values if v is not None]
+    return max(present) if present else None
+
+
+def has_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str | None, last_modified: datetime | None) -> bool:
+    """If-None-Match 优先（弱比较）；没有时才看 If-Modified-Since。"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if not etag:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        wanted = etag.removeprefix("W/")
+        return any(t.strip().removeprefix("W/") == wanted for t in if_none_match.split(","))
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _utc(last_modified) <= _utc(since)
+    return False
+
+
+def apply_validators(response: Response, etag: str | None, last_modified: datetime | None) -> Response:
+    if etag:
+        response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    # 允许浏览器/nginx 保存副本，但每次使用前都要带验证器回源确认
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def not_modified_response(etag: str | None, last_modified: datetime | None) -> Response:
+    return apply_validators(Response(status_code=304), etag, last_modified)
@@ -1,6 +1,13 @@
 from pydantic_settings import BaseSettings
 
 
+def _async_url(url: str) -> str:
+    for sync_prefix, async_prefix in (("mysql+pymysql://", "mysql+aiomysql://"), ("sqlite://", "sqlite+aiosqlite://")):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
 class Settings(BaseSettings):
     MYSQL_HOST: str = "localhost"
     MYSQL_PORT: int = 3306
@@ -8,14 +15,67 @@ class Settings(BaseSettings):
     MYSQL_PASSWORD: str = ""
     MYSQL_DATABASE: str = "zblog"
     CORS_ORIGINS: str = "*"
+    DATABASE_URL: str = ""  # 直接指定 SQLAlchemy 连接串（如本地 sqlite:///./zblog.db），为空则由 MYSQL_* 拼接
+    DB_ASYNC: bool = False  # 公开路由使用异步数据库驱动（MySQL 为 aiomysql，SQLite 为 aiosqlite）
+    ASYNC_DATABASE_URL: str = ""  # 异步连接串，为空则由 database_url 推导
+    DATABASE_REPLICA_URLS: str = ""  # 只读副本连接串，逗号分隔；公开 GET 接口轮询读取副本，为空则全部走主库
+    ASYNC_DATABASE_REPLICA_URLS: str = ""  # 副本的异步连接串，逗号分隔，为空则由 DATABASE_REPLICA_URLS 推导
+    DB_REPLICA_CHECK_SECONDS: float = 2.0  # 副本健康与复制延迟检查间隔（秒），0 为关闭
+    DB_REPLICA_EJECT_SECONDS: float = 30.0  # 查询出错的副本至少摘除多久（秒）
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0  # 客户端写入后多久内其读请求改走主库（秒，通过 cookie 标记），0 为关闭
+    DB_POOL_SIZE: int = 5  # 连接池常驻连接数
+    DB_MAX_OVERFLOW: int = 10  # 连接池允许临时超出的连接数
+    VIEW_COUNT_SHARDS: int = 16  # 浏览量缓冲分片数
+    VIEW_COUNT_FLUSH_INTERVAL_SECONDS: float = 5.0  # 浏览量缓冲写回间隔（秒）
+    VIEW_COUNT_FLUSH_THRESHOLD: int = 1000  # 缓冲中累计浏览次数达到该值时提前写回
+    POST_COUNT_CACHE_SECONDS: float = 30.0  # 文章列表 total 的缓存时间（秒）
+    COUNTER_RECONCILE_INTERVAL_SECONDS: float = 3600.0  # 统计汇总/标签计数全量校正间隔（秒），0 为关闭
+    CACHE_ENABLED: bool = True  # 公开 GET 接口响应缓存
+    CACHE_TTL_SECONDS: float = 300.0  # 缓存条目存活时间（秒）
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 内存缓存上限（字节）
+    CACHE_VERSION_CHECK_SECONDS: float = 2.0  # 最多每隔多少秒检查一次内容版本号
+    CACHE_DISK_PATH: str = ""  # 磁盘二级缓存文件（SQLite），为空则不启用
+    CACHE_DISK_MAX_BYTES: int = 512 * 1024 * 1024  # 磁盘缓存上限（字节）
+    SEARCH_ENABLED: bool = True  # 站内搜索（/api/search），启动时在后台构建索引
+    SEARCH_INDEX_PATH: str = "data/search.idx"  # 搜索索引快照文件，为空则每次启动全量构建
+    SEARCH_CHANGE_RETENTION_DAYS: int = 30  # post_changes 变更日志保留天数，更旧的快照会被丢弃重建
+    COMMENT_RATE_LIMIT_MAX: int = 5  # 同一 IP 在时间窗口内最多提交的评论数
+    COMMENT_RATE_LIMIT_WINDOW_SECONDS: float = 60.0  # 评论限流时间窗口（秒）
+    COMMENT_TREE_MAX_DEPTH: int = 4  # 评论树最多嵌套层数，更深的回复平铺在最后一层
+    COMMENT_TREE_CACHE_ENTRIES: int = 1024  # 进程内缓存的评论树（文章/页面）数量，0 为不缓存
+    RATE_LIMIT_GLOBAL_PER_MINUTE: int = 0  # 全局按 IP 限流：每分钟平均请求数，0 为关闭
+    RATE_LIMIT_GLOBAL_BURST: int = 0  # 全局限流允许的突发请求数，0 表示与每分钟请求数相同
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # 每条限流规则最多跟踪的键（IP）数，超出时淘汰最久未访问的
+    RATE_LIMIT_SWEEP_SECONDS: float = 60.0  # 清理空闲键的间隔（秒）
+    RATE_LIMIT_BACKEND_PATH: str = ""  # 限流计数的共享 SQLite 文件（多 worker 共用），为空则各进程独立计数
+    METRICS_ENABLED: bool = True  # 请求与 SQL 指标，/metrics 以 Prometheus 文本格式输出
+    METRICS_TOKEN: str = ""  # 访问 /metrics 需携带的 Bearer token，为空则不校验（应由反向代理限制访问）
 
     @property
     def database_url(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return (
             f"mysql+pymysql://{self.MYSQL_USER}:{self.MYSQL_PASSWORD}"
             f"@{self.MYSQL_HOST}:{self.MYSQL_PORT}/{self.MYSQL_DATABASE}"
         )
 
+    @property
+    def async_database_url(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        return _async_url(self.database_url)
+
+    @property
+    def replica_urls(self) -> list[str]:
+        return [u.strip() for u in self.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+
+    @property
+    def async_replica_urls(self) -> list[str]:
+        if self.ASYNC_DATABASE_REPLICA_URLS:
+            return [u.strip() for u in self.ASYNC_DATABASE_REPLICA_URLS.split(",") if u.strip()]
+        return [_async_url(u) for u in self.replica_urls]
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
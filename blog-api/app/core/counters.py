@@ -0,0 +1,147 @@
+"""反范式计数：site_stats 汇总、tags.published_post_count 与 posts.comment_count。
+
+写路径（评论提交、浏览量写回、管理后台的文章/评论/标签写入）在同一事务里做相对增减；
+CounterReconciler 定期从源表全量重算，修正手工改库、导入数据或级联删除造成的漂移。
+"""
+import logging
+import threading
+from datetime import datetime
+from sqlalchemy import case, func, insert, literal, select, update
+from app.core.config import settings
+from app.models import Comment, Post, SiteStat, Tag
+from app.models.post import post_tags
+
+logger = logging.getLogger(__name__)
+
+
+def stat_increment(**deltas: int):
+    """一条 UPDATE 同时增减多个 site_stats 指标；没有非零增量时返回 None。"""
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return None
+    return (
+        update(SiteStat)
+        .where(SiteStat.name.in_(deltas))
+        .values(value=SiteStat.value + case(deltas, value=SiteStat.name), updated_at=datetime.utcnow())
+    )
+
+
+def stat_sources() -> dict:
+    """各指标对应的源表聚合（标量子查询）。"""
+    def count(model, *where):
+        return select(func.count()).select_from(model).where(*where).scalar_subquery()
+
+    return {
+        "post_count": count(Post),
+        "published_post_count": count(Post, Post.status == "published"),
+        "comment_count": count(Comment),
+        "pending_comment_count": count(Comment, Comment.status == "pending"),
+        "tag_count": count(Tag),
+        "total_views": select(func.coalesce(func.sum(Post.view_count), 0)).scalar_subquery(),
+    }
+
+
+def reconcile_site_stats(conn, dry_run: bool = False) -> int:
+    """按源表重算 site_stats（缺失的行会补上），返回不一致的指标数。"""
+    existing = set(conn.execute(select(SiteStat.name)).scalars())
+    drifted = 0
+    for name, actual in stat_sources().items():
+        if name not in existing:
+            drifted += 1
+            if not dry_run:
+                conn.execute(
+                    insert(SiteStat).from_select(["name", "value"], select(literal(name), actual))
+                )
+            continue
+        # 比较与写入放在同一条语句里，不会覆盖并发写入的增量
+        where = (SiteStat.name == name, SiteStat.value != actual)
+        if dry_run:
+            drifted += conn.execute(select(func.count()).select_from(SiteStat).where(*where)).scalar()
+        else:
+            drifted += conn.execute(
+                update(SiteStat).where(*where).values(value=actual, updated_at=datetime.utcnow())
+            ).rowcount
+    return drifted
+
+
+def reconcile_tag_counts(conn, dry_run: bool = False) -> int:
+    """修正 tags.published_post_count，返回计数不一致的标签数。"""
+    actual = (
+        select(func.count())
+        .select_from(post_tags.join(Post, Post.id == post_tags.c.post_id))
+        .where(post_tags.c.tag_id == Tag.id, Post.status == "published")
+        .scalar_subquery()
+    )
+    drifted = conn.execute(
+        select(func.count()).select_from(Tag).where(Tag.published_post_count != actual)
+    ).scalar()
+    if drifted and not dry_run:
+        conn.execute(update(Tag).where(Tag.published_post_count != actual).values(published_post_count=actual))
+    return drifted
+
+
+def reconcile_post_comment_counts(conn, dry_run: bool = False) -> int:
+    """修正 posts.comment_count（已通过的评论数），返回计数不一致的文章数。"""
+    actual = (
+        select(func.count())
+        .select_from(Comment)
+        .where(Comment.post_id == Post.id, Comment.status == "approved")
+        .scalar_subquery()
+    )
+    drifted = conn.execute(select(func.count()).select_from(Post).where(Post.comment_count != actual)).scalar()
+    if drifted and not dry_run:
+        # 显式保留 updated_at：计数校正不算内容修改，不能触发 onupdate
+        conn.execute(
+            update(Post).where(Post.comment_count != actual).values(comment_count=actual, updated_at=Post.updated_at)
+        )
+    return drifted
+
+
+def reconcile_all(dry_run: bool = False) -> dict[str, int]:
+    from app.core.database import engine
+
+    with engine.begin() as conn:
+        return {
+            "site_stats": reconcile_site_stats(conn, dry_run),
+            "tags.published_post_count": reconcile_tag_counts(conn, dry_run),
+            "posts.comment_count": reconcile_post_comment_counts(conn, dry_run),
+        }
+
+
+class CounterReconciler:
+    """后台线程：每 interval 秒全量校正一次计数，interval <= 0 时不启动。"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> dict[str, int]:
+        try:
+            drifted = reconcile_all()
+        except Exception:
+            logger.exception("reconcile counters failed")
+            return {}
+        if any(drifted.values()):
+            logger.warning("reconciled drifted counters: %s", drifted)
+        return drifted
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.run_once()
+
+    def start(self) -> None:
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="counter-reconcile", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+counter_reconciler = CounterReconciler(interval=settings.COUNTER_RECONCILE_INTERVAL_SECONDS)
@@ -1,15 +1,80 @@
+import asyncio
+import math
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+from fastapi import Request, Response
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_engine
+from app.core.replicas import Replica, ReplicaSet
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    echo=False,
-)
+
+def _engine_kwargs(url: str, is_async: bool = False) -> dict:
+    kwargs = {"pool_pre_ping": True, "echo": False}
+    if url.startswith("sqlite"):
+        # 本地/测试用 SQLite：连接会在线程池的不同线程间使用
+        kwargs["connect_args"] = {"check_same_thread": False}
+    # aiosqlite 与内存库不使用 QueuePool，不能设置连接池大小
+    if not url.startswith("sqlite+aiosqlite") and ":memory:" not in url:
+        kwargs.update(pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW)
+        if settings.METRICS_ENABLED:
+            # 统计取连接的等待时间
+            kwargs["poolclass"] = TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool
+    return kwargs
+
+
+engine = create_engine(settings.database_url, **_engine_kwargs(settings.database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# 异步模式（DB_ASYNC=true）：公开路由通过 aiomysql / aiosqlite 访问数据库，不占用线程池；
+# 同步引擎仍保留给脚本和后台任务（如浏览量写回）使用。
+async_engine = (
+    create_async_engine(settings.async_database_url, **_engine_kwargs(settings.async_database_url, is_async=True))
+    if settings.DB_ASYNC
+    else None
+)
+if settings.METRICS_ENABLED:
+    instrument_engine(engine, "sync")
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine, "async")
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False) if async_engine else None
+)
+
+
+def _replica(index: int, url: str, async_url: str) -> Replica:
+    name = f"replica{index}"
+    sync_engine = create_engine(url, **_engine_kwargs(url))
+    if settings.DB_ASYNC:
+        replica_async = create_async_engine(async_url, **_engine_kwargs(async_url, is_async=True))
+        factory = async_sessionmaker(replica_async, autoflush=False, expire_on_commit=False)
+    else:
+        replica_async = None
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+    if settings.METRICS_ENABLED:
+        instrument_engine(sync_engine, name)
+        if replica_async is not None:
+            instrument_engine(replica_async.sync_engine, f"{name}-async")
+    return Replica(name, sync_engine, factory, replica_async)
+
+
+# 只读副本（DATABASE_REPLICA_URLS）：公开 GET 接口经 get_read_session 读取；写入、脚本与后台任务始终用主库
+replicas = ReplicaSet(
+    [
+        _replica(i, url, async_url)
+        for i, (url, async_url) in enumerate(zip(settings.replica_urls, settings.async_replica_urls, strict=True), 1)
+    ],
+    primary_engine=engine,
+    interval=settings.DB_REPLICA_CHECK_SECONDS,
+    eject_seconds=settings.DB_REPLICA_EJECT_SECONDS,
+)
+READ_PRIMARY_COOKIE = "zblog_read_primary"
+
 
 def get_db():
     db = SessionLocal()
@@ -17,3 +82,175 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+class DBSession:
+    """路由使用的会话包装：异步模式直接 await AsyncSession，同步模式把 Session 调用放进线程池。
+
+    查询方法都返回已取完的结果（列表 / 单值），不把游标带回事件循环。
+    会话连接只读副本时，查询因连接问题失败会摘除该副本并改在主库重试。
+    """
+
+    def __init__(
+        self, session: Session | AsyncSession, replica: Replica | None = None, slot: asyncio.Semaphore | None = None
+    ):
+        self.session = session
+        self.is_async = isinstance(session, AsyncSession)
+        self.replica = replica
+        self.slot = slot  # 同步模式下占用的会话名额（见 _sync_session_slots），由 session_scope 归还
+
+    async def _call(self, fn, *args):
+        if self.is_async:
+            return await fn(*args)
+        return await run_in_threadpool(fn, *args)
+
+    async def _query(self, method: str, stmt, fetch: Callable | None):
+        session = self.session
+        if self.is_async:
+            result = await getattr(session, method)(stmt)
+            return fetch(result) if fetch else result
+
+        def run():
+            result = getattr(session, method)(stmt)
+            return fetch(result) if fetch else result
+
+        return await run_in_threadpool(run)
+
+    async def _read(self, method: str, stmt, fetch: Callable | None = None):
+        try:
+            return await self._query(method, stmt, fetch)
+        except DBAPIError as exc:
+            # 只把连接层面的错误算作副本故障；SQL 本身的错误在主库上也会失败，不应摘除副本
+            if self.replica is None or not (exc.connection_invalidated or isinstance(exc, (OperationalError, InterfaceError))):
+                raise
+            replicas.eject(self.replica, f"{type(exc).__name__}: {exc}"[:200])
+        failed, self.replica = self.session, None
+        try:
+            await (failed.close() if self.is_async else run_in_threadpool(failed.close))
+        except Exception:
+            pass
+        if self.slot is not None:
+            # 改用主库会话：归还副本的名额，按主库的名额排队，主库会话数仍不超过其连接池容量
+            self.slot.release()
+            self.slot = None
+            slot = _sync_session_slots("primary")
+            await slot.acquire()
+            self.slot = slot
+        self.session = (AsyncSessionLocal or SessionLocal)()
+        return await self._query(method, stmt, fetch)
+
+    async def all(self, stmt) -> list:
+        """返回所有行（Row）。"""
+        return await self._read("execute", stmt, lambda result: result.all())
+
+    async def scalars(self, stmt) -> list:
+        """返回每行第一列组成的列表，ORM 查询即实体列表。"""
+        return await self._read("scalars", stmt, lambda result: result.all())
+
+    async def first(self, stmt) -> Any:
+        """返回第一行（Row），没有则为 None。"""
+        return await self._read("execute", stmt, lambda result: result.first())
+
+    async def scalar(self, stmt) -> Any:
+        """返回第一行第一列，ORM 查询即单个实体，没有则为 None。"""
+        return await self._read("scalar", stmt)
+
+    async def execute(self, stmt) -> None:
+        """执行不需要取结果的语句（如 UPDATE）。"""
+        await self._call(self.session.execute, stmt)
+
+    def add(self, obj) -> None:
+        self.session.add(obj)
+
+    async def commit(self) -> None:
+        await self._call(self.session.commit)
+
+    async def rollback(self) -> None:
+        await self._call(self.session.rollback)
+
+    async def refresh(self, obj) -> None:
+        await self._call(self.session.refresh, obj)
+
+    async def close(self) -> None:
+        await self._call(self.session.close)
+
+
+_sync_slots: tuple[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] | None = None
+
+
+def _sync_session_slots(pool: str) -> asyncio.Semaphore:
+    """同步模式下同时持有某个连接池会话的请求数不超过其容量。
+
+    每次查询都要占用一个线程池线程；如果线程全部阻塞在等待连接上，
+    已拿到连接的请求就再也拿不到线程去完成查询并归还连接。
+    因此在事件循环里排队，而不是在线程里等连接池。主库与各副本的连接池分别计数。
+    """
+    global _sync_slots
+    loop = asyncio.get_running_loop()
+    if _sync_slots is None or _sync_slots[0] is not loop:
+        _sync_slots = (loop, {})
+    slots = _sync_slots[1]
+    if pool not in slots:
+        slots[pool] = asyncio.Semaphore(settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    return slots[pool]
+
+
+@asynccontextmanager
+async def session_scope(read_only: bool = False) -> AsyncIterator[DBSession]:
+    """read_only=True 时优先从只读副本读取（没有可用副本时用主库）。"""
+    replica = replicas.pick() if read_only else None
+    if AsyncSessionLocal is not None:
+        db = DBSession(replica.sessionmaker() if replica else AsyncSessionLocal(), replica)
+        try:
+            yield db
+        finally:
+            await db.close()
+        return
+    slot = _sync_session_slots(replica.name if replica else "primary")
+    await slot.acquire()
+    db = DBSession(replica.sessionmaker() if replica else SessionLocal(), replica, slot)
+    try:
+        yield db
+    finally:
+        try:
+            await db.close()
+        finally:
+            # 读副本失败后 db 可能已换成主库的名额
+            if db.slot is not None:
+                db.slot.release()
+
+
+@asynccontextmanager
+async def primary_session(db: DBSession) -> AsyncIterator[DBSession]:
+    """在只读路由中写入：db 连接的是主库时直接使用，否则另开一个主库会话。"""
+    if db.replica is None:
+        yield db
+        return
+    async with session_scope() as primary:
+        yield primary
+
+
+async def get_session() -> AsyncIterator[DBSession]:
+    async with session_scope() as db:
+        yield db
+
+
+async def get_read_session(request: Request) -> AsyncIterator[DBSession]:
+    """公开 GET 接口使用：优先读副本；客户端刚写入过（带有 READ_PRIMARY_COOKIE）时读主库。"""
+    async with session_scope(read_only=READ_PRIMARY_COOKIE not in request.cookies) as db:
+        yield db
+
+
+def read_your_writes(response: Response) -> None:
+    """写入成功后标记客户端：DB_READ_YOUR_WRITES_SECONDS 内它的读请求走主库，不会因复制延迟读不到刚写的数据。
+
+    用 cookie 而不是进程内记录，多 worker 部署时同样有效。
+    """
+    if replicas and settings.DB_READ_YOUR_WRITES_SECONDS > 0:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            "1",
+            max_age=math.ceil(settings.DB_READ_YOUR_WRITES_SECONDS),
+            httponly=True,
+            samesite="lax",
+        )
@@ -0,0 +1,22 @@
+"""稀疏字段集：列表接口的 fields= 参数。
+
+客户端按需选择返回字段（逗号分隔），路由据此只查询需要的列；
+content 等大字段默认不返回，也就不从数据库读取。
+"""
+from typing import Iterable
+from fastapi import HTTPException
+
+
+def parse_fields(raw: str | None, allowed: Iterable[str], default: Iterable[str]) -> tuple[str, ...]:
+    """解析 fields 参数，按 allowed 中的顺序返回；为空时返回 default，含未知字段时返回 400。"""
+    allowed = tuple(allowed)
+    if not raw or not raw.strip():
+        return tuple(default)
+    requested = {f.strip() for f in raw.split(",") if f.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"未知字段: {', '.join(sorted(unknown))}；可选: {', '.join(allowed)}",
+        )
+    return tuple(f for f in allowed if f in requested)
@@ -0,0 +1,260 @@
+"""Prometheus 文本格式的运行指标：按路由的请求数、状态码与耗时直方图，每个请求的 SQL 条数与数据库耗时，连接池状态。
+
+不依赖 prometheus_client：指标在进程内累加，/metrics 按文本格式输出。
+多 worker 部署时每个进程各自计数，由 Prometheus 分别抓取或在上游聚合。
+"""
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, Iterable
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Gauge:
+    """抓取时由回调计算当前值：返回 {标签值元组: 数值}。"""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...], collect: Callable[[], dict]):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.collect = collect
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        for labels, value in self.collect().items():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._values: dict[tuple, list] = {}  # labels -> [各桶计数（非累计）..., sum]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(labels)
+            if data is None:
+                data = self._values[labels] = [0] * len(self.buckets) + [0.0]
+            data[i] += 1
+            data[-1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = [(labels, list(data)) for labels, data in self._values.items()]
+        for labels, data in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, data):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(data[-1])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Metrics:
+    def __init__(self):
+        route = ("method", "route")
+        self.requests = Counter("http_requests_total", "HTTP requests by route and status.", route + ("status",))
+        self.in_progress = 0
+        self.latency = Histogram(
+            "http_request_duration_seconds", "HTTP request latency.", route, LATENCY_BUCKETS
+        )
+        self.request_statements = Histogram(
+            "http_request_sql_statements", "SQL statements executed per HTTP request.", route, STATEMENT_BUCKETS
+        )
+        self.request_db_time = Histogram(
+            "http_request_db_seconds", "Time spent in SQL statements per HTTP request.", route, LATENCY_BUCKETS
+        )
+        self.statements = Counter("db_statements_total", "SQL statements executed (including background tasks).", ("engine",))
+        self.statement_time = Counter("db_statement_seconds_total", "Time spent in SQL statements.", ("engine",))
+        self.checkout_wait = Histogram(
+            "db_pool_checkout_wait_seconds", "Time waiting for a pooled connection.", ("engine",), WAIT_BUCKETS
+        )
+        self.engines: dict[str, object] = {}
+        self._in_progress_lock = threading.Lock()
+        self._collectors = [
+            self.requests,
+            Gauge("http_requests_in_progress", "HTTP requests currently being served.", (), lambda: {(): self.in_progress}),
+            self.latency,
+            self.request_statements,
+            self.request_db_time,
+            self.statements,
+            self.statement_time,
+            self.checkout_wait,
+            Gauge("db_pool_connections_in_use", "Connections checked out of the pool.", ("engine",), lambda: self._pool("checkedout")),
+            Gauge("db_pool_size", "Configured pool size.", ("engine",), lambda: self._pool("size")),
+            Gauge("db_pool_overflow", "Connections opened beyond the pool size.", ("engine",), lambda: self._pool("overflow")),
+        ]
+
+    def _pool(self, attr: str) -> dict:
+        values = {}
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            if isinstance(pool, QueuePool):
+                values[(name,)] = max(0, getattr(pool, attr)())
+        return values
+
+    def track_in_progress(self, delta: int) -> None:
+        with self._in_progress_lock:
+            self.in_progress += delta
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, db: "RequestDB") -> None:
+        labels = (method, route)
+        self.requests.inc(labels + (str(status),))
+        self.latency.observe(labels, seconds)
+        self.request_statements.observe(labels, db.statements)
+        self.request_db_time.observe(labels, db.seconds)
+
+    def render(self) -> str:
+        lines = []
+        for collector in self._collectors:
+            lines.extend(collector.render())
+        return "\n".join(lines) + "\n"
+
+
+class RequestDB:
+    """当前请求累计的 SQL 条数与耗时；同步路由在线程池中执行时共享同一对象（contextvars 会被复制）。"""
+
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+_request_db: ContextVar[RequestDB | None] = ContextVar("request_db", default=None)
+
+
+def instrument_engine(engine, name: str) -> None:
+    """通过引擎事件统计 SQL 条数与耗时，并在 /metrics 中输出该引擎的连接池状态。"""
+    metrics.engines[name] = engine
+    labels = (name,)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = perf_counter() - conn.info["metrics_started"].pop()
+        metrics.statements.inc(labels)
+        metrics.statement_time.inc(labels, elapsed)
+        current = _request_db.get()
+        if current is not None:
+            current.statements += 1
+            current.seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("metrics_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+class _CheckoutTimer:
+    """连接池取连接的等待时间（池满时会阻塞在这里）。"""
+
+    metrics_engine = "sync"
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.checkout_wait.observe((self.metrics_engine,), perf_counter() - started)
+
+
+class TimedQueuePool(_CheckoutTimer, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    metrics_engine = "async"
+
+
+class MetricsMiddleware:
+    """纯 ASGI 中间件：按路由模板（而非实际路径）统计，避免标签基数随 URL 增长。"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = perf_counter()
+        status = 500
+        db = RequestDB()
+        token = _request_db.set(db)
+        metrics.track_in_progress(1)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_db.reset(token)
+            metrics.track_in_progress(-1)
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"], getattr(route, "path", "<unmatched>"), status, perf_counter() - started, db
+            )
+
+
+metrics = Metrics()
@@ -0,0 +1,57 @@
+"""列表分页工具：基于 (published_at, id) 的游标分页与带过期时间的总数缓存。"""
+import base64
+import json
+from datetime import datetime
+from threading import Lock
+from time import monotonic
+from typing import Awaitable, Callable
+from fastapi import HTTPException
+
+
+def encode_cursor(published_at: datetime | None, post_id: int, direction: str) -> str:
+    """把排序键编码为不透明的游标字符串。direction 为 next 或 prev。"""
+    raw = json.dumps(
+        [published_at.isoformat() if published_at else None, post_id, direction],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime | None, int, str]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        published_at, post_id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("next", "prev") or not isinstance(post_id, int):
+            raise ValueError(direction)
+        return (datetime.fromisoformat(published_at) if published_at else None), post_id, direction
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+
+
+class CountCache:
+    """按 key 缓存 COUNT 结果，过期后重新计算，避免每次列表请求都做一次 COUNT。"""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: dict[object, tuple[float, int]] = {}
+        self._lock = Lock()
+
+    async def get(self, key: object, compute: Callable[[], Awaitable[int]]) -> int:
+        now = monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+        value = await compute()
+        with self._lock:
+            if len(self._data) >= self.max_entries:
+                self._data = {k: v for k, v in self._data.items() if v[0] > now}
+                if len(self._data) >= self.max_entries:
+                    self._data.clear()
+            self._data[key] = (now + self.ttl, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,122 @@
+"""只读副本：公开 GET 接口的查询按轮询分配到健康的副本，没有可用副本时回到主库。
+
+副本在以下情况被暂时摘除：
+- 请求中查询副本时连接出错（该次查询改在主库重试），至少摘除 eject_seconds；
+- 后台检查连不上副本，或副本的 content_versions 落后于主库（复制延迟，读到的会是旧内容）。
+"""
+import logging
+import threading
+from itertools import count
+from time import monotonic
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    def __init__(self, name: str, engine, sessionmaker: Callable, async_engine=None):
+        self.name = name
+        self.engine = engine  # 同步引擎，用于健康检查
+        self.async_engine = async_engine
+        self.sessionmaker = sessionmaker  # 路由使用的会话工厂（异步模式下为异步会话）
+        self.ejected_until = 0.0
+        self.lagging = False
+        self.reason = ""
+        self.ejections = 0
+
+    def available(self, now: float) -> bool:
+        return not self.lagging and now >= self.ejected_until
+
+
+class ReplicaSet:
+    """副本轮询与健康检查；interval <= 0 时不启动后台检查，被摘除的副本到期后直接恢复。"""
+
+    def __init__(self, replicas: list[Replica], primary_engine, interval: float, eject_seconds: float):
+        self.replicas = replicas
+        self.primary_engine = primary_engine
+        self.interval = interval
+        self.eject_seconds = eject_seconds
+        self._next = count()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Replica | None:
+        """轮询下一个可用副本，全部不可用时返回 None（走主库）。"""
+        if not self.replicas:
+            return None
+        now = monotonic()
+        start = next(self._next)
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            if replica.available(now):
+                return replica
+        return None
+
+    def eject(self, replica: Replica, reason: str) -> None:
+        with self._lock:
+            was_available = replica.available(monotonic())
+            replica.ejected_until = monotonic() + self.eject_seconds
+            replica.reason = reason
+            replica.ejections += 1
+        if was_available:
+            logger.warning("replica %s ejected: %s", replica.name, reason)
+
+    @staticmethod
+    def _versions(conn) -> dict[str, int]:
+        from sqlalchemy import select
+        from app.models import ContentVersion
+
+        return {r.scope: int(r.version or 0) for r in conn.execute(select(ContentVersion.scope, ContentVersion.version))}
+
+    def run_once(self) -> None:
+        """探测每个副本：连不上则摘除；任一内容范围的版本号低于主库则视为延迟，追上后恢复。"""
+        try:
+            with self.primary_engine.connect() as conn:
+                primary = self._versions(conn)
+        except Exception:
+            logger.exception("read primary content versions failed")
+            primary = None
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    versions = self._versions(conn)
+            except Exception as exc:
+                self.eject(replica, f"{type(exc).__name__}: {exc}"[:200])
+                continue
+            behind = sorted(s for s, v in (primary or {}).items() if versions.get(s, 0) < v)
+            if behind and not replica.lagging:
+                logger.warning("replica %s is behind primary on %s", replica.name, ", ".join(behind))
+            elif not behind and replica.lagging:
+                logger.info("replica %s caught up", replica.name)
+            with self._lock:
+                replica.lagging = bool(behind)
+                if behind:
+                    replica.reason = "behind primary: " + ", ".join(behind)
+                elif replica.ejected_until <= monotonic():
+                    replica.reason = ""
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.run_once()
+
+    def start(self) -> None:
+        if not self.replicas or self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-check", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> dict:
+        now = monotonic()
+        # 不输出 reason：错误信息可能包含内网地址，只写日志
+        return {r.name: {"available": r.available(now), "lagging": r.lagging, "ejections": r.ejections} for r in self.replicas}
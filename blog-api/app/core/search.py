@@ -0,0 +1,550 @@
+"""站内搜索：进程内倒排索引，BM25 排序，命中片段高亮。
+
+- 分词：连续的中日韩汉字切成二元组（单字成词），拉丁字母/数字按词切分并转小写。
+- 倒排表：每个词一条 array('Q')，元素为 (文档号 << 16) | 词频，文档号按加入顺序递增；
+  只出现在一篇文章里的词（占词表多数）直接存 int，省去数组对象的开销。
+  删除/修改只给旧文档号打墓碑，墓碑超过一定比例时压缩重建，增量更新无需前向索引。
+- 持久化：启动时加载磁盘快照，再按 post_changes 日志补齐快照之后的变更；
+  日志保留期之外的快照或格式不符时从数据库全量重建。
+"""
+import heapq
+import html
+import json
+import logging
+import math
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timedelta
+from time import monotonic, perf_counter
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 拉丁字母（含扩展）与数字按词切分；汉字、假名、谚文连续段切成二元组
+_TOKEN_RE = re.compile(
+    r"([0-9a-z\u00c0-\u024f]+)"
+    r"|([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+)"
+)
+MAX_WORD_LEN = 40
+TITLE_WEIGHT = 3  # 标题中的词按正文词频的 3 倍计
+EXPAND_POSTINGS_BUDGET = 50_000  # 单字查询扩展出的倒排总长度上限
+TF_BITS = 16
+TF_MASK = (1 << TF_BITS) - 1
+
+
+def tokenize(text: str) -> list[str]:
+    tokens: list[str] = []
+    for word, cjk in _TOKEN_RE.findall(text.lower()):
+        if word:
+            if len(word) <= MAX_WORD_LEN:
+                tokens.append(word)
+        elif len(cjk) == 1:
+            tokens.append(cjk)
+        else:
+            tokens.extend(map(str.__add__, cjk, cjk[1:]))
+    return tokens
+
+
+def _entries(postings: int | array):
+    """倒排表：只出现在一篇文章里的词存为单个 int，其余为 array('Q')；元素为 (文档号 << 16) | 词频。"""
+    return (postings,) if type(postings) is int else postings
+
+
+def _df(postings: int | array) -> int:
+    return 1 if type(postings) is int else len(postings)
+
+
+def _lookup(postings: array, docs) -> list[int]:
+    """在按文档号有序的倒排表中二分查找给定文档。"""
+    found = []
+    size = len(postings)
+    for doc in docs:
+        i = bisect_left(postings, doc << TF_BITS)
+        if i < size and postings[i] >> TF_BITS == doc:
+            found.append(postings[i])
+    return found
+
+
+class SearchIndex:
+    """倒排索引本体；读写都在锁内进行，查询只持锁计算分数，不访问数据库。"""
+
+    MAGIC = b"ZBSIDX2\n"
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings: dict[str, int | array] = {}
+        self._doc_post = array("I")  # 文档号 -> post_id
+        self._doc_len = array("I")  # 文档号 -> 词数
+        self._live: dict[int, int] = {}  # post_id -> 文档号
+        self._deleted: set[int] = set()
+        self._total_len = 0
+        self._expand_cache: dict[str, list[str]] = {}
+        self.watermark = 0  # 已应用的 post_changes.id
+        self.saved_at: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    @property
+    def term_count(self) -> int:
+        return len(self._postings)
+
+    def add(self, post_id: int, title: str, content: str) -> None:
+        """加入或替换一篇文章。"""
+        counts = Counter(tokenize(content or ""))
+        for term in tokenize(title or ""):
+            counts[term] += TITLE_WEIGHT
+        with self._lock:
+            self._remove(post_id)
+            doc = len(self._doc_post)
+            base = doc << TF_BITS
+            postings = self._postings
+            new_terms = False
+            for term, tf in counts.items():
+                entry = base | (tf if tf < TF_MASK else TF_MASK)
+                current = postings.get(term)
+                if current is None:
+                    postings[term] = entry
+                    new_terms = True
+                elif type(current) is int:
+                    postings[term] = array("Q", (current, entry))
+                else:
+                    current.append(entry)
+            if new_terms and self._expand_cache:
+                self._expand_cache = {}
+            length = sum(counts.values())
+            self._doc_post.append(post_id)
+            self._doc_len.append(length)
+            self._live[post_id] = doc
+            self._total_len += length
+
+    def remove(self, post_id: int) -> None:
+        with self._lock:
+            self._remove(post_id)
+
+    def _remove(self, post_id: int) -> None:
+        doc = self._live.pop(post_id, None)
+        if doc is None:
+            return
+        self._deleted.add(doc)
+        self._total_len -= self._doc_len[doc]
+        if len(self._deleted) > max(1000, len(self._doc_post) // 5):
+            self.compact()
+
+    def compact(self) -> None:
+        """去掉墓碑文档，重新编号（保持顺序，倒排表仍有序）。"""
+        with self._lock:
+            if not self._deleted:
+                return
+            remap = array("q", [-1]) * len(self._doc_post)
+            doc_post, doc_len = array("I"), array("I")
+            for doc, post_id in enumerate(self._doc_post):
+                if doc not in self._deleted:
+                    remap[doc] = len(doc_post)
+                    doc_post.append(post_id)
+                    doc_len.append(self._doc_len[doc])
+            postings: dict[str, int | array] = {}
+            for term, current in self._postings.items():
+                kept = [
+                    (remap[e >> TF_BITS] << TF_BITS) | (e & TF_MASK)
+                    for e in _entries(current)
+                    if remap[e >> TF_BITS] >= 0
+                ]
+                if len(kept) == 1:
+                    postings[term] = kept[0]
+                elif kept:
+                    postings[term] = array("Q", kept)
+            self._postings = postings
+            self._doc_post, self._doc_len = doc_post, doc_len
+            self._live = {post_id: doc for doc, post_id in enumerate(doc_post)}
+            self._deleted = set()
+            self._expand_cache = {}
+
+    def _expand(self, term: str) -> list[str]:
+        """单个汉字查询匹配包含该字的词（二元组与单字），结果缓存到出现新词为止。
+
+        常用字可能出现在上万个二元组里；按 df 从高到低取，倒排总长度超过
+        EXPAND_POSTINGS_BUDGET 后不再追加，单字查询的命中数因此只是近似值。
+        """
+        if len(term) != 1 or term.isascii():
+            return [term] if term in self._postings else []
+        expanded = self._expand_cache.get(term)
+        if expanded is None:
+            candidates = sorted(
+                ((_df(p), t) for t, p in self._postings.items() if term in t), reverse=True
+            )
+            expanded, budget = [], EXPAND_POSTINGS_BUDGET
+            for df, t in candidates:
+                if expanded and df > budget:
+                    break
+                expanded.append(t)
+                budget -= df
+            self._expand_cache[term] = expanded
+        return expanded
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> tuple[int, list[tuple[int, float]]]:
+        """AND 语义：返回 (命中总数, [(post_id, score)])，按分数倒序。
+
+        idf 的 N 与 df 都包含尚未压缩的墓碑文档，与多数引擎一样只是近似值。
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return 0, []
+        with self._lock:
+            if not self._live:
+                return 0, []
+            n = len(self._doc_post)
+            k1, b = self.k1, self.b
+            avgdl = self._total_len / len(self._live)
+            doc_len, deleted = self._doc_len, self._deleted
+            groups = []
+            for term in terms:
+                postings = [self._postings[t] for t in self._expand(term)]
+                if not postings:
+                    return 0, []
+                groups.append(postings)
+            # 先处理最稀有的词，候选集只会越来越小
+            groups.sort(key=lambda ps: sum(map(_df, ps)))
+            scores: dict[int, float] | None = None
+            for postings in groups:
+                group_scores: dict[int, float] = {}
+                for current in postings:
+                    df = _df(current)
+                    idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                    if scores is not None and len(scores) * 16 < df:
+                        # 候选集远小于倒排表时逐个二分查找，而不是扫描整条倒排表
+                        entries = _lookup(current, scores)
+                    else:
+                        entries = _entries(current)
+                    for entry in entries:
+                        doc = entry >> TF_BITS
+                        if scores is not None and doc not in scores or doc in deleted:
+                            continue
+                        tf = entry & TF_MASK
+                        s = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_len[doc] / avgdl))
+                        if s > group_scores.get(doc, -1.0):
+                            group_scores[doc] = s
+                if scores is not None:
+                    group_scores = {doc: scores[doc] + s for doc, s in group_scores.items()}
+                scores = group_scores
+                if not scores:
+                    return 0, []
+            top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+            return len(scores), [(self._doc_post[doc], score) for doc, score in top[offset:]]
+
+    # ---- 磁盘快照 ----
+    # 格式：MAGIC + zlib(头部长度 uint32 + JSON 头部 + doc_post + doc_len + 按词顺序拼接的倒排表)
+
+    def save(self, path: str) -> int:
+        """原子写入快照，返回文件字节数。"""
+        with self._lock:
+            self.compact()
+            terms = list(self._postings)
+            flat = array("Q")
+            for term in terms:
+                current = self._postings[term]
+                if type(current) is int:
+                    flat.append(current)
+                else:
+                    flat.extend(current)
+            header = {
+                "version": 2,
+                "byteorder": sys.byteorder,
+                "watermark": self.watermark,
+                "saved_at": datetime.utcnow().isoformat(),
+                "docs": len(self._doc_post),
+                "terms": terms,
+                "df": [_df(self._postings[t]) for t in terms],
+            }
+            body = self._doc_post.tobytes() + self._doc_len.tobytes() + flat.tobytes()
+        head = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        payload = zlib.compress(struct.pack("<I", len(head)) + head + body, 1)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # 每次写入用独立的临时文件，多个 worker 同时保存时不会互相覆盖写了一半的文件
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.MAGIC)
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return len(self.MAGIC) + len(payload)
+
+    @classmethod
+    def load(cls, path: str) -> "SearchIndex":
+        with open(path, "rb") as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError("not a search index snapshot")
+            data = zlib.decompress(f.read())
+        (head_len,) = struct.unpack_from("<I", data)
+        header = json.loads(data[4 : 4 + head_len].decode("utf-8"))
+        if header.get("version") != 2:
+            raise ValueError("unsupported search index version")
+        body = memoryview(data)[4 + head_len :]
+        docs = header["docs"]
+        index = cls()
+        arrays = (array("I"), array("I"), array("Q"))
+        arrays[0].frombytes(body[: docs * 4])
+        arrays[1].frombytes(body[docs * 4 : docs * 8])
+        arrays[2].frombytes(body[docs * 8 :])
+        if header["byteorder"] != sys.byteorder:
+            for arr in arrays:
+                arr.byteswap()
+        index._doc_post, index._doc_len, flat = arrays
+        postings = index._postings
+        pos = 0
+        for term, df in zip(header["terms"], header["df"]):
+            postings[term] = flat[pos] if df == 1 else flat[pos : pos + df]
+            pos += df
+        index._live = {post_id: doc for doc, post_id in enumerate(index._doc_post)}
+        index._total_len = sum(index._doc_len)
+        index.watermark = header["watermark"]
+        index.saved_at = datetime.fromisoformat(header["saved_at"])
+        return index
+
+
+# ---- 命中片段 ----
+
+_MARKDOWN_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)|[#>*_`~|]+|\s+")
+
+
+def plain_text(markdown: str) -> str:
+    """粗略去掉 Markdown 标记，仅用于生成摘要片段。"""
+    return _MARKDOWN_RE.sub(lambda m: m.group(1) if m.group(1) is not None else " ", markdown or "").strip()
+
+
+def _match_spans(text: str, terms: list[str]) -> list[tuple[int, int]]:
+    lower = text.lower()
+    spans = []
+    for term in terms:
+        start = lower.find(term)
+        while start >= 0:
+            spans.append((start, start + len(term)))
+            start = lower.find(term, start + 1)
+    spans.sort()
+    merged: list[tuple[int, int]] = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def highlight(text: str, terms: list[str], width: int | None = None) -> str:
+    """HTML 转义后用 <mark> 标出命中词；给定 width 时截取首个命中附近的片段。"""
+    spans = _match_spans(text, terms)
+    prefix = suffix = ""
+    if width is not None and len(text) > width:
+        start = max(0, (spans[0][0] if spans else 0) - width // 4)
+        end = min(len(text), start + width)
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        spans = [(max(s, start), min(e, end)) for s, e in spans if e > start and s < end]
+        text, offset = text[start:end], start
+        spans = [(s - offset, e - offset) for s, e in spans]
+    parts, pos = [prefix], 0
+    for start, end in spans:
+        parts.append(html.escape(text[pos:start]))
+        parts.append(f"<mark>{html.escape(text[start:end])}</mark>")
+        pos = end
+    parts.append(html.escape(text[pos:]))
+    parts.append(suffix)
+    return "".join(parts)
+
+
+def query_terms(query: str) -> list[str]:
+    """高亮用的词：汉字连续段保持原样（比逐个二元组标记更连贯），其余同分词。"""
+    terms = []
+    for word, cjk in _TOKEN_RE.findall(query.lower()):
+        terms.append(word or cjk)
+    return list(dict.fromkeys(t for t in terms if t))
+
+
+# ---- 与数据库同步 ----
+
+
+class SearchIndexManager:
+    """持有当前索引：启动时加载快照或全量构建，posts 版本号变化时按变更日志增量更新。"""
+
+    CHANGE_OVERLAP = 50  # 每次多回读的日志条数：并发事务可能晚于更大的 id 提交
+
+    def __init__(self, path: str, retention_days: int, build_batch: int = 1000):
+        self.path = path
+        self.retention = timedelta(days=retention_days)
+        self.build_batch = build_batch
+        self.index = SearchIndex()
+        self.ready = threading.Event()
+        self._sync_lock = threading.Lock()
+        self._synced_version: int | None = None
+        self._applied: set[int] = set()  # 回读窗口内已应用过的日志 id
+        self._pruned_at = float("-inf")
+        self._dirty = False
+        self._thread: threading.Thread | None = None
+        self.last_build_seconds: float | None = None
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready.is_set(),
+            "docs": len(self.index),
+            "terms": self.index.term_count,
+            "watermark": self.index.watermark,
+            "build_seconds": self.last_build_seconds,
+        }
+
+    def start(self) -> None:
+        """后台线程加载/构建索引，不阻塞应用启动。"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._bootstrap, name="search-index-build", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """应用关闭时保存快照（有增量更新才写）。"""
+        if self.ready.is_set() and self._dirty and self.path:
+            self.save()
+
+    def _bootstrap(self) -> None:
+        try:
+            if not self._load_snapshot():
+                self.rebuild()
+            self.apply_changes()
+        except Exception:
+            logger.exception("build search index failed")
+        finally:
+            self.ready.set()
+
+    def _load_snapshot(self) -> bool:
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            index = SearchIndex.load(self.path)
+        except Exception:
+            logger.exception("load search index snapshot failed, rebuilding")
+            return False
+        if index.saved_at is None or datetime.utcnow() - index.saved_at > self.retention:
+            # 快照早于变更日志保留期，中间的变更可能已被清理
+            return False
+        self.index = index
+        return True
+
+    def save(self) -> None:
+        try:
+            self.index.save(self.path)
+            self._dirty = False
+        except OSError:
+            logger.exception("save search index snapshot failed")
+
+    def rebuild(self) -> None:
+        """从数据库全量构建新索引，完成后整体替换。"""
+        from sqlalchemy import func, select
+        from app.core.database import engine
+        from app.models import Post, PostChange
+
+        started = perf_counter()
+        index = SearchIndex()
+        with engine.connect() as conn:
+            # 先记下日志位置：构建期间的变更随后会被重放
+            index.watermark = conn.execute(select(func.coalesce(func.max(PostChange.id), 0))).scalar()
+            last_id = 0
+            while True:
+                rows = conn.execute(
+                    select(Post.id, Post.title, Post.content)
+                    .where(Post.status == "published", Post.id > last_id)
+                    .order_by(Post.id)
+                    .limit(self.build_batch)
+                ).all()
+                if not rows:
+                    break
+                for row in rows:
+                    index.add(row.id, row.title, row.content)
+                last_id = rows[-1].id
+        self.index = index
+        self.last_build_seconds = round(perf_counter() - started, 3)
+        logger.info("search index built: %d posts in %.2fs", len(index), self.last_build_seconds)
+        if self.path:
+            self.save()
+
+    def apply_changes(self) -> int:
+        """重放 watermark 之后的文章变更，返回处理的文章数。"""
+        from sqlalchemy import delete, select
+        from app.core.database import engine
+        from app.models import Post, PostChange
+
+        with self._sync_lock:
+            index = self.index
+            with engine.connect() as conn:
+                changes = conn.execute(
+                    select(PostChange.id, PostChange.post_id)
+                    .where(PostChange.id > max(0, index.watermark - self.CHANGE_OVERLAP))
+                    .order_by(PostChange.id)
+                ).all()
+                changes = [c for c in changes if c.id not in self._applied]
+                if not changes:
+                    return 0
+                post_ids = sorted({c.post_id for c in changes})
+                rows = {
+                    r.id: r
+                    for r in conn.execute(
+                        select(Post.id, Post.title, Post.content).where(
+                            Post.id.in_(post_ids), Post.status == "published"
+                        )
+                    )
+                }
+            for post_id in post_ids:
+                row = rows.get(post_id)
+                if row is not None:
+                    index.add(row.id, row.title, row.content)
+                else:
+                    index.remove(post_id)
+            index.watermark = max(index.watermark, changes[-1].id)
+            floor = index.watermark - self.CHANGE_OVERLAP
+            self._applied = {i for i in self._applied if i > floor} | {c.id for c in changes if c.id > floor}
+            self._dirty = True
+        if monotonic() - self._pruned_at > 86400:
+            # 每天最多一次清理保留期之前的变更日志
+            self._pruned_at = monotonic()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        delete(PostChange).where(PostChange.created_at < datetime.utcnow() - self.retention)
+                    )
+            except Exception:
+                logger.exception("prune post_changes failed")
+        return len(post_ids)
+
+    async def sync_if_stale(self) -> None:
+        """posts 版本号变化后把变更应用到索引（在线程池中执行，不阻塞事件循环）。"""
+        from starlette.concurrency import run_in_threadpool
+        from app.core.cache import content_versions
+
+        if not self.ready.is_set():
+            return
+        await content_versions.refresh_if_stale()
+        version = content_versions.get("posts")
+        if version == self._synced_version or self._sync_lock.locked():
+            return
+        try:
+            await run_in_threadpool(self.apply_changes)
+            self._synced_version = version
+        except Exception:
+            logger.exception("apply post changes to search index failed")
+
+
+search_index = SearchIndexManager(
+    path=settings.SEARCH_INDEX_PATH,
+    retention_days=settings.SEARCH_CHANGE_RETENTION_DAYS,
+)
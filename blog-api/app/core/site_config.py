@@ -0,0 +1,50 @@
+"""站点配置快照：启动时加载 site_config，之后只在 site 内容版本号变化时重新读取。"""
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+from sqlalchemy import select
+from app.core.cache import content_versions
+from app.core.database import session_scope
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SiteSnapshot:
+    version: int  # 加载时 content_versions 中 site 的版本号
+    values: Mapping[str, str | None]
+
+    def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+
+class SiteConfigStore:
+    """进程内只读快照。版本号随 content_versions 定期检查（见 CACHE_VERSION_CHECK_SECONDS），
+    管理后台修改站点配置时会递增版本号，稳态下读取不查库。"""
+
+    def __init__(self):
+        self._snapshot: SiteSnapshot | None = None
+
+    async def get(self) -> SiteSnapshot:
+        await content_versions.refresh_if_stale()
+        version = content_versions.get("site")
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != version:
+            snapshot = await self.load(version)
+        return snapshot
+
+    async def load(self, version: int | None = None) -> SiteSnapshot:
+        from app.models import SiteConfig
+
+        if version is None:
+            await content_versions.refresh()
+            version = content_versions.get("site")
+        async with session_scope() as db:
+            rows = await db.all(select(SiteConfig.key, SiteConfig.value))
+        snapshot = SiteSnapshot(version=version, values=MappingProxyType({r.key: r.value for r in rows}))
+        self._snapshot = snapshot
+        return snapshot
+
+
+site_config = SiteConfigStore()
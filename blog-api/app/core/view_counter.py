@@ -0,0 +1,128 @@
+"""文章浏览量缓冲：读路径只在内存中累加，由后台线程批量写回数据库。"""
+import logging
+import threading
+from sqlalchemy import bindparam, func
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """按 post_id 分片的浏览量累加器。
+
+    incr() 只加锁更新对应分片的字典；flush() 把所有分片交换出来，
+    合并成每篇文章一条 ``UPDATE posts SET view_count = view_count + n``，
+    在同一事务中以 executemany 写回，并累加 site_stats 的 total_views。
+    """
+
+    def __init__(self, shards: int = 16, flush_interval: float = 5.0, flush_threshold: int = 1000):
+        self._shards: list[dict[int, int]] = [{} for _ in range(max(1, shards))]
+        self._locks = [threading.Lock() for _ in self._shards]
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _shard(self, post_id: int) -> int:
+        return post_id % len(self._shards)
+
+    def _add(self, post_id: int, n: int) -> tuple[int, int]:
+        i = self._shard(post_id)
+        with self._locks[i]:
+            shard = self._shards[i]
+            count = shard.get(post_id, 0) + n
+            shard[post_id] = count
+        with self._pending_lock:
+            self._pending += n
+            pending = self._pending
+        return count, pending
+
+    def incr(self, post_id: int, n: int = 1) -> int:
+        """累加一次浏览，返回该文章尚未写回的浏览量。"""
+        count, pending = self._add(post_id, n)
+        if pending >= self.flush_threshold:
+            self._wakeup.set()
+        return count
+
+    def pending_for(self, post_id: int) -> int:
+        i = self._shard(post_id)
+        with self._locks[i]:
+            return self._shards[i].get(post_id, 0)
+
+    @property
+    def pending_size(self) -> int:
+        """缓冲中尚未写回的浏览次数总和。"""
+        return self._pending
+
+    def _drain(self) -> dict[int, int]:
+        merged: dict[int, int] = {}
+        for i, lock in enumerate(self._locks):
+            with lock:
+                shard = self._shards[i]
+                self._shards[i] = {}
+            merged.update(shard)
+        with self._pending_lock:
+            self._pending -= sum(merged.values())
+        return merged
+
+    def flush(self) -> int:
+        """把缓冲写回数据库，返回写回的浏览次数。写库失败时计数放回缓冲。"""
+        from app.core.counters import stat_increment
+        from app.core.database import engine
+        from app.models import Post
+
+        with self._flush_lock:
+            batch = self._drain()
+            if not batch:
+                return 0
+            posts = Post.__table__
+            stmt = (
+                posts.update()
+                .where(posts.c.id == bindparam("pid"))
+                # 显式保留 updated_at：浏览量不算内容修改，否则会触发 onupdate，影响 ETag 与静态导出的指纹
+                .values(view_count=func.coalesce(posts.c.view_count, 0) + bindparam("n"), updated_at=posts.c.updated_at)
+            )
+            try:
+                with engine.begin() as conn:
+                    conn.execute(stmt, [{"pid": pid, "n": n} for pid, n in sorted(batch.items())])
+                    # 站点总浏览量与文章浏览量在同一事务里更新
+                    conn.execute(stat_increment(total_views=sum(batch.values())))
+            except Exception:
+                logger.exception("flush view counts failed, re-queueing %d posts", len(batch))
+                for pid, n in batch.items():
+                    self._add(pid, n)
+                return 0
+            return sum(batch.values())
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="view-counter-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止后台线程并做最后一次写回（应用关闭时调用）。"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+
+view_counter = ViewCounter(
+    shards=settings.VIEW_COUNT_SHARDS,
+    flush_interval=settings.VIEW_COUNT_FLUSH_INTERVAL_SECONDS,
+    flush_threshold=settings.VIEW_COUNT_FLUSH_THRESHOLD,
+)
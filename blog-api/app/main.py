@@ -1,8 +1,21 @@
-from fastapi import FastAPI
+import logging
+import secrets
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.core.cache import response_cache
+from app.core.comment_tree import comment_trees
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.routers import posts, tags, comments, pages, site
+from app.core.counters import counter_reconciler
+from app.core.database import engine, async_engine, replicas, Base
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.rate_limit import api_rate_limiter, client_ip, rate_limit_sweeper
+from app.core.search import search_index
+from app.core.site_config import site_config
+from app.core.view_counter import view_counter
+from app.routers import posts, tags, comments, pages, site, search
+
+logger = logging.getLogger(__name__)
 
 # 建表由 Alembic 迁移完成，此处仅用于开发时可选 create_all
 # Base.metadata.create_all(bind=engine)
@@ -17,13 +30,83 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def global_rate_limit(request: Request, call_next):
+    """可选的全局按 IP 限流（RATE_LIMIT_GLOBAL_PER_MINUTE > 0 时启用），/health 不计入。"""
+    if api_rate_limiter is not None and request.url.path != "/health":
+        decision = api_rate_limiter.hit(client_ip(request))
+        if not decision.allowed:
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "请求过于频繁，请稍后再试"},
+                headers={"Retry-After": decision.retry_after_header},
+            )
+    return await call_next(request)
+
+
+if settings.METRICS_ENABLED:
+    # 最后添加，位于最外层：被限流拒绝的请求也计入
+    app.add_middleware(MetricsMiddleware)
+
+
 app.include_router(posts.router)
 app.include_router(tags.router)
 app.include_router(comments.router)
 app.include_router(pages.router)
 app.include_router(site.router)
+app.include_router(search.router)
+
+
+@app.on_event("startup")
+async def startup():
+    view_counter.start()
+    counter_reconciler.start()
+    rate_limit_sweeper.start()
+    replicas.start()
+    if settings.SEARCH_ENABLED:
+        search_index.start()
+    try:
+        await site_config.load()
+    except Exception:
+        # 数据库暂不可用时不阻止启动，首次请求时再加载
+        logger.exception("load site config snapshot failed")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    counter_reconciler.stop()
+    rate_limit_sweeper.stop()
+    search_index.stop()
+    view_counter.stop()
+    replicas.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica in replicas.replicas:
+        replica.engine.dispose()
+        if replica.async_engine is not None:
+            await replica.async_engine.dispose()
 
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "pending_views": view_counter.pending_size,
+        "cache": response_cache.stats(),
+        "comment_trees": comment_trees.stats(),
+        "search": search_index.stats(),
+        "rate_limits": rate_limit_sweeper.stats(),
+        "replicas": replicas.stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint(request: Request):
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+        request.headers.get("authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
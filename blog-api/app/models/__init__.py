@@ -4,5 +4,9 @@ from app.models.tag import Tag
 from app.models.comment import Comment
 from app.models.page import Page
 from app.models.site_config import SiteConfig
+from app.models.content_version import ContentVersion
+from app.models.site_stat import SiteStat
+from app.models.post_change import PostChange
+from app.models.rendered_content import RenderedContent
 
-__all__ = ["User", "Post", "post_tags", "Tag", "Comment", "Page", "SiteConfig"]
+__all__ = ["User", "Post", "post_tags", "Tag", "Comment", "Page", "SiteConfig", "ContentVersion", "SiteStat", "PostChange", "RenderedContent"]
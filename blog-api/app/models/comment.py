@@ -1,10 +1,12 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from app.core.database import Base
 
 
 class Comment(Base):
     __tablename__ = "comments"
+    # 评论树：按文章取已通过的评论，按 (parent_id, created_at) 顺序读出
+    __table_args__ = (Index("ix_comments_post_status_parent_created", "post_id", "status", "parent_id", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=True, index=True)
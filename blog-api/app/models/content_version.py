@@ -0,0 +1,13 @@
+from datetime import datetime
+from sqlalchemy import Column, String, BigInteger, DateTime
+from app.core.database import Base
+
+
+class ContentVersion(Base):
+    """内容版本号：管理后台写入 posts/tags/pages/site/comments 时递增，blog-api 据此失效缓存。"""
+
+    __tablename__ = "content_versions"
+
+    scope = Column(String(32), primary_key=True)  # posts | tags | pages | site | comments
+    version = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
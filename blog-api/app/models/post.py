@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -13,6 +13,8 @@ post_tags = Table(
 
 class Post(Base):
     __tablename__ = "posts"
+    # 列表按 (published_at, id) 倒序分页（含游标分页）
+    __table_args__ = (Index("ix_posts_status_published_at_id", "status", "published_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -23,10 +25,10 @@ class Post(Base):
     status = Column(String(20), default="draft", nullable=False)  # draft | published
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     view_count = Column(Integer, default=0)
+    # 已通过的评论数，由管理后台审核/删除评论时维护，scripts/reconcile_counters.py 可全量重算
+    comment_count = Column(Integer, default=0, nullable=False, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     published_at = Column(DateTime)
 
     tags = relationship("Tag", secondary=post_tags, backref="posts")
-
-
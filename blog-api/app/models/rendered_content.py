@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, Text, DateTime
+from sqlalchemy.dialects import mysql
+from app.core.database import Base
+
+
+class RenderedContent(Base):
+    """Markdown 渲染缓存：按正文哈希保存渲染结果，正文不变就不再渲染。"""
+
+    __tablename__ = "rendered_contents"
+
+    content_hash = Column(String(64), primary_key=True)  # sha256(渲染器版本 + 正文)
+    html = Column(Text().with_variant(mysql.MEDIUMTEXT(), "mysql"), nullable=False)
+    toc = Column(Text, nullable=False)  # JSON：[{"level", "id", "name", "children"}]
+    word_count = Column(Integer, nullable=False, default=0)
+    reading_minutes = Column(Integer, nullable=False, default=0)
+    excerpt = Column(String(500))
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
 from pydantic import BaseModel, field_validator
 import re
-from app.core.database import get_db
-from app.core.security import sanitize_comment_text, sanitize_author_name, check_comment_rate_limit
+from app.core.cache import cached_json, content_versions
+from app.core.comment_tree import build_tree, comment_trees
+from app.core.config import settings
+from app.core.counters import stat_increment
+from app.core.database import DBSession, get_read_session, get_session, read_your_writes
+from app.core.rate_limit import client_ip, comment_rate_limiter
+from app.core.security import sanitize_comment_text, sanitize_author_name
 from app.models import Post, Comment, Page
-from app.schemas.comment import CommentCreate, CommentList, CommentListResponse
+from app.schemas.comment import CommentCountsResponse, CommentCreate, CommentList, CommentListResponse, CommentTreeResponse
 
 router = APIRouter(prefix="/api/comments", tags=["comments"])
 
@@ -48,21 +53,23 @@ class CommentCreateIn(BaseModel):
 
 
 @router.get("", response_model=CommentListResponse)
-def list_comments(
+async def list_comments(
     post_id: int | None = Query(None, ge=1),
     page_slug: str | None = Query(None),
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_read_session),
 ):
     if post_id is not None:
-        q = db.query(Comment).filter(Comment.post_id == post_id, Comment.status == "approved")
+        cond = (Comment.post_id == post_id, Comment.status == "approved")
     elif page_slug:
-        q = db.query(Comment).filter(Comment.page_slug == page_slug, Comment.status == "approved")
+        cond = (Comment.page_slug == page_slug, Comment.status == "approved")
     else:
         raise HTTPException(status_code=400, detail="请提供 post_id 或 page_slug")
-    total = q.count()
-    items = q.order_by(Comment.created_at.asc()).offset((page - 1) * size).limit(size).all()
+    total = await db.scalar(select(func.count(Comment.id)).where(*cond))
+    items = await db.scalars(
+        select(Comment).where(*cond).order_by(Comment.created_at.asc()).offset((page - 1) * size).limit(size)
+    )
     return CommentListResponse(
         items=[
             CommentList(
@@ -82,27 +89,103 @@ def list_comments(
     )
 
 
+MAX_COUNT_IDS = 100
+
+
+@router.get("/counts", response_model=CommentCountsResponse)
+async def comment_counts(
+    request: Request,
+    post_ids: str = Query(..., description=f"逗号分隔的文章 id，最多 {MAX_COUNT_IDS} 个"),
+    db: DBSession = Depends(get_read_session),
+):
+    """批量获取多篇文章已通过的评论数，一条 GROUP BY 查询。"""
+    try:
+        ids = sorted({int(x) for x in post_ids.split(",") if x.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="post_ids 须为逗号分隔的整数")
+    if not ids or len(ids) > MAX_COUNT_IDS:
+        raise HTTPException(status_code=400, detail=f"post_ids 需包含 1~{MAX_COUNT_IDS} 个 id")
+
+    async def build():
+        rows = await db.all(
+            select(Comment.post_id, func.count())
+            .where(Comment.post_id.in_(ids), Comment.status == "approved")
+            .group_by(Comment.post_id)
+        )
+        counts = dict.fromkeys(ids, 0)
+        counts.update({post_id: n for post_id, n in rows})
+        return {"counts": counts}
+
+    return await cached_json(request, ("comments",), build)
+
+
+@router.get("/tree", response_model=CommentTreeResponse)
+async def comment_tree(
+    request: Request,
+    post_id: int | None = Query(None, ge=1),
+    page_slug: str | None = Query(None),
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=50, description="每页顶层讨论串数"),
+    db: DBSession = Depends(get_read_session),
+):
+    """已通过的评论按讨论串嵌套返回，按顶层评论分页。"""
+    if post_id is not None:
+        key, cond = ("post", post_id), Comment.post_id == post_id
+    elif page_slug:
+        key, cond = ("page", page_slug), Comment.page_slug == page_slug
+    else:
+        raise HTTPException(status_code=400, detail="请提供 post_id 或 page_slug")
+
+    async def load():
+        # 顺序与 (post_id, status, parent_id, created_at) 索引一致，无需额外排序
+        rows = await db.all(
+            select(Comment.id, Comment.parent_id, Comment.author_name, Comment.content, Comment.created_at)
+            .where(cond, Comment.status == "approved")
+            .order_by(Comment.parent_id, Comment.created_at, Comment.id)
+        )
+        return build_tree(rows, settings.COMMENT_TREE_MAX_DEPTH)
+
+    async def build():
+        tree = await comment_trees.get(key, content_versions.get("comments"), load)
+        return {
+            "items": tree.threads[(page - 1) * size : page * size],
+            "total": len(tree.threads),
+            "comment_count": tree.count,
+            "page": page,
+            "size": size,
+            "max_depth": max(2, settings.COMMENT_TREE_MAX_DEPTH),
+        }
+
+    return await cached_json(request, ("comments",), build)
+
+
 @router.post("", response_model=CommentList, status_code=201)
-def create_comment(
+async def create_comment(
     body: CommentCreateIn,
     request: Request,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: DBSession = Depends(get_session),
 ):
-    if not check_comment_rate_limit(request.client.host if request.client else "0.0.0.0"):
-        raise HTTPException(status_code=429, detail="评论提交过于频繁，请稍后再试")
+    decision = comment_rate_limiter.hit(client_ip(request))
+    if not decision.allowed:
+        raise HTTPException(
+            status_code=429,
+            detail="评论提交过于频繁，请稍后再试",
+            headers={"Retry-After": decision.retry_after_header},
+        )
     has_post = body.post_id is not None
     has_page = bool(body.page_slug and body.page_slug.strip())
     if has_post == has_page:
         raise HTTPException(status_code=400, detail="请提供 post_id 或 page_slug 之一，不能同时或都不提供")
     if body.post_id is not None:
-        post = db.query(Post).filter(Post.id == body.post_id, Post.status == "published").first()
+        post = await db.scalar(select(Post.id).where(Post.id == body.post_id, Post.status == "published"))
         if not post:
             raise HTTPException(status_code=400, detail="文章不存在或未发布")
         page_slug_val = None
         post_id_val = body.post_id
     else:
         slug = body.page_slug.strip()[:64]
-        page = db.query(Page).filter(Page.slug == slug).first()
+        page = await db.scalar(select(Page.id).where(Page.slug == slug))
         if not page:
             raise HTTPException(status_code=400, detail="页面不存在")
         page_slug_val = slug
@@ -123,8 +206,10 @@ def create_comment(
         user_agent=request.headers.get("user-agent", "")[:512],
     )
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    await db.execute(stat_increment(comment_count=1, pending_comment_count=1))
+    await db.commit()
+    await db.refresh(comment)
+    read_your_writes(response)
     return CommentList(
         id=comment.id,
         post_id=comment.post_id,
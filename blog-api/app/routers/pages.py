@@ -1,35 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from datetime import datetime
+from app.core.cache import CacheEntry, content_versions, render_json, response_cache, validator_meta
+from app.core.conditional import has_conditional, is_not_modified, latest, make_etag, not_modified_response
+from app.core.config import settings
+from app.core.database import DBSession, get_read_session
 from app.models import Page
 from app.schemas.page import PageDetail
 
 router = APIRouter(prefix="/api/pages", tags=["pages"])
 
 
-@router.get("/about", response_model=PageDetail)
-def get_about(db: Session = Depends(get_db)):
-    page = db.query(Page).filter(Page.slug == "about").first()
+def _page_validators(page_id: int, updated_at: datetime | None) -> tuple[str, datetime | None]:
+    etag = make_etag("page", page_id, updated_at, content_versions.get("pages"))
+    return etag, latest(updated_at, content_versions.last_modified("pages"))
+
+
+async def _page_response(request: Request, db: DBSession, slug: str, not_found: str):
+    await content_versions.refresh_if_stale()
+    key = response_cache.key(request, "pages") if settings.CACHE_ENABLED else None
+    entry = response_cache.get(key) if key else None
+    if entry is not None:
+        return entry.to_response(request)
+    if has_conditional(request):
+        # 条件请求先只查 id/updated_at，验证器匹配时直接 304，不加载正文
+        row = await db.first(select(Page.id, Page.updated_at).where(Page.slug == slug))
+        if row:
+            etag, last_modified = _page_validators(row.id, row.updated_at)
+            if is_not_modified(request, etag, last_modified):
+                return not_modified_response(etag, last_modified)
+    page = await db.scalar(select(Page).where(Page.slug == slug))
     if not page:
-        raise HTTPException(status_code=404, detail="About page not found")
-    return PageDetail(
+        raise HTTPException(status_code=404, detail=not_found)
+    detail = PageDetail(
         id=page.id,
         slug=page.slug,
         title=page.title,
         content=page.content,
         updated_at=page.updated_at,
     )
+    meta = validator_meta(*_page_validators(page.id, page.updated_at))
+    body = render_json(detail)
+    entry = response_cache.set(key, body, meta) if key else CacheEntry(body, 0, meta)
+    return entry.to_response()
+
+
+@router.get("/about", response_model=PageDetail)
+async def get_about(request: Request, db: DBSession = Depends(get_read_session)):
+    return await _page_response(request, db, "about", "About page not found")
 
 
 @router.get("/{slug}", response_model=PageDetail)
-def get_page(slug: str, db: Session = Depends(get_db)):
-    page = db.query(Page).filter(Page.slug == slug).first()
-    if not page:
-        raise HTTPException(status_code=404, detail="Page not found")
-    return PageDetail(
-        id=page.id,
-        slug=page.slug,
-        title=page.title,
-        content=page.content,
-        updated_at=page.updated_at,
-    )
+async def get_page(slug: str, request: Request, db: DBSession = Depends(get_read_session)):
+    return await _page_response(request, db, slug, "Page not found")
@@ -1,33 +1,131 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy import func, and_, or_, select
+from app.core.cache import CacheEntry, cached_json, content_versions, render_json, response_cache, validator_meta
+from app.core.conditional import has_conditional, is_not_modified, latest, make_etag, not_modified_response
+from app.core.config import settings
+from app.core.database import DBSession, get_read_session
+from app.core.fields import parse_fields
+from app.core.markdown_render import get_rendered
+from app.core.pagination import CountCache, encode_cursor, decode_cursor
+from app.core.view_counter import view_counter
 from app.models import Post, Tag
 from app.models.post import post_tags  # noqa: F401 - used in relationship
-from app.schemas.post import PostList, PostDetail, PostListResponse, TagBrief
+from app.schemas.post import PostList, PostDetail, PostDetailRendered, PostListResponse, TagBrief
 from datetime import datetime
 
 router = APIRouter(prefix="/api/posts", tags=["posts"])
 
 
+# 列表总数缓存：页码模式每次都要返回 total，缓存后不必每个请求都做一次 COUNT
+post_count_cache = CountCache(ttl=settings.POST_COUNT_CACHE_SECONDS)
+
+# 列表的 fields= 可选字段：默认即 PostList 的字段，content 只在显式请求时读取与返回
+DEFAULT_LIST_FIELDS = tuple(f for f in PostList.model_fields if f != "comment_count")
+LIST_FIELDS = DEFAULT_LIST_FIELDS + ("comment_count", "content")
+FIELDS_QUERY = Query(
+    None, description=f"逗号分隔的返回字段，默认不含 comment_count 与 content；可选: {','.join(LIST_FIELDS)}"
+)
+
+
+def list_scopes(fields: tuple[str, ...], *scopes: str) -> tuple[str, ...]:
+    """列表缓存依赖的内容范围：返回评论数时，评论审核也要使缓存失效。"""
+    return scopes + ("comments",) if "comment_count" in fields else scopes
+
+
 @router.get("", response_model=PostListResponse)
-def list_posts(
+async def list_posts(
+    request: Request,
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=50),
     tag: str | None = Query(None),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, description="上一次响应中的 next/prev 游标；提供时忽略 page"),
+    with_total: bool = Query(False, description="游标模式下是否返回 total"),
+    fields: str | None = FIELDS_QUERY,
+    db: DBSession = Depends(get_read_session),
 ):
-    q = db.query(Post).filter(Post.status == "published")
-    if tag:
-        q = q.join(post_tags).join(Tag).filter(Tag.slug == tag)
-    total = q.count()
-    items = q.order_by(Post.published_at.desc()).offset((page - 1) * size).limit(size).all()
-    return PostListResponse(
-        items=[_post_to_list(p) for p in items],
+    selected = parse_fields(fields, LIST_FIELDS, DEFAULT_LIST_FIELDS)
+
+    async def build():
+        q = select(Post).where(Post.status == "published")
+        if tag:
+            q = q.join(post_tags).join(Tag).where(Tag.slug == tag)
+        return await paginate_posts(db, q, ("posts", tag), page, size, cursor, with_total, selected)
+
+    return await cached_json(request, list_scopes(selected, "posts"), build)
+
+
+async def paginate_posts(
+    db: DBSession,
+    q,
+    count_key: object,
+    page: int,
+    size: int,
+    cursor: str | None,
+    with_total: bool,
+    fields: tuple[str, ...] = DEFAULT_LIST_FIELDS,
+) -> dict:
+    """按 (published_at, id) 倒序分页。
+
+    不带 cursor 时沿用 page/size（OFFSET）；带 cursor 时按排序键定位（keyset），
+    深翻页不再随页码变慢。两种模式的响应都带 next/prev 游标，
+    只有页码模式或显式 with_total 时才返回（缓存的）total。
+    只查询 fields 用到的列（游标所需的 id、published_at 总会查询），返回 PostListResponse 结构的 dict。
+    """
+    order_desc = (Post.published_at.desc(), Post.id.desc())
+    columns = [getattr(Post, f) for f in fields if f not in ("id", "published_at", "tags")]
+    rows_q = q.options(load_only(Post.id, Post.published_at, *columns))
+    if "tags" in fields:
+        # 整页文章的标签用一条 IN 查询加载，避免逐篇懒加载（N+1）
+        rows_q = rows_q.options(selectinload(Post.tags))
+    if cursor:
+        published_at, post_id, direction = decode_cursor(cursor)
+        if direction == "next":
+            rows = await db.scalars(
+                rows_q.where(
+                    or_(Post.published_at < published_at, and_(Post.published_at == published_at, Post.id < post_id))
+                )
+                .order_by(*order_desc)
+                .limit(size + 1)
+            )
+            has_next, has_prev = len(rows) > size, True
+            rows = rows[:size]
+        else:
+            rows = await db.scalars(
+                rows_q.where(
+                    or_(Post.published_at > published_at, and_(Post.published_at == published_at, Post.id > post_id))
+                )
+                .order_by(Post.published_at.asc(), Post.id.asc())
+                .limit(size + 1)
+            )
+            has_next, has_prev = True, len(rows) > size
+            rows = list(reversed(rows[:size]))
+    else:
+        rows = await db.scalars(rows_q.order_by(*order_desc).offset((page - 1) * size).limit(size + 1))
+        has_next, has_prev = len(rows) > size, page > 1
+        rows = rows[:size]
+    total = None
+    if not cursor or with_total:
+        count_q = select(func.count()).select_from(q.with_only_columns(Post.id).subquery())
+        # 带上 posts 版本号：管理后台增删、发布文章后总数立即重新计算，不必等 TTL 过期
+        total = await post_count_cache.get((count_key, content_versions.get("posts")), lambda: db.scalar(count_q))
+    meta = PostListResponse(
+        items=[],
         total=total,
         page=page,
         size=size,
+        next=encode_cursor(rows[-1].published_at, rows[-1].id, "next") if rows and has_next else None,
+        prev=encode_cursor(rows[0].published_at, rows[0].id, "prev") if rows and has_prev else None,
     )
+    return {"items": [_post_fields(p, fields) for p in rows], **meta.model_dump(exclude={"items"})}
+
+
+def _post_fields(p: Post, fields: tuple[str, ...]) -> dict:
+    """列表项只包含请求的字段；未加载的列不会被访问。"""
+    return {
+        f: [TagBrief(id=t.id, name=t.name, slug=t.slug) for t in p.tags] if f == "tags" else getattr(p, f)
+        for f in fields
+    }
 
 
 def _post_to_list(p: Post) -> PostList:
@@ -45,14 +143,63 @@ def _post_to_list(p: Post) -> PostList:
     )
 
 
-@router.get("/{slug}", response_model=PostDetail)
-def get_post(slug: str, db: Session = Depends(get_db)):
-    post = db.query(Post).filter(Post.slug == slug, Post.status == "published").first()
+def _post_validators(post_id: int, updated_at: datetime | None, html: bool = False) -> tuple[str, datetime | None]:
+    """文章详情的 ETag / Last-Modified 只依赖 id、updated_at 与 posts 版本号，无需读取正文。
+
+    html=true 是另一种表示，ETag 也要区分。
+    """
+    etag = make_etag("post", post_id, updated_at, content_versions.get("posts"), "html" if html else "")
+    return etag, latest(updated_at, content_versions.last_modified("posts"))
+
+
+@router.get("/{slug}", response_model=PostDetailRendered | PostDetail)
+async def get_post(
+    slug: str,
+    request: Request,
+    html: bool = Query(False, description="同时返回服务端渲染的 HTML、目录、字数与阅读时长"),
+    db: DBSession = Depends(get_read_session),
+):
+    await content_versions.refresh_if_stale()
+    key = response_cache.key(request, "posts") if settings.CACHE_ENABLED else None
+    entry = response_cache.get(key) if key else None
+    if entry is not None:
+        view_counter.incr(entry.meta["post_id"])
+        return entry.to_response(request)
+    if has_conditional(request):
+        # 条件请求先只查 id/updated_at，验证器匹配时直接 304，不加载正文
+        row = await db.first(
+            select(Post.id, Post.updated_at).where(Post.slug == slug, Post.status == "published")
+        )
+        if row:
+            etag, last_modified = _post_validators(row.id, row.updated_at, html)
+            if is_not_modified(request, etag, last_modified):
+                view_counter.incr(row.id)
+                return not_modified_response(etag, last_modified)
+    post = await db.scalar(
+        select(Post).options(selectinload(Post.tags)).where(Post.slug == slug, Post.status == "published")
+    )
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    post.view_count = (post.view_count or 0) + 1
-    db.commit()
-    return PostDetail(
+    # 浏览量先记入内存缓冲，由后台线程批量写回；返回值包含尚未写回的部分
+    pending = view_counter.incr(post.id)
+    detail = PostDetail(
         **_post_to_list(post).model_dump(),
         content=post.content,
     )
+    detail.view_count = (post.view_count or 0) + pending
+    # 在写回渲染缓存（会提交并使 post 过期）之前取验证器，避免重新加载文章
+    meta = validator_meta(*_post_validators(post.id, post.updated_at, html), post_id=post.id)
+    if html:
+        # 渲染结果按正文哈希缓存在 rendered_contents，通常在管理后台保存时已生成
+        rendered = await get_rendered(db, detail.content)
+        detail = PostDetailRendered(
+            **detail.model_dump(),
+            content_html=rendered.html,
+            toc=rendered.toc,
+            word_count=rendered.word_count,
+            reading_minutes=rendered.reading_minutes,
+            auto_excerpt=rendered.excerpt,
+        )
+    body = render_json(detail)
+    entry = response_cache.set(key, body, meta) if key else CacheEntry(body, 0, meta)
+    return entry.to_response()
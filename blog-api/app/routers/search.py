@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import DBSession, get_read_session
+from app.core.search import highlight, plain_text, query_terms, search_index
+from app.models import Post
+from app.schemas.search import SearchHit, SearchResponse
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+SNIPPET_WIDTH = 120
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    page: int = Query(1, ge=1, le=50),
+    size: int = Query(10, ge=1, le=50),
+    db: DBSession = Depends(get_read_session),
+):
+    if not settings.SEARCH_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not search_index.ready.is_set():
+        raise HTTPException(status_code=503, detail="搜索索引正在构建，请稍后再试")
+    await search_index.sync_if_stale()
+    total, hits = await run_in_threadpool(search_index.index.search, q, size, (page - 1) * size)
+    if not hits:
+        return SearchResponse(items=[], total=total, page=page, size=size)
+    # 只为当前页的文章取正文生成片段，一条 IN 查询
+    rows = {
+        r.id: r
+        for r in await db.all(
+            select(Post.id, Post.title, Post.slug, Post.excerpt, Post.published_at, Post.content).where(
+                Post.id.in_([post_id for post_id, _ in hits]), Post.status == "published"
+            )
+        )
+    }
+    terms = query_terms(q)
+    items = []
+    for post_id, score in hits:
+        row = rows.get(post_id)
+        if row is None:
+            continue  # 索引尚未同步到的下线/删除
+        items.append(
+            SearchHit(
+                id=row.id,
+                title=row.title,
+                slug=row.slug,
+                excerpt=row.excerpt,
+                published_at=row.published_at,
+                score=round(score, 4),
+                title_html=highlight(row.title, terms),
+                snippet_html=highlight(plain_text(row.content), terms, SNIPPET_WIDTH),
+            )
+        )
+    return SearchResponse(items=items, total=total, page=page, size=size)
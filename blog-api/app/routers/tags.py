@@ -1,45 +1,49 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import select
+from app.core.cache import cached_json
+from app.core.database import DBSession, get_read_session
+from app.core.fields import parse_fields
 from app.models import Post, Tag
 from app.models.post import post_tags
 from app.schemas.tag import TagList
 from app.schemas.post import PostListResponse, PostList, TagBrief
+from app.routers.posts import DEFAULT_LIST_FIELDS, FIELDS_QUERY, LIST_FIELDS, list_scopes, paginate_posts
 
 router = APIRouter(prefix="/api/tags", tags=["tags"])
 
 
 @router.get("", response_model=list[TagList])
-def list_tags(db: Session = Depends(get_db)):
-    rows = (
-        db.query(Tag.id, Tag.name, Tag.slug, func.count(Post.id).label("post_count"))
-        .outerjoin(post_tags, Tag.id == post_tags.c.tag_id)
-        .outerjoin(Post, and_(Post.id == post_tags.c.post_id, Post.status == "published"))
-        .group_by(Tag.id, Tag.name, Tag.slug)
-        .all()
-    )
-    return [TagList(id=r.id, name=r.name, slug=r.slug, post_count=r.post_count or 0) for r in rows]
+async def list_tags(request: Request, db: DBSession = Depends(get_read_session)):
+    async def build():
+        # 计数由管理后台写文章时维护，这里只需扫一遍 tags 表
+        rows = await db.all(
+            select(Tag.id, Tag.name, Tag.slug, Tag.published_post_count).order_by(Tag.id)
+        )
+        return [
+            TagList(id=r.id, name=r.name, slug=r.slug, post_count=r.published_post_count or 0) for r in rows
+        ]
+
+    return await cached_json(request, ("tags",), build)
 
 
 @router.get("/{slug}/posts", response_model=PostListResponse)
-def list_posts_by_tag(
+async def list_posts_by_tag(
     slug: str,
+    request: Request,
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, description="上一次响应中的 next/prev 游标；提供时忽略 page"),
+    with_total: bool = Query(False, description="游标模式下是否返回 total"),
+    fields: str | None = FIELDS_QUERY,
+    db: DBSession = Depends(get_read_session),
 ):
-    from app.routers.posts import _post_to_list
-
-    tag = db.query(Tag).filter(Tag.slug == slug).first()
-    if not tag:
-        return PostListResponse(items=[], total=0, page=page, size=size)
-    q = db.query(Post).join(post_tags).filter(post_tags.c.tag_id == tag.id, Post.status == "published")
-    total = q.count()
-    items = q.order_by(Post.published_at.desc()).offset((page - 1) * size).limit(size).all()
-    return PostListResponse(
-        items=[_post_to_list(p) for p in items],
-        total=total,
-        page=page,
-        size=size,
-    )
+    selected = parse_fields(fields, LIST_FIELDS, DEFAULT_LIST_FIELDS)
+
+    async def build():
+        tag = await db.scalar(select(Tag).where(Tag.slug == slug))
+        if not tag:
+            return PostListResponse(items=[], total=0, page=page, size=size)
+        q = select(Post).join(post_tags).where(post_tags.c.tag_id == tag.id, Post.status == "published")
+        return await paginate_posts(db, q, ("tag", tag.id), page, size, cursor, with_total, selected)
+
+    return await cached_json(request, list_scopes(selected, "posts", "tags"), build)
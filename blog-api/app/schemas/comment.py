@@ -1,6 +1,6 @@
 from datetime import datetime
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 
 class CommentCreate(BaseModel):
@@ -38,3 +38,25 @@ class CommentListResponse(BaseModel):
     total: int
     page: int
     size: int
+
+
+class CommentTreeNode(BaseModel):
+    id: int
+    parent_id: Optional[int] = None
+    author_name: str
+    content: str
+    created_at: datetime
+    replies: List["CommentTreeNode"] = []
+
+
+class CommentTreeResponse(BaseModel):
+    items: List[CommentTreeNode]  # 当前页的顶层讨论串
+    total: int  # 顶层讨论串数
+    comment_count: int  # 树中的评论总数
+    page: int
+    size: int
+    max_depth: int
+
+
+class CommentCountsResponse(BaseModel):
+    counts: Dict[int, int]  # 文章 id -> 已通过的评论数（请求的每个 id 都有，没有评论为 0）
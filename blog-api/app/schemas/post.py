@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 
 
@@ -23,6 +23,7 @@ class PostList(BaseModel):
     created_at: datetime
     published_at: Optional[datetime] = None
     tags: List[TagBrief] = []
+    comment_count: Optional[int] = None  # 已通过的评论数，仅在 fields 中显式请求时返回
 
     class Config:
         from_attributes = True
@@ -30,10 +31,24 @@ class PostList(BaseModel):
 
 class PostDetail(PostList):
     content: str
+    # 详情缓存不随评论审核失效，不返回评论数
+    comment_count: Optional[int] = Field(default=None, exclude=True)
+
+
+class PostDetailRendered(PostDetail):
+    """html=true 时返回：服务端渲染并净化后的正文及其派生信息。"""
+
+    content_html: str
+    toc: List[dict] = []  # [{"level", "id", "name", "children"}]
+    word_count: int = 0
+    reading_minutes: int = 0
+    auto_excerpt: str = ""  # 正文首段摘要，excerpt 为空时可用
 
 
 class PostListResponse(BaseModel):
     items: List[PostList]
-    total: int
+    total: Optional[int] = None  # 游标模式下默认不返回
     page: int
     size: int
+    next: Optional[str] = None  # 下一页游标
+    prev: Optional[str] = None  # 上一页游标
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class SearchHit(BaseModel):
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    published_at: Optional[datetime] = None
+    score: float
+    title_html: str  # 已转义，命中词用 <mark> 包裹
+    snippet_html: str  # 正文中首个命中附近的片段，格式同上
+
+
+class SearchResponse(BaseModel):
+    items: list[SearchHit]
+    total: int
+    page: int
+    size: int
@@ -0,0 +1,176 @@
+"""对比同步 / 异步数据库模式在高并发下的吞吐量。
+
+分别以 DB_ASYNC=false 与 DB_ASYNC=true 启动 uvicorn，关闭响应缓存，
+用固定并发持续请求公开接口，输出每秒请求数与延迟分位数。
+
+Usage（在 blog-api 目录下）:
+    pip install -r requirements-dev.txt
+    python -m benchmarks.async_vs_sync --posts 2000 --concurrency 200 --duration 15
+默认使用临时 SQLite 文件；也可用 --database-url 指向 MySQL（需已迁移）。
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATHS = ["/api/posts?page={page}", "/api/posts/post-{n}", "/api/tags", "/api/site", "/api/pages/about"]
+
+
+def seed(database_url: str, posts: int) -> None:
+    """建表并写入测试数据（已有文章时跳过）。"""
+    os.environ["DATABASE_URL"] = database_url
+    sys.path.insert(0, ROOT)
+    from sqlalchemy import insert, select, func
+    from app.core.database import Base, engine
+    from app.models import Page, Post, SiteConfig, Tag, User, post_tags
+
+    if database_url.startswith("sqlite"):
+        # WAL 模式持久保存在数据库文件中：浏览量写回时不阻塞并发读
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        if conn.execute(select(func.count()).select_from(Post)).scalar():
+            return
+        conn.execute(insert(User), [{"id": 1, "username": "bench", "password_hash": "x"}])
+        conn.execute(insert(Tag), [{"id": i, "name": f"tag{i}", "slug": f"tag-{i}"} for i in range(1, 21)])
+        start = datetime(2020, 1, 1)
+        body = "## 标题\n\n" + "正文内容 lorem ipsum dolor sit amet. " * 200
+        conn.execute(
+            insert(Post),
+            [
+                {
+                    "id": n,
+                    "title": f"Post {n}",
+                    "slug": f"post-{n}",
+                    "content": body,
+                    "excerpt": "excerpt",
+                    "status": "published",
+                    "author_id": 1,
+                    "view_count": 0,
+                    "published_at": start + timedelta(hours=n),
+                }
+                for n in range(1, posts + 1)
+            ],
+        )
+        conn.execute(
+            insert(post_tags),
+            [{"post_id": n, "tag_id": t} for n in range(1, posts + 1) for t in {n % 20 + 1, n * 7 % 20 + 1}],
+        )
+        conn.execute(insert(Page), [{"slug": "about", "title": "About", "content": "about"}])
+        conn.execute(insert(SiteConfig), [{"key": "title", "value": "bench"}])
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(database_url: str, async_mode: bool, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        DB_ASYNC="true" if async_mode else "false",
+        CACHE_ENABLED="false",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+async def load(base_url: str, posts: int, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        async def worker(seed_: int) -> None:
+            nonlocal errors
+            rnd = random.Random(seed_)
+            while time.perf_counter() < stop_at:
+                path = rnd.choice(PATHS).format(page=rnd.randint(1, 20), n=rnd.randint(1, posts))
+                t0 = time.perf_counter()
+                try:
+                    r = await client.get(path)
+                    if r.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - t0)
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2) if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="")
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--json", dest="json_path", default="", help="把结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    seed(database_url, args.posts)
+
+    results = {}
+    for mode, async_mode in (("sync", False), ("async", True)):
+        port = free_port()
+        proc = start_server(database_url, async_mode, port)
+        try:
+            asyncio.run(load(f"http://127.0.0.1:{port}", args.posts, min(args.concurrency, 20), 2))  # 预热
+            results[mode] = asyncio.run(
+                load(f"http://127.0.0.1:{port}", args.posts, args.concurrency, args.duration)
+            )
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+        print(f"{mode:>5}: {json.dumps(results[mode], ensure_ascii=False)}")
+
+    if results["sync"]["rps"]:
+        print(f"async / sync throughput: {results['async']['rps'] / results['sync']['rps']:.2f}x")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"concurrency": args.concurrency, "posts": args.posts, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""接口基准：在不同数据量下测量 blog-api 与管理后台各接口的延迟分位数和每个请求的 SQL 条数。
+
+每个数据量先建一个 SQLite 库并写入数据，再分别在子进程中加载两个 FastAPI 应用（两个服务的包名都是 app，
+不能在同一进程里导入），用 TestClient 逐个接口请求。关闭响应缓存与搜索索引，测的是查库路径。
+
+以下情况以非零状态码退出：
+- 任一请求（含预热）的响应不是 2xx 或 304，此时测到的延迟和 SQL 条数没有意义；
+- 某接口单个请求的 SQL 条数超过预算（ENDPOINTS 中的 budget）；
+- 指定 --baseline 时，SQL 条数多于基线，或 p50 比基线慢 --tolerance 以上（且超过 --min-delta-ms）。
+
+Usage（在 blog-api 目录下）:
+    python -m benchmarks.endpoints --sizes 1000,10000,100000 --json results.json
+    python -m benchmarks.endpoints --sizes 1000 --baseline results.json   # 与上次结果比较
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BLOG_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADMIN_ROOT = os.path.join(os.path.dirname(BLOG_ROOT), "admin", "backend")
+ROOTS = {"blog": BLOG_ROOT, "admin": ADMIN_ROOT}
+PASSWORD = "bench-password"
+
+# (名称, 方法, 路径模板, 单个请求的 SQL 条数上限, 请求体)
+# 路径中的 {slug} {post_id} {tag} {tag_id} {page} 每次请求随机取值
+ENDPOINTS = {
+    "blog": [
+        ("list posts", "GET", "/api/posts?page=1&size=10", 3, None),
+        ("list posts deep page", "GET", "/api/posts?page={page}&size=10", 3, None),
+        ("list posts by tag", "GET", "/api/posts?tag={tag}&size=10", 3, None),
+        ("list posts fields", "GET", "/api/posts?size=10&fields=id,title,slug", 2, None),
+        ("post detail", "GET", "/api/posts/{slug}", 2, None),
+        ("post detail html", "GET", "/api/posts/{slug}?html=true", 4, None),
+        ("list tags", "GET", "/api/tags", 1, None),
+        ("tag posts", "GET", "/api/tags/{tag}/posts?size=10", 4, None),
+        ("list comments", "GET", "/api/comments?post_id={post_id}", 2, None),
+        ("comment tree", "GET", "/api/comments/tree?post_id={post_id}", 1, None),
+        ("comment counts", "GET", "/api/comments/counts?post_ids={post_id},1,2,3,4,5,6,7,8,9", 1, None),
+        ("about page", "GET", "/api/pages/about", 1, None),
+        ("site info", "GET", "/api/site", 1, None),
+        (
+            "create comment",
+            "POST",
+            "/api/comments",
+            5,
+            {"author_name": "bench", "author_email": "bench@example.com", "content": "基准测试评论", "post_id": "{post_id}"},
+        ),
+    ],
+    "admin": [
+        ("login", "POST", "/api/auth/login", 1, {"username": "bench", "password": PASSWORD}),
+        ("me", "GET", "/api/auth/me", 1, None),
+        ("list posts", "GET", "/api/posts?page=1&size=20", 3, None),
+        ("list posts deep page", "GET", "/api/posts?page={page}&size=20", 3, None),
+        ("post detail", "GET", "/api/posts/{post_id}", 3, None),
+        ("list tags", "GET", "/api/tags", 2, None),
+        ("list comments pending", "GET", "/api/comments?status=pending&size=20", 3, None),
+        ("list comments of post", "GET", "/api/comments?post_id={post_id}", 3, None),
+        ("stats", "GET", "/api/stats", 3, None),
+        ("list pages", "GET", "/api/pages", 2, None),
+        ("site config", "GET", "/api/site", 2, None),
+        ("preview", "POST", "/api/posts/preview", 1, {"content": "# 标题\n\n正文 **加粗**\n\n- a\n- b"}),
+    ],
+}
+
+
+# ---------- 数据准备（子进程，blog-api 模型） ----------
+
+def seed(database_url: str, posts: int, seed_: int) -> dict:
+    """建表并用 scripts.generate_data 写入测试数据（每篇约 2 条评论），已有数据时跳过；返回取样参数用的范围。"""
+    from sqlalchemy import func, select
+    from app.core.counters import reconcile_all
+    from app.core.database import Base, engine
+    from app.models import Post
+    from scripts.generate_data import Plan, load
+
+    Base.metadata.create_all(engine)
+    tags = max(20, posts // 100)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(Post)).scalar():
+            return {"posts": posts, "tags": tags}
+    plan = Plan(posts=posts, comments=posts * 2, tags=tags, body_words=800, seed=seed_, batch=5000)
+    load(plan, workers=min(4, os.cpu_count() or 1))
+    reconcile_all()  # 填好 site_stats 与标签计数
+    return {"posts": posts, "tags": tags}
+
+
+# ---------- 测量（子进程，按服务加载应用） ----------
+
+def fill(template, values: dict):
+    if isinstance(template, dict):
+        return {k: fill(v, values) for k, v in template.items()}
+    if isinstance(template, str):
+        if template.startswith("{") and template.endswith("}") and template[1:-1] in values:
+            return values[template[1:-1]]
+        return template.format(**values)
+    return template
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))] if sorted_values else 0.0
+
+
+def ok(status_code: int) -> bool:
+    return 200 <= status_code < 300 or status_code == 304
+
+
+def measure(service: str, posts: int, tags: int, requests: int, seed_: int) -> dict:
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event, text
+    from app.core.database import engine
+    from app.main import app
+
+    headers = {}
+    if service == "admin":
+        from sqlalchemy import update
+        from app.core.auth import create_access_token, hash_password
+        from app.models import User
+
+        with engine.begin() as conn:
+            # 生成器写入的作者（id=1）作为登录账号
+            conn.execute(update(User).where(User.id == 1).values(username="bench", password_hash=hash_password(PASSWORD)))
+        headers["Authorization"] = f"Bearer {create_access_token('bench')}"
+
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    client = TestClient(app)  # 不进入 lifespan：不启动浏览量写回、搜索索引等后台线程
+    rnd = random.Random(seed_)
+    with engine.connect() as conn:
+        published = conn.execute(text("SELECT id FROM posts WHERE status = 'published' ORDER BY id")).scalars().all()
+
+    def values() -> dict:
+        n = rnd.choice(published)
+        tag = rnd.randint(1, tags)
+        return {"slug": f"post-{n}", "post_id": n, "tag": f"tag-{tag}", "tag_id": tag, "page": rnd.randint(1, max(1, posts // 20))}
+
+    results = {}
+    for name, method, path, budget, body in ENDPOINTS[service]:
+        # 登录走 bcrypt，次数少一些
+        n_requests = max(5, requests // 10) if name == "login" else requests
+        latencies, counts, errors, statuses = [], [], 0, set()
+        for _ in range(3):  # 预热
+            v = values()
+            response = client.request(method, fill(path, v), json=fill(body, v), headers=headers)
+            if not ok(response.status_code):
+                errors += 1
+                statuses.add(response.status_code)
+        for _ in range(n_requests):
+            v = values()
+            url, payload = fill(path, v), fill(body, v)
+            statements = 0
+            started = time.perf_counter()
+            response = client.request(method, url, json=payload, headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            counts.append(statements)
+            if not ok(response.status_code):
+                errors += 1
+                statuses.add(response.status_code)
+        latencies.sort()
+        results[name] = {
+            "method": method,
+            "path": path,
+            "requests": n_requests,
+            "errors": errors,
+            "error_statuses": sorted(statuses),
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "queries_max": max(counts),
+            "queries_median": statistics.median(counts),
+            "query_budget": budget,
+        }
+    return results
+
+
+def worker(args) -> None:
+    sys.path.insert(0, ROOTS[args.role if args.role != "seed" else "blog"])
+    if args.role == "seed":
+        result = seed(os.environ["DATABASE_URL"], args.posts, args.seed)
+    else:
+        result = measure(args.role, args.posts, args.tags, args.requests, args.seed)
+    print(json.dumps(result, ensure_ascii=False))
+
+
+# ---------- 调度与判定 ----------
+
+def run_role(role: str, database_url: str, **options) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        DB_ASYNC="false",
+        CACHE_ENABLED="false",
+        SEARCH_ENABLED="false",
+        # 版本号检查、限流都会额外查库或拒绝请求，基准中关闭
+        CACHE_VERSION_CHECK_SECONDS="3600",
+        COUNTER_RECONCILE_INTERVAL_SECONDS="0",
+        COMMENT_RATE_LIMIT_MAX="1000000000",
+        RATE_LIMIT_GLOBAL_PER_MINUTE="0",
+        LOGIN_RATE_LIMIT_MAX="1000000000",
+        METRICS_ENABLED="false",
+    )
+    cmd = [sys.executable, os.path.abspath(__file__), "--role", role]
+    for key, value in options.items():
+        cmd += [f"--{key}", str(value)]
+    out = subprocess.run(cmd, cwd=ROOTS["blog" if role == "seed" else role], env=env, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list[str]:
+    failures = []
+    for size, services in results["sizes"].items():
+        for service, endpoints in services.items():
+            for name, r in endpoints.items():
+                label = f"[{size} posts] {service} {name}"
+                if r["errors"]:
+                    failures.append(f"{label}: {r['errors']} responses with status {r['error_statuses']}")
+                if r["queries_max"] > r["query_budget"]:
+                    failures.append(f"{label}: {r['queries_max']} queries > budget {r['query_budget']}")
+                base = baseline.get("sizes", {}).get(size, {}).get(service, {}).get(name)
+                if not base:
+                    continue
+                if r["queries_max"] > base["queries_max"]:
+                    failures.append(f"{label}: {r['queries_max']} queries > baseline {base['queries_max']}")
+                # 用中位数判断延迟回归，尾部分位数在请求数不多时波动太大
+                if r["p50_ms"] > base["p50_ms"] * (1 + tolerance) and r["p50_ms"] - base["p50_ms"] > min_delta_ms:
+                    failures.append(f"{label}: p50 {r['p50_ms']} ms > baseline {base['p50_ms']} ms (+{tolerance:.0%})")
+    return failures
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BLOG_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="逗号分隔的文章数")
+    parser.add_argument("--requests", type=int, default=200, help="每个接口的请求次数")
+    parser.add_argument("--services", default="blog,admin")
+    parser.add_argument("--data-dir", default="", help="保存生成的 SQLite 库，下次同样数据量时复用；默认临时目录")
+    parser.add_argument("--baseline", default="", help="上次的 JSON 结果，用于回归比较")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="p50 允许比基线慢的比例")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="p50 变慢小于该毫秒数时不算回归")
+    parser.add_argument("--json", dest="json_path", default="", help="把结果写入 JSON 文件")
+    parser.add_argument("--seed", type=int, default=42)
+    # 子进程参数
+    parser.add_argument("--role", choices=["seed", "blog", "admin"], help=argparse.SUPPRESS)
+    parser.add_argument("--posts", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--tags", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.role:
+        worker(args)
+        return
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="zblog-bench-")
+    os.makedirs(data_dir, exist_ok=True)
+    results = {"commit": git_commit(), "created_at": datetime.utcnow().isoformat(timespec="seconds"), "sizes": {}}
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        database_url = f"sqlite:///{os.path.join(data_dir, f'bench-{size}.db')}"
+        started = time.perf_counter()
+        info = run_role("seed", database_url, posts=size, seed=args.seed)
+        print(f"== {size} posts (data ready in {time.perf_counter() - started:.1f}s)")
+        results["sizes"][str(size)] = {}
+        for service in args.services.split(","):
+            measured = run_role(
+                service, database_url, posts=size, tags=info["tags"], requests=args.requests, seed=args.seed
+            )
+            results["sizes"][str(size)][service] = measured
+            for name, r in measured.items():
+                notes = ""
+                if r["errors"]:
+                    notes += f"  errors {r['errors']} {r['error_statuses']}"
+                if r["queries_max"] > r["query_budget"]:
+                    notes += "  OVER BUDGET"
+                print(
+                    f"  {service:<6}{name:<26} p50 {r['p50_ms']:>8.2f}  p95 {r['p95_ms']:>8.2f}  "
+                    f"p99 {r['p99_ms']:>8.2f} ms  queries {r['queries_max']}/{r['query_budget']}{notes}"
+                )
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    failures = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    results["failures"] = failures
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    if failures:
+        print("\nFAILED:")
+        for line in failures:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nall endpoints within query budgets" + (" and baseline" if baseline else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""列表字段投影基准：不同 fields= 下从数据库读取的字节数、响应体大小与耗时。
+
+生成 N 篇正文约 --body-kb KB 的已发布文章，经 HTTP 请求 /api/posts，
+记录每个请求执行的 SQL 并在同一连接上重放，统计结果集中各单元格的字节数（即驱动读到的数据量）。
+fields 含 content 的一行等同于改动前列表查询的读取量（整行加载 Post）。
+
+Usage（在 blog-api 目录下）:
+    python -m benchmarks.list_projection --posts 2000 --body-kb 20 --size 50
+    DATABASE_URL=mysql+pymysql://... python -m benchmarks.list_projection  # 使用已有库中的数据，不写入
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCENARIOS = [
+    ("default", None),
+    ("card", "id,title,slug,published_at"),
+    ("with content", "id,title,slug,excerpt,cover_image,status,view_count,created_at,published_at,tags,content"),
+]
+
+
+def cell_bytes(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, bytes):
+        return len(value)
+    return len(str(value).encode("utf-8"))
+
+
+def seed(posts: int, body_kb: int) -> None:
+    from sqlalchemy import insert
+    from app.core.database import Base, engine
+    from app.models import Post, User
+
+    Base.metadata.create_all(engine)
+    paragraph = "这是一段用于基准测试的正文内容，包含中文与 English words. " * 8
+    body = ("## 小节\n\n" + paragraph + "\n\n") * max(1, body_kb * 1024 // (len(paragraph.encode()) + 16))
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User).values(id=1, username="bench", password_hash="x"))
+        for offset in range(0, posts, 1000):
+            conn.execute(
+                insert(Post),
+                [
+                    {
+                        "title": f"基准文章 {i}",
+                        "slug": f"bench-{i}",
+                        "content": body,
+                        "excerpt": f"第 {i} 篇文章的摘要",
+                        "status": "published",
+                        "author_id": 1,
+                        "view_count": i,
+                        "published_at": start + timedelta(minutes=i),
+                    }
+                    for i in range(offset, min(posts, offset + 1000))
+                ],
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--body-kb", type=int, default=20, help="每篇正文大小（KB）")
+    parser.add_argument("--size", type=int, default=50, help="每页条数")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", dest="json_path", default="", help="把结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    tmp = None
+    if not os.environ.get("DATABASE_URL"):
+        tmp = tempfile.TemporaryDirectory()
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    # 关闭响应缓存与搜索索引，每次请求都真实查库
+    os.environ["CACHE_ENABLED"] = "false"
+    os.environ["SEARCH_ENABLED"] = "false"
+    os.environ["DB_ASYNC"] = "false"
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app.core.database import engine
+    from app.main import app
+
+    if tmp:
+        t0 = time.perf_counter()
+        seed(args.posts, args.body_kb)
+        print(f"seeded {args.posts} posts ({args.body_kb} KB each) in {time.perf_counter() - t0:.1f}s")
+
+    statements: list[tuple[str, object]] = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cur, stmt, params, ctx, many: statements.append((stmt, params)))
+
+    def db_bytes(captured) -> int:
+        total = 0
+        raw = engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            for stmt, params in captured:
+                cursor.execute(stmt, params)
+                for row in cursor.fetchall():
+                    total += sum(cell_bytes(v) for v in row)
+        finally:
+            raw.close()
+        return total
+
+    client = TestClient(app)
+    results = []
+    for name, fields in SCENARIOS:
+        params = {"size": args.size, **({"fields": fields} if fields else {})}
+        statements.clear()
+        response = client.get("/api/posts", params=params)
+        response.raise_for_status()
+        read = db_bytes(list(statements))
+        timings = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            client.get("/api/posts", params=params)
+            timings.append((time.perf_counter() - t0) * 1000)
+        results.append(
+            {
+                "scenario": name,
+                "fields": fields or "(default)",
+                "db_bytes": read,
+                "payload_bytes": len(response.content),
+                "median_ms": round(statistics.median(timings), 2),
+            }
+        )
+
+    print(f"{'scenario':<14}{'db_bytes':>12}{'payload':>12}{'median_ms':>12}")
+    for r in results:
+        print(f"{r['scenario']:<14}{r['db_bytes']:>12}{r['payload_bytes']:>12}{r['median_ms']:>12}")
+    full = results[-1]
+    for r in results[:-1]:
+        print(
+            f"{r['scenario']}: reads {1 - r['db_bytes'] / full['db_bytes']:.1%} fewer bytes and sends "
+            f"{1 - r['payload_bytes'] / full['payload_bytes']:.1%} fewer bytes than fields with content"
+        )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    if tmp:
+        engine.dispose()
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""搜索索引基准：构建耗时、内存占用、快照大小与加载耗时、查询延迟。
+
+生成确定性的中英混合语料（词频服从 Zipf 分布），直接调用 SearchIndex，不经过数据库与 HTTP。
+
+Usage（在 blog-api 目录下）:
+    python -m benchmarks.search_index --posts 50000 --words 600 --queries 2000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.core.search import SearchIndex  # noqa: E402
+
+# 常用汉字（取 GB2312 一级字区的一段），组成 2~4 字的词
+COMMON_HANZI = [chr(c) for c in range(0x4E00, 0x4E00 + 3000)]
+
+
+def rss_bytes() -> int:
+    """当前常驻内存；没有 /proc 时退回峰值 RSS。"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def make_vocabulary(rnd: random.Random, size: int) -> list[str]:
+    """五分之一为英文词，其余为 2~4 字的中文词；用字同样服从 Zipf 分布。"""
+    char_weights = [1 / (rank + 1) for rank in range(len(COMMON_HANZI))]
+    words = []
+    for i in range(size):
+        if i % 5 == 0:
+            words.append("".join(rnd.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rnd.randint(3, 9))))
+        else:
+            words.append("".join(rnd.choices(COMMON_HANZI, char_weights, k=rnd.randint(2, 4))))
+    return words
+
+
+def make_corpus(posts: int, words_per_post: int, vocab_size: int, seed: int):
+    rnd = random.Random(seed)
+    vocab = make_vocabulary(rnd, vocab_size)
+    weights = [1 / (rank + 1) for rank in range(vocab_size)]  # Zipf
+    corpus = []
+    for post_id in range(1, posts + 1):
+        title = "".join(rnd.choices(vocab, weights, k=4))
+        body = []
+        for word in rnd.choices(vocab, weights, k=words_per_post):
+            body.append(word + (" " if word.isascii() else ""))
+            if rnd.random() < 0.05:
+                body.append("，" if rnd.random() < 0.8 else "。\n\n")
+        corpus.append((post_id, title, "".join(body)))
+    return corpus, vocab, weights
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))] if sorted_values else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=50000)
+    parser.add_argument("--words", type=int, default=600, help="每篇文章的词数")
+    parser.add_argument("--vocab", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", default="", help="把结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    corpus, vocab, weights = make_corpus(args.posts, args.words, args.vocab, args.seed)
+    chars = sum(len(c[2]) for c in corpus)
+    print(f"corpus: {args.posts} posts, {chars / 1e6:.1f}M chars, generated in {time.perf_counter() - t0:.1f}s")
+
+    gc.collect()
+    rss_before = rss_bytes()
+    t0 = time.perf_counter()
+    index = SearchIndex()
+    for post_id, title, content in corpus:
+        index.add(post_id, title, content)
+    build_s = time.perf_counter() - t0
+    gc.collect()
+    index_rss = rss_bytes() - rss_before
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search.idx")
+        t0 = time.perf_counter()
+        snapshot_bytes = index.save(path)
+        save_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        loaded = SearchIndex.load(path)
+        load_s = time.perf_counter() - t0
+        assert len(loaded) == len(index)
+
+    # 查询：按词频抽样 1~3 个词，另有一部分单字查询
+    rnd = random.Random(args.seed + 1)
+    queries = []
+    for _ in range(args.queries):
+        if rnd.random() < 0.1:
+            queries.append(rnd.choice(rnd.choices(vocab, weights, k=1)[0]))
+        else:
+            queries.append(" ".join(rnd.choices(vocab, weights, k=rnd.randint(1, 3))))
+    latencies = []
+    hits = 0
+    for q in queries:
+        t0 = time.perf_counter()
+        total, _ = index.search(q, limit=10)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        hits += bool(total)
+    latencies.sort()
+
+    # 增量更新：替换 1% 的文章
+    t0 = time.perf_counter()
+    updates = max(1, args.posts // 100)
+    for post_id, title, content in rnd.sample(corpus, updates):
+        index.add(post_id, title + "更新", content)
+    update_ms = (time.perf_counter() - t0) * 1000 / updates
+
+    results = {
+        "posts": args.posts,
+        "terms": index.term_count,
+        "build_seconds": round(build_s, 2),
+        "index_rss_mb": round(index_rss / 1024 / 1024, 1),
+        "snapshot_mb": round(snapshot_bytes / 1024 / 1024, 1),
+        "snapshot_save_seconds": round(save_s, 2),
+        "snapshot_load_seconds": round(load_s, 2),
+        "query_p50_ms": round(percentile(latencies, 0.50), 2),
+        "query_p95_ms": round(percentile(latencies, 0.95), 2),
+        "query_p99_ms": round(percentile(latencies, 0.99), 2),
+        "queries_with_hits": hits,
+        "update_ms_per_post": round(update_ms, 3),
+    }
+    for key, value in results.items():
+        print(f"{key:>22}: {value}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""Export the public read API as static JSON (and optional HTML) that nginx can serve directly.
+
+输出目录的路径与公开接口一一对应（见 docs/DEVELOPMENT.md 中的 nginx 配置示例），文件内容与接口响应相同：
+  api/site.json                                  GET /api/site
+  api/tags.json                                  GET /api/tags
+  api/pages/<slug>.json                          GET /api/pages/<slug>（含 about）
+  api/posts/<slug>.json                          GET /api/posts/<slug>（按 html=true 的结构输出，是普通详情的超集）
+  api/posts-pages/<size>/<page>.json             GET /api/posts?page=<page>&size=<size>
+  api/tags/<slug>/posts/<size>/<page>.json       GET /api/tags/<slug>/posts 与 /api/posts?tag=<slug>
+  html/post/<slug>.html、html/page/<slug>.html   --html 时输出的静态页面（正文为服务端渲染并净化后的 HTML）
+
+增量重建：manifest.json 记录每个文件的输入指纹（文章为 updated_at、发布时间与标签集合，列表页为该页文章及其指纹与总数），
+再次运行时只重建指纹变化或文件缺失的部分，不再产出的文件（下线、改 slug、页数减少）会被删除。
+列表中的浏览量是该页最后一次重建时的值。文章正文在进程池中渲染与序列化，所有文件先写临时文件再原子替换。
+Usage: python -m scripts.export_static --out /srv/zblog-static [--workers 4] [--page-sizes 10,20] [--html] [--force]
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from app.core.cache import render_json
+from app.core.database import engine
+from app.core.markdown_render import RENDERER_VERSION, render_markdown
+from app.core.pagination import encode_cursor
+from app.models import Page, Post, SiteConfig, Tag
+from app.models.post import post_tags
+from app.schemas.page import PageDetail
+from app.schemas.post import PostDetailRendered, TagBrief
+from app.schemas.site import SiteInfo
+from app.schemas.tag import TagList
+
+MANIFEST = "manifest.json"
+MANIFEST_FORMAT = 1
+SITE_FIELDS = tuple(SiteInfo.model_fields)
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """写入同目录下的临时文件后 os.replace，nginx 不会读到写了一半的文件。"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def fingerprint(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, default=str, separators=(",", ":")).encode("utf-8")).hexdigest()[:32]
+
+
+def safe_slug(slug: str | None) -> bool:
+    """slug 直接作为文件名：不能为空、含路径分隔符或以 . 开头。"""
+    return bool(slug) and "/" not in slug and "\\" not in slug and not slug.startswith(".")
+
+
+def html_document(title: str, body: str, site_title: str | None, description: str = "") -> bytes:
+    page_title = f"{title} - {site_title}" if site_title else title
+    return (
+        "<!doctype html>\n"
+        '<html lang="zh-CN">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f"<title>{html.escape(page_title)}</title>\n"
+        f'<meta name="description" content="{html.escape(description)}">\n'
+        f"</head>\n<body>\n<article>\n<h1>{html.escape(title)}</h1>\n{body}\n</article>\n</body>\n</html>\n"
+    ).encode("utf-8")
+
+
+def export_post(job: dict) -> None:
+    """进程池任务：渲染一篇文章的正文，写出详情 JSON（及 HTML）。"""
+    rendered = render_markdown(job["content"])
+    detail = PostDetailRendered(
+        **job["post"],
+        content=job["content"],
+        content_html=rendered.html,
+        toc=rendered.toc,
+        word_count=rendered.word_count,
+        reading_minutes=rendered.reading_minutes,
+        auto_excerpt=rendered.excerpt,
+    )
+    out = job["out"]
+    write_atomic(os.path.join(out, job["json_path"]), render_json(detail))
+    if job["html_path"]:
+        document = html_document(
+            detail.title, rendered.html, job["site_title"], detail.excerpt or rendered.excerpt
+        )
+        write_atomic(os.path.join(out, job["html_path"]), document)
+
+
+class Exporter:
+    def __init__(self, out: str, page_sizes: list[int], with_html: bool, force: bool):
+        self.out = out
+        self.page_sizes = page_sizes
+        self.with_html = with_html
+        self.options = {"page_sizes": page_sizes, "html": with_html, "renderer": RENDERER_VERSION}
+        self.old = {} if force else self._load_manifest()
+        self.files: dict[str, str] = {}  # 本次产出的文件 -> 指纹
+        self.written = 0
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(os.path.join(self.out, MANIFEST), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # 输出选项或渲染器版本变化时全部重建
+        if manifest.get("format") != MANIFEST_FORMAT or manifest.get("options") != self.options:
+            return {}
+        return manifest.get("files", {})
+
+    def stale(self, path: str, fp: str) -> bool:
+        """登记本次产出的文件；指纹与上次相同且文件仍在时不需要重建。"""
+        self.files[path] = fp
+        return self.old.get(path) != fp or not os.path.exists(os.path.join(self.out, path))
+
+    def write(self, path: str, data: bytes) -> None:
+        write_atomic(os.path.join(self.out, path), data)
+        self.written += 1
+
+    def put(self, path: str, data: bytes) -> None:
+        """体积小、构建便宜的文件直接以内容哈希为指纹。"""
+        if self.stale(path, hashlib.sha256(data).hexdigest()[:32]):
+            self.write(path, data)
+
+    def finish(self) -> int:
+        removed = 0
+        for path in self.old.keys() - self.files.keys():
+            try:
+                os.unlink(os.path.join(self.out, path))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        manifest = {"format": MANIFEST_FORMAT, "options": self.options, "files": dict(sorted(self.files.items()))}
+        write_atomic(os.path.join(self.out, MANIFEST), json.dumps(manifest, ensure_ascii=False).encode("utf-8"))
+        return removed
+
+
+def load_posts(conn) -> list:
+    """已发布文章的元数据（不含正文）与标签，按列表顺序 (published_at, id) 倒序。"""
+    columns = (
+        Post.id, Post.title, Post.slug, Post.excerpt, Post.cover_image, Post.status, Post.view_count,
+        Post.created_at, Post.published_at, Post.updated_at,
+    )
+    rows = conn.execute(
+        select(*columns).where(Post.status == "published").order_by(Post.published_at.desc(), Post.id.desc())
+    ).all()
+    tags = {t.id: t for t in conn.execute(select(Tag.id, Tag.name, Tag.slug))}
+    post_tag_ids: dict[int, list[int]] = defaultdict(list)
+    links = conn.execute(
+        select(post_tags.c.post_id, post_tags.c.tag_id)
+        .join(Post, Post.id == post_tags.c.post_id)
+        .where(Post.status == "published")
+        .order_by(post_tags.c.post_id, post_tags.c.tag_id)
+    )
+    for post_id, tag_id in links:
+        if tag_id in tags:
+            post_tag_ids[post_id].append(tag_id)
+    posts = []
+    for r in rows:
+        if not safe_slug(r.slug):
+            print(f"  skip post {r.id}: slug {r.slug!r} cannot be used as a file name", flush=True)
+            continue
+        item = {
+            "id": r.id,
+            "title": r.title,
+            "slug": r.slug,
+            "excerpt": r.excerpt,
+            "cover_image": r.cover_image,
+            "status": r.status,
+            "view_count": r.view_count or 0,
+            "created_at": r.created_at,
+            "published_at": r.published_at,
+            "tags": [TagBrief(id=t, name=tags[t].name, slug=tags[t].slug) for t in post_tag_ids.get(r.id, ())],
+        }
+        tag_fp = [(t.id, t.name, t.slug) for t in item["tags"]]
+        posts.append((item, fingerprint(r.updated_at, r.published_at, tag_fp)))
+    return posts
+
+
+def export_lists(exp: Exporter, prefix: str, posts: list) -> None:
+    """按每种页长导出列表的每一页（与 paginate_posts 页码模式的响应相同）。"""
+    total = len(posts)
+    for size in exp.page_sizes:
+        pages = max(1, -(-total // size))
+        for page in range(1, pages + 1):
+            chunk = posts[(page - 1) * size : page * size]
+            has_next, has_prev = page < pages, page > 1
+            path = f"{prefix}/{size}/{page}.json"
+            if not exp.stale(path, fingerprint(total, page, size, [(p["id"], fp) for p, fp in chunk])):
+                continue
+            items = [p for p, _ in chunk]
+            body = {
+                "items": items,
+                "total": total,
+                "page": page,
+                "size": size,
+                "next": encode_cursor(items[-1]["published_at"], items[-1]["id"], "next") if items and has_next else None,
+                "prev": encode_cursor(items[0]["published_at"], items[0]["id"], "prev") if items and has_prev else None,
+            }
+            exp.write(path, render_json(body))
+
+
+def export_posts(exp: Exporter, conn, posts: list, site_title: str | None, workers: int, batch: int) -> int:
+    """指纹变化的文章按批读取正文，交给进程池渲染并写出。"""
+    html_fp = fingerprint(site_title)
+    todo = []
+    for item, fp in posts:
+        json_path = f"api/posts/{item['slug']}.json"
+        html_path = f"html/post/{item['slug']}.html" if exp.with_html else None
+        # 两个文件都要登记，任何一个需要重建就整篇重建
+        stale = exp.stale(json_path, fp)
+        if html_path and exp.stale(html_path, fingerprint(fp, html_fp)):
+            stale = True
+        if stale:
+            todo.append((item, json_path, html_path))
+    if not todo:
+        return 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i in range(0, len(todo), batch):
+            chunk = todo[i : i + batch]
+            contents = dict(
+                conn.execute(select(Post.id, Post.content).where(Post.id.in_([item["id"] for item, _, _ in chunk]))).all()
+            )
+            jobs = [
+                {
+                    "out": exp.out,
+                    "post": item,
+                    "content": contents.get(item["id"]) or "",
+                    "json_path": json_path,
+                    "html_path": html_path,
+                    "site_title": site_title,
+                }
+                for item, json_path, html_path in chunk
+            ]
+            list(pool.map(export_post, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+            exp.written += sum(2 if job["html_path"] else 1 for job in jobs)
+            print(f"  posts {min(i + batch, len(todo))}/{len(todo)}", flush=True)
+    return len(todo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export published content as static JSON/HTML")
+    parser.add_argument("--out", required=True, help="输出目录（nginx 的 root）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="渲染进程数")
+    parser.add_argument("--batch", type=int, default=200, help="每批读取的文章正文数")
+    parser.add_argument("--page-sizes", default="10,20", help="导出的列表页长，与前端请求的 size 一致")
+    parser.add_argument("--html", action="store_true", help="同时输出文章与页面的静态 HTML")
+    parser.add_argument("--force", action="store_true", help="忽略 manifest，全部重建")
+    args = parser.parse_args()
+    page_sizes = sorted({int(s) for s in args.page_sizes.split(",") if s.strip()})
+    if not page_sizes or not all(1 <= s <= 50 for s in page_sizes):
+        parser.error("--page-sizes must be between 1 and 50")
+
+    started = time.perf_counter()
+    out = os.path.abspath(args.out)
+    exp = Exporter(out, page_sizes, args.html, args.force)
+    with engine.connect() as conn:
+        site = dict(conn.execute(select(SiteConfig.key, SiteConfig.value)).all())
+        site_info = SiteInfo(**{f: site.get(f) for f in SITE_FIELDS})
+        exp.put("api/site.json", render_json(site_info))
+
+        tag_rows = conn.execute(
+            select(Tag.id, Tag.name, Tag.slug, Tag.published_post_count).order_by(Tag.id)
+        ).all()
+        exp.put(
+            "api/tags.json",
+            render_json([TagList(id=r.id, name=r.name, slug=r.slug, post_count=r.published_post_count or 0) for r in tag_rows]),
+        )
+
+        for page in conn.execute(select(Page.id, Page.slug, Page.title, Page.content, Page.updated_at)):
+            if not safe_slug(page.slug):
+                continue
+            detail = PageDetail(id=page.id, slug=page.slug, title=page.title, content=page.content, updated_at=page.updated_at)
+            exp.put(f"api/pages/{page.slug}.json", render_json(detail))
+            if args.html:
+                html_path = f"html/page/{page.slug}.html"
+                if exp.stale(html_path, fingerprint(page.updated_at, site_info.title, RENDERER_VERSION)):
+                    exp.write(html_path, html_document(page.title, render_markdown(page.content or "").html, site_info.title))
+
+        posts = load_posts(conn)
+        export_lists(exp, "api/posts-pages", posts)
+        by_tag: dict[int, list] = defaultdict(list)
+        for item, fp in posts:
+            for t in item["tags"]:
+                by_tag[t.id].append((item, fp))
+        for r in tag_rows:
+            if safe_slug(r.slug):
+                export_lists(exp, f"api/tags/{r.slug}/posts", by_tag.get(r.id, []))
+        rebuilt = export_posts(exp, conn, posts, site_info.title, args.workers, args.batch)
+    removed = exp.finish()
+    print(
+        f"Exported {len(posts)} posts ({rebuilt} rebuilt), wrote {exp.written} file(s), removed {removed} "
+        f"in {time.perf_counter() - started:.1f}s to {out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""生成压测用的大规模合成数据：文章（较长的 Markdown 正文）、标签、多层嵌套评论与浏览量。
+
+- 文章热度服从 Zipf 分布：热门文章浏览量高、评论多，最冷门的一部分为草稿；
+- 标签热度服从幂律分布，每篇 1~5 个标签；
+- 评论按讨论串生成（根评论 + 若干层回复），parent_id 总指向同一串中更早的评论；
+- 按块生成、每块一次 executemany 批量写入；--workers > 1 时在多个进程中并行生成各块，主进程依次写入；
+- 结果只由 --seed 与数量决定，与进程数无关。
+
+只写入空库（posts / comments 为空）；MySQL 需先执行迁移，SQLite 会自动建表。写入后重算 site_stats 与标签计数。
+Usage: python -m scripts.generate_data --posts 100000 --comments 1000000 [--workers 4] [--seed 42]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, select
+from app.core.counters import reconcile_all
+from app.core.database import Base, engine
+from app.models import Comment, Page, Post, SiteConfig, Tag, User
+from app.models.post import post_tags
+
+START = datetime(2018, 1, 1)
+SPAN_SECONDS = 8 * 365 * 24 * 3600  # 文章发布时间分布在 8 年内
+DRAFT_RATIO = 0.1
+HANZI = [chr(c) for c in range(0x4E00, 0x4E00 + 2500)]
+LANGS = ["python", "sql", "bash", "javascript", "go"]
+NAMES = ["小明", "阿强", "Alice", "Bob", "路人甲", "李雷", "韩梅梅", "Carol", "老王", "dev"]
+
+
+class Plan:
+    """生成参数；各块的随机数只由 (seed, 表, 块号) 决定。"""
+
+    def __init__(self, posts: int, comments: int, tags: int, body_words: int, seed: int, batch: int):
+        self.posts = posts
+        self.comments = comments
+        self.tags = tags
+        self.body_words = body_words
+        self.seed = seed
+        self.batch = batch
+        self.published = posts - int(posts * DRAFT_RATIO)
+        # 热度名次与文章 id 之间的固定置换：rank -> id
+        self.stride = next(p for p in range(max(2, int(posts * 0.618)), posts * 2 + 3) if _gcd(p, posts) == 1) if posts > 1 else 1
+        self.offset = random.Random(seed).randrange(posts) if posts else 0
+
+    def rng(self, table: str, chunk: int) -> random.Random:
+        return random.Random(f"{self.seed}:{table}:{chunk}")
+
+    def post_id(self, rank: int) -> int:
+        return (rank * self.stride + self.offset) % self.posts + 1
+
+    def rank(self, post_id: int) -> int:
+        return ((post_id - 1 - self.offset) * pow(self.stride, -1, self.posts)) % self.posts
+
+    def popular_post(self, rnd: random.Random) -> int:
+        """按热度抽一篇已发布文章（名次越靠前越容易被抽中）。"""
+        return self.post_id(min(self.published - 1, int(self.published * rnd.random() ** 3)))
+
+
+def _gcd(a: int, b: int) -> int:
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def _zipf_cum_weights(n: int, s: float) -> list[float]:
+    return list(accumulate(1 / (i + 1) ** s for i in range(n)))
+
+
+def _sentence(rnd: random.Random) -> str:
+    if rnd.random() < 0.3:
+        words = rnd.choices(["the", "data", "index", "query", "cache", "async", "server", "latency", "model", "test"], k=rnd.randint(5, 12))
+        return " ".join(words).capitalize() + "."
+    return "".join(rnd.choices(HANZI, k=rnd.randint(8, 30))) + rnd.choice("，。；！？") + "".join(rnd.choices(HANZI, k=rnd.randint(4, 16))) + "。"
+
+
+def markdown_body(rnd: random.Random, words: int) -> str:
+    """按对数正态分布决定长度，混合标题、段落、列表、代码块与引用。"""
+    target = max(50, int(rnd.lognormvariate(0, 0.6) * words))
+    parts, size = [], 0
+    while size < target:
+        kind = rnd.random()
+        if kind < 0.12:
+            block = f"{'#' * rnd.randint(2, 3)} {_sentence(rnd).rstrip('。.')}"
+        elif kind < 0.22:
+            block = "\n".join(f"- {_sentence(rnd)}" for _ in range(rnd.randint(2, 5)))
+        elif kind < 0.3:
+            lines = "\n".join(f"value_{i} = compute({i}, {rnd.randint(0, 99)})" for i in range(rnd.randint(2, 8)))
+            block = f"```{rnd.choice(LANGS)}\n{lines}\n```"
+        elif kind < 0.34:
+            block = "> " + _sentence(rnd)
+        else:
+            block = " ".join(_sentence(rnd) for _ in range(rnd.randint(2, 6)))
+        parts.append(block)
+        size += len(block) // 2
+    return "\n\n".join(parts)
+
+
+def gen_posts(plan: Plan, chunk: int) -> tuple[list[dict], list[dict]]:
+    rnd = plan.rng("posts", chunk)
+    tag_weights = _zipf_cum_weights(plan.tags, 1.1)
+    first = chunk * plan.batch + 1
+    posts, links = [], []
+    for post_id in range(first, min(plan.posts, first + plan.batch - 1) + 1):
+        rank = plan.rank(post_id)
+        published = rank < plan.published
+        # id 越大发布越晚，同时带一点抖动
+        published_at = START + timedelta(seconds=SPAN_SECONDS * (post_id - 1) / max(1, plan.posts) + rnd.randint(0, 3600))
+        title = _sentence(rnd).rstrip("。.")[:60]
+        posts.append(
+            {
+                "id": post_id,
+                "title": title,
+                "slug": f"post-{post_id}",
+                "content": markdown_body(rnd, plan.body_words),
+                "excerpt": _sentence(rnd)[:200] if rnd.random() < 0.7 else None,
+                "cover_image": None,
+                "status": "published" if published else "draft",
+                "author_id": 1,
+                # Zipf 浏览量：第 r 名约为榜首的 1/(r+1)
+                "view_count": int(200_000 / (rank + 1) ** 0.9 * rnd.uniform(0.5, 1.5)) if published else 0,
+                "created_at": published_at - timedelta(hours=rnd.randint(1, 72)),
+                "updated_at": published_at + timedelta(days=rnd.randint(0, 30)),
+                "published_at": published_at if published else None,
+            }
+        )
+        tag_ids = {t + 1 for t in rnd.choices(range(plan.tags), cum_weights=tag_weights, k=rnd.randint(1, 5))}
+        links.extend({"post_id": post_id, "tag_id": t} for t in sorted(tag_ids))
+    return posts, links
+
+
+def gen_comments(plan: Plan, chunk: int) -> list[dict]:
+    """一块评论占用一段连续 id；按讨论串填满，回复的 parent_id 总小于自身 id。"""
+    rnd = plan.rng("comments", chunk)
+    first = chunk * plan.batch + 1
+    last = min(plan.comments, first + plan.batch - 1)
+    rows: list[dict] = []
+    comment_id = first
+    while comment_id <= last:
+        post_id = plan.popular_post(rnd)
+        base_time = START + timedelta(seconds=SPAN_SECONDS * (post_id - 1) / max(1, plan.posts))
+        thread: list[tuple[int, datetime]] = []
+        for _ in range(min(last - comment_id + 1, 1 + int(rnd.expovariate(0.6)))):
+            if thread and rnd.random() < 0.85:
+                parent_id, parent_time = rnd.choice(thread[-4:])  # 多回复最近的评论，形成多层嵌套
+            else:
+                parent_id, parent_time = None, base_time
+            created_at = parent_time + timedelta(minutes=rnd.randint(1, 60 * 24 * 7))
+            status = rnd.choices(("approved", "pending", "rejected"), (80, 15, 5))[0]
+            rows.append(
+                {
+                    "id": comment_id,
+                    "post_id": post_id,
+                    "page_slug": None,
+                    "parent_id": parent_id,
+                    "author_name": rnd.choice(NAMES),
+                    "author_email": f"user{rnd.randint(1, 50000)}@example.com",
+                    "content": " ".join(_sentence(rnd) for _ in range(rnd.randint(1, 3))),
+                    "status": status,
+                    "ip": f"10.{rnd.randint(0, 255)}.{rnd.randint(0, 255)}.{rnd.randint(1, 254)}",
+                    "user_agent": "Mozilla/5.0 (generated)",
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+            )
+            thread.append((comment_id, created_at))
+            comment_id += 1
+    return rows
+
+
+def _posts_task(args):
+    return gen_posts(*args)
+
+
+def _comments_task(args):
+    return gen_comments(*args)
+
+
+def prepare(conn) -> None:
+    """导入期间放宽持久化/约束检查，只影响当前连接。"""
+    if engine.dialect.name == "sqlite":
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
+    elif engine.dialect.name == "mysql":
+        conn.exec_driver_sql("SET unique_checks=0, foreign_key_checks=0")
+    conn.commit()
+
+
+def load(plan: Plan, workers: int) -> None:
+    post_chunks = range((plan.posts + plan.batch - 1) // plan.batch)
+    comment_chunks = range((plan.comments + plan.batch - 1) // plan.batch)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    run = pool.map if pool else map
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            prepare(conn)
+            with conn.begin():
+                if not conn.execute(select(User.id).where(User.id == 1)).first():
+                    conn.execute(insert(User), [{"id": 1, "username": "generator", "password_hash": "!"}])
+                conn.execute(
+                    insert(Tag),
+                    [{"id": i, "name": f"tag{i}", "slug": f"tag-{i}", "created_at": START} for i in range(1, plan.tags + 1)],
+                )
+                if not conn.execute(select(Page.id).where(Page.slug == "about")).first():
+                    conn.execute(insert(Page), [{"slug": "about", "title": "About", "content": "# About\n\n压测数据。"}])
+                if not conn.execute(select(SiteConfig.key).where(SiteConfig.key == "title")).first():
+                    conn.execute(insert(SiteConfig), [{"key": "title", "value": "zblog (generated)"}])
+            done = 0
+            for posts, links in run(_posts_task, [(plan, c) for c in post_chunks]):
+                with conn.begin():
+                    conn.execute(insert(Post), posts)
+                    conn.execute(insert(post_tags), links)
+                done += len(posts)
+                print(f"  posts {done}/{plan.posts} ({time.perf_counter() - started:.0f}s)", flush=True)
+            done = 0
+            for rows in run(_comments_task, [(plan, c) for c in comment_chunks]):
+                with conn.begin():
+                    conn.execute(insert(Comment), rows)
+                done += len(rows)
+                if done % (plan.batch * 20) < plan.batch or done == plan.comments:
+                    print(f"  comments {done}/{plan.comments} ({time.perf_counter() - started:.0f}s)", flush=True)
+    finally:
+        if pool:
+            pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a large synthetic dataset for load testing")
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--comments", type=int, default=None, help="评论总数，默认文章数的 10 倍")
+    parser.add_argument("--tags", type=int, default=None, help="标签数，默认 max(50, 文章数/200)")
+    parser.add_argument("--body-words", type=int, default=800, help="正文长度中位数（约等于字数）")
+    parser.add_argument("--batch", type=int, default=5000, help="每块行数（一次 executemany）")
+    parser.add_argument("--workers", type=int, default=1, help="并行生成数据的进程数")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    plan = Plan(
+        posts=args.posts,
+        comments=args.posts * 10 if args.comments is None else args.comments,
+        tags=args.tags or max(50, args.posts // 200),
+        body_words=args.body_words,
+        seed=args.seed,
+        batch=args.batch,
+    )
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        for model in (Post, Comment, Tag):
+            if conn.execute(select(func.count()).select_from(model)).scalar():
+                sys.exit(f"{model.__tablename__} is not empty; generate into an empty database")
+
+    started = time.perf_counter()
+    load(plan, args.workers)
+    loaded = time.perf_counter() - started
+    drifted = reconcile_all()
+    print(
+        f"Generated {plan.posts} posts, {plan.tags} tags, {plan.comments} comments in {loaded:.1f}s "
+        f"(+{time.perf_counter() - started - loaded:.1f}s recomputing counters: {drifted})."
+    )
+
+
+if __name__ == "__main__":
+    main()
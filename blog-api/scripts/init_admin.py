@@ -45,6 +45,8 @@ def main():
                 if input().strip().lower() != "y":
                     return
             existing.password_hash = hash_password(password)
+            # 已签发的管理后台 token 随之失效
+            existing.token_generation = (existing.token_generation or 0) + 1
             session.commit()
             print("Password updated.")
             return
@@ -0,0 +1,26 @@
+"""Recompute denormalized counters from source tables.
+
+管理后台和评论提交在写入时增量维护计数，blog-api 也会按 COUNTER_RECONCILE_INTERVAL_SECONDS 定期校正；
+手工改库、导入数据或怀疑计数漂移时可运行本脚本立即重算。
+Usage: python -m scripts.reconcile_counters [--dry-run]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.counters import reconcile_all
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute denormalized counters")
+    parser.add_argument("--dry-run", action="store_true", help="只报告不一致的数量，不写入")
+    args = parser.parse_args()
+    action = "found" if args.dry_run else "fixed"
+    for name, drifted in reconcile_all(dry_run=args.dry_run).items():
+        print(f"{name}: {action} {drifted} drifted row(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Render post/page Markdown into the rendered_contents cache using a process pool.
+
+管理后台保存时已会渲染；升级渲染器（RENDERER_VERSION）、导入数据或首次上线时运行本脚本批量补齐。
+Usage: python -m scripts.render_markdown [--workers 4] [--batch 200] [--force] [--prune]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, insert, select
+from app.core.database import engine
+from app.core.markdown_render import content_hash, render_markdown, rendered_row
+from app.models import Page, Post, RenderedContent
+
+
+def iter_contents(conn, batch: int):
+    """按主键分批读取文章与页面正文。"""
+    for model in (Post, Page):
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                select(model.id, model.content).where(model.id > last_id).order_by(model.id).limit(batch)
+            ).all()
+            if not rows:
+                break
+            yield [r.content or "" for r in rows]
+            last_id = rows[-1].id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk render Markdown into rendered_contents")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="渲染进程数")
+    parser.add_argument("--batch", type=int, default=200, help="每批读取的正文数")
+    parser.add_argument("--force", action="store_true", help="已有缓存也重新渲染")
+    parser.add_argument("--prune", action="store_true", help="删除不再被任何正文引用的缓存")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    scanned = rendered = 0
+    seen: set[str] = set()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool, engine.connect() as reader:
+        for contents in iter_contents(reader, args.batch):
+            scanned += len(contents)
+            # 同一批内相同正文只渲染一次
+            pending = {}
+            for content in contents:
+                key = content_hash(content)
+                if key not in seen:
+                    seen.add(key)
+                    pending[key] = content
+            if not args.force and pending:
+                with engine.connect() as conn:
+                    existing = conn.execute(
+                        select(RenderedContent.content_hash).where(RenderedContent.content_hash.in_(pending))
+                    ).scalars()
+                    for key in existing:
+                        pending.pop(key)
+            if not pending:
+                continue
+            keys = list(pending)
+            chunksize = max(1, len(keys) // (args.workers * 4))
+            results = pool.map(render_markdown, [pending[k] for k in keys], chunksize=chunksize)
+            rows = [rendered_row(key, result) for key, result in zip(keys, results)]
+            with engine.begin() as conn:
+                conn.execute(delete(RenderedContent).where(RenderedContent.content_hash.in_(keys)))
+                conn.execute(insert(RenderedContent), rows)
+            rendered += len(rows)
+            print(f"  scanned {scanned}, rendered {rendered}", flush=True)
+
+    pruned = 0
+    if args.prune:
+        with engine.begin() as conn:
+            stale = [k for k in conn.execute(select(RenderedContent.content_hash)).scalars() if k not in seen]
+            for i in range(0, len(stale), 1000):
+                conn.execute(delete(RenderedContent).where(RenderedContent.content_hash.in_(stale[i : i + 1000])))
+            pruned = len(stale)
+    print(
+        f"Scanned {scanned} bodies, rendered {rendered}, pruned {pruned} "
+        f"in {time.perf_counter() - started:.1f}s with {args.workers} worker(s)."
+    )
+
+
+if __name__ == "__main__":
+    main()
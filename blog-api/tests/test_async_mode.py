@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+import pytest
+from app.core.config import settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.skipif(settings.DB_ASYNC, reason="本进程已是异步模式，test_endpoints.py 直接覆盖")
+def test_public_endpoints_in_async_mode():
+    """引擎与会话工厂在导入时按 DB_ASYNC 创建，异步模式在子进程中以 aiosqlite 重跑公开接口测试。"""
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests/test_endpoints.py"],
+        cwd=ROOT,
+        env=dict(os.environ, DB_ASYNC="true"),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
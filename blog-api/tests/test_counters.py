@@ -0,0 +1,19 @@
+from sqlalchemy import select
+from app.core.counters import reconcile_post_comment_counts
+from app.models import Comment, Post
+from tests.conftest import seed_posts
+
+
+def test_reconcile_comment_counts_keeps_updated_at(db):
+    seed_posts(1)
+    with db.begin() as conn:
+        conn.execute(
+            Comment.__table__.insert().values(
+                post_id=1, author_name="a", author_email="a@b.c", content="c", status="approved"
+            )
+        )
+        before = conn.execute(select(Post.updated_at).where(Post.id == 1)).scalar()
+        assert reconcile_post_comment_counts(conn) == 1
+        row = conn.execute(select(Post.updated_at, Post.comment_count).where(Post.id == 1)).one()
+    assert row.comment_count == 1
+    assert row.updated_at == before
@@ -0,0 +1,31 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from app.core import database
+from app.core.config import settings
+from app.core.replicas import Replica
+from app.models import Post
+from tests.conftest import seed_posts
+
+
+@pytest.mark.skipif(settings.DB_ASYNC, reason="会话名额只在同步模式下使用")
+def test_replica_failover_moves_session_slot_to_primary(db, tmp_path, monkeypatch):
+    """副本连接失败改读主库时，名额从副本转到主库，请求结束后全部归还。"""
+    seed_posts(2)
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replica = Replica("broken", broken, sessionmaker(bind=broken))
+    monkeypatch.setattr(database.replicas, "replicas", [replica])
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+    async def run():
+        async with database.session_scope(read_only=True) as session:
+            assert session.replica is replica
+            assert await session.scalar(select(func.count()).select_from(Post)) == 2
+            assert session.replica is None
+            assert database._sync_session_slots("broken")._value == capacity
+            assert database._sync_session_slots("primary")._value == capacity - 1
+        assert database._sync_session_slots("primary")._value == capacity
+
+    asyncio.run(run())
+    assert replica.ejections == 1
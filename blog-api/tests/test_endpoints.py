@@ -0,0 +1,32 @@
+"""公开接口的冒烟测试，同步与异步（DB_ASYNC=true）两种模式都会运行，见 test_async_mode.py。"""
+from fastapi.testclient import TestClient
+from app.core import database
+from app.core.config import settings
+from app.main import app
+from tests.conftest import seed_posts
+
+
+def test_public_endpoints(db):
+    assert (database.AsyncSessionLocal is not None) == settings.DB_ASYNC
+    seed_posts(3, tags_per_post=2)
+    client = TestClient(app)
+
+    body = client.get("/api/posts?size=2").json()
+    assert [item["slug"] for item in body["items"]] == ["p3", "p2"]
+    assert body["total"] == 3
+
+    detail = client.get("/api/posts/p1")
+    assert detail.status_code == 200
+    assert detail.json()["title"] == "p1"
+    assert client.get("/api/posts/missing").status_code == 404
+
+    tagged = client.get("/api/tags/t1/posts?size=10").json()
+    assert len(tagged["items"]) == 3
+
+    created = client.post(
+        "/api/comments",
+        json={"author_name": "a", "author_email": "a@example.com", "content": "hello", "post_id": 1},
+    )
+    assert created.status_code == 201, created.text
+
+    assert client.get("/api/site").status_code == 200
@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.core.cache import content_versions
+from app.main import app
+from app.models import ContentVersion, Post
+from app.routers.posts import post_count_cache
+from tests.conftest import seed_posts
+
+
+def count_statements(engine, client, url: str) -> int:
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_list_posts_statement_count_does_not_grow_with_page_size(db):
+    """标签批量加载：语句数与每页篇数、每篇标签数无关。"""
+    seed_posts(40, tags_per_post=8)
+    client = TestClient(app)
+    # 首个请求还会读取内容版本号与总数（随后命中缓存），先预热，只比较列表本身的语句
+    client.get("/api/posts?size=1")
+    small = count_statements(db, client, "/api/posts?size=5")
+    large = count_statements(db, client, "/api/posts?size=40")
+    assert small == large
+    assert large <= 2  # 文章一条 + 标签批量加载一条
+    body = client.get("/api/posts?size=40").json()
+    assert len(body["items"]) == 40
+    assert all(len(item["tags"]) == 8 for item in body["items"])
+
+
+def test_tag_posts_statement_count_does_not_grow_with_page_size(db):
+    seed_posts(40, tags_per_post=8)
+    client = TestClient(app)
+    client.get("/api/tags/t1/posts?size=1")
+    small = count_statements(db, client, "/api/tags/t1/posts?size=5")
+    large = count_statements(db, client, "/api/tags/t1/posts?size=40")
+    assert small == large
+    assert large <= 3  # 标签一条 + 文章一条 + 标签批量加载一条
+    body = client.get("/api/tags/t1/posts?size=40").json()
+    assert len(body["items"]) == 40
+    assert all(len(item["tags"]) == 8 for item in body["items"])
+
+
+def test_list_posts_total_follows_posts_version(db):
+    """管理后台改动文章后递增 posts 版本号，缓存的总数随之失效。"""
+    post_count_cache.clear()
+    seed_posts(3)
+    client = TestClient(app)
+    assert client.get("/api/posts").json()["total"] == 3
+    with db.begin() as conn:
+        conn.execute(
+            Post.__table__.insert().values(
+                id=4, title="p4", slug="p4", content="body", status="published", author_id=1,
+                published_at=datetime(2026, 2, 1),
+            )
+        )
+        conn.execute(ContentVersion.__table__.insert().values(scope="posts", version=content_versions.get("posts") + 1))
+    asyncio.run(content_versions.refresh())
+    assert client.get("/api/posts").json()["total"] == 4
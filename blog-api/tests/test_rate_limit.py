@@ -0,0 +1,18 @@
+from app.core.rate_limit import MAX_RETRY_AFTER, Decision, MemoryBackend, RateLimiter, SlidingWindow, TokenBucket
+
+
+def test_zero_limit_denies_with_finite_retry_after():
+    limiter = RateLimiter("test", SlidingWindow(0, 60), MemoryBackend(max_keys=10))
+    decision = limiter.hit("1.2.3.4")
+    assert not decision.allowed
+    assert decision.retry_after_header == "60"
+
+
+def test_token_bucket_without_refill_has_finite_retry_after():
+    decision = TokenBucket(rate=0, burst=0).peek(None, 0.0, 1)
+    assert not decision.allowed
+    assert decision.retry_after_header == str(MAX_RETRY_AFTER)
+
+
+def test_infinite_retry_after_is_clamped():
+    assert Decision(False, float("inf")).retry_after_header == str(MAX_RETRY_AFTER)
@@ -0,0 +1,12 @@
+import os
+
+from app.core.search import SearchIndex
+
+
+def test_save_leaves_no_temp_files(tmp_path):
+    path = str(tmp_path / "search.idx")
+    index = SearchIndex()
+    assert index.save(path) == os.path.getsize(path)
+    assert index.save(path) == os.path.getsize(path)
+    assert os.listdir(tmp_path) == ["search.idx"]
+    assert SearchIndex.load(path).watermark == index.watermark
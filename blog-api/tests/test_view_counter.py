@@ -0,0 +1,18 @@
+from sqlalchemy import select
+from app.core.view_counter import ViewCounter
+from app.models import Post
+from tests.conftest import seed_posts
+
+
+def test_flush_keeps_updated_at(db):
+    seed_posts(1)
+    with db.connect() as conn:
+        before = conn.execute(select(Post.updated_at, Post.view_count).where(Post.id == 1)).one()
+    counter = ViewCounter(shards=2)
+    counter.incr(1)
+    counter.incr(1)
+    assert counter.flush() == 2
+    with db.connect() as conn:
+        after = conn.execute(select(Post.updated_at, Post.view_count).where(Post.id == 1)).one()
+    assert after.view_count == before.view_count + 2
+    assert after.updated_at == before.updated_at
@@ -52,6 +52,22 @@ export const comments = {
       `/api/comments?${sp.toString()}`
     );
   },
+  /** 已通过的评论按讨论串嵌套返回，按顶层评论分页 */
+  tree: (params: { post_id?: number; page_slug?: string; page?: number; size?: number }) => {
+    const sp = new URLSearchParams();
+    if (params.post_id != null) sp.set("post_id", String(params.post_id));
+    if (params.page_slug) sp.set("page_slug", params.page_slug);
+    if (params.page) sp.set("page", String(params.page));
+    if (params.size) sp.set("size", String(params.size));
+    return api<{
+      items: CommentNode[];
+      total: number;
+      comment_count: number;
+      page: number;
+      size: number;
+      max_depth: number;
+    }>(`/api/comments/tree?${sp.toString()}`);
+  },
   create: (body: {
     author_name: string;
     author_email: string;
@@ -101,4 +117,5 @@ export type Comment = {
   content: string;
   created_at: string;
 };
+export type CommentNode = Comment & { replies: CommentNode[] };
 export type Page = { id: number; slug: string; title: string; content?: string; updated_at: string };
@@ -1,30 +1,17 @@
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { useState, useMemo } from "react";
 import { pages, comments } from "../api/client";
-import type { Comment } from "../api/client";
+import type { Comment, CommentNode } from "../api/client";
 import Markdown from "../components/Markdown";
 
 const PAGE_SLUG = "about";
 
-/** 顶级评论 + 其下所有回复（扁平，仅二级） */
-function buildCommentSections(items: Comment[]): { top: Comment; replies: Comment[] }[] {
-  const byParent: Record<number, Comment[]> = {};
-  const idToComment: Record<number, Comment> = {};
-  items.forEach((c) => {
-    idToComment[c.id] = c;
-    const pid = c.parent_id ?? 0;
-    if (!byParent[pid]) byParent[pid] = [];
-    byParent[pid].push(c);
-  });
-  const topList = byParent[0] ?? [];
-  function allDescendants(id: number): Comment[] {
-    const direct = byParent[id] ?? [];
-    return direct.concat(direct.flatMap((c) => allDescendants(c.id)));
+/** 顶级评论 + 其下所有回复（按讨论串顺序展开为扁平列表，仅二级） */
+function buildCommentSections(threads: CommentNode[]): { top: Comment; replies: Comment[] }[] {
+  function allDescendants(node: CommentNode): Comment[] {
+    return node.replies.flatMap((r) => [r, ...allDescendants(r)]);
   }
-  return topList.map((top) => ({
-    top,
-    replies: allDescendants(top.id),
-  }));
+  return threads.map((top) => ({ top, replies: allDescendants(top) }));
 }
 
 export default function About() {
@@ -42,7 +29,7 @@ export default function About() {
 
   const { data: commentData } = useQuery({
     queryKey: ["comments", "page", PAGE_SLUG],
-    queryFn: () => comments.list({ page_slug: PAGE_SLUG, page: 1, size: 50 }),
+    queryFn: () => comments.tree({ page_slug: PAGE_SLUG, page: 1, size: 50 }),
   });
 
   const sections = useMemo(
@@ -51,11 +38,13 @@ export default function About() {
   );
   const idToComment = useMemo(() => {
     const map: Record<number, Comment> = {};
-    commentData?.items?.forEach((c) => {
-      map[c.id] = c;
+    sections.forEach(({ top, replies }) => {
+      [top, ...replies].forEach((c) => {
+        map[c.id] = c;
+      });
     });
     return map;
-  }, [commentData?.items]);
+  }, [sections]);
 
   const submitComment = useMutation({
     mutationFn: comments.create,
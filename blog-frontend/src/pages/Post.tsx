@@ -2,28 +2,15 @@ import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { useParams, Link } from "react-router-dom";
 import { useState, useMemo } from "react";
 import { posts, comments } from "../api/client";
-import type { Comment } from "../api/client";
+import type { Comment, CommentNode } from "../api/client";
 import Markdown from "../components/Markdown";
 
-/** 顶级评论 + 其下所有回复（扁平，仅二级） */
-function buildCommentSections(items: Comment[]): { top: Comment; replies: Comment[] }[] {
-  const byParent: Record<number, Comment[]> = {};
-  const idToComment: Record<number, Comment> = {};
-  items.forEach((c) => {
-    idToComment[c.id] = c;
-    const pid = c.parent_id ?? 0;
-    if (!byParent[pid]) byParent[pid] = [];
-    byParent[pid].push(c);
-  });
-  const topList = byParent[0] ?? [];
-  function allDescendants(id: number): Comment[] {
-    const direct = byParent[id] ?? [];
-    return direct.concat(direct.flatMap((c) => allDescendants(c.id)));
+/** 顶级评论 + 其下所有回复（按讨论串顺序展开为扁平列表，仅二级） */
+function buildCommentSections(threads: CommentNode[]): { top: Comment; replies: Comment[] }[] {
+  function allDescendants(node: CommentNode): Comment[] {
+    return node.replies.flatMap((r) => [r, ...allDescendants(r)]);
   }
-  return topList.map((top) => ({
-    top,
-    replies: allDescendants(top.id),
-  }));
+  return threads.map((top) => ({ top, replies: allDescendants(top) }));
 }
 
 export default function Post() {
@@ -43,7 +30,7 @@ export default function Post() {
 
   const { data: commentData } = useQuery({
     queryKey: ["comments", "post", post?.id],
-    queryFn: () => comments.list({ post_id: post!.id, page: 1, size: 50 }),
+    queryFn: () => comments.tree({ post_id: post!.id, page: 1, size: 50 }),
     enabled: !!post?.id,
   });
 
@@ -53,11 +40,13 @@ export default function Post() {
   );
   const idToComment = useMemo(() => {
     const map: Record<number, Comment> = {};
-    commentData?.items?.forEach((c) => {
-      map[c.id] = c;
+    sections.forEach(({ top, replies }) => {
+      [top, ...replies].forEach((c) => {
+        map[c.id] = c;
+      });
     });
     return map;
-  }, [commentData?.items]);
+  }, [sections]);
 
   const submitComment = useMutation({
     mutationFn: comments.create,